@@ -7,10 +7,30 @@ Prioritizes high-paying Top MNC roles matching tech stack
 import json
 import os
 import time
-from openai import OpenAI
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 
+try:
+    from sheets_scheduler import get_scheduler
+    from llm import chat_json, achat_json
+    from prompt_builder import PromptBuilder, PRIORITY_SECTIONS
+    from llm_metrics import set_scan
+    from model_cascade import ModelCascade
+    from llm_client import get_client, make_async_client
+    from score_store import get_score_store, sheet_job, FRESH, STALE_JOB
+    from resume_reader import get_resume_hash
+    from scoring_executor import ScoringExecutor, DEFAULT_CONCURRENCY, is_rate_limit
+except ImportError:
+    from scrapper.sheets_scheduler import get_scheduler
+    from scrapper.llm import chat_json, achat_json
+    from scrapper.prompt_builder import PromptBuilder, PRIORITY_SECTIONS
+    from scrapper.llm_metrics import set_scan
+    from scrapper.model_cascade import ModelCascade
+    from scrapper.llm_client import get_client, make_async_client
+    from scrapper.score_store import get_score_store, sheet_job, FRESH, STALE_JOB
+    from scrapper.resume_reader import get_resume_hash
+    from scrapper.scoring_executor import ScoringExecutor, DEFAULT_CONCURRENCY, is_rate_limit
+
 # ========== CONFIGURATION ==========
 
 def load_config():
@@ -36,11 +56,8 @@ def load_resume():
 config = load_config()
 MASTER_RESUME = load_resume()
 
-# Initialize OpenAI client for OpenRouter
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=config['openrouter_key']
-)
+# Shared OpenRouter client (connection reuse, retries, global rate limit)
+client = get_client(config)
 
 print(f"✓ Resume loaded successfully ({len(MASTER_RESUME)} characters)")
 print(f"✓ Model: {config['model']}")
@@ -61,15 +78,16 @@ def connect_to_sheets():
     creds = ServiceAccountCredentials.from_json_keyfile_name(credentials_file, scope)
     client = gspread.authorize(creds)
     
-    return client.open('Ai Job Tracker')
+    return get_scheduler().read(client.open, 'Ai Job Tracker')
 
 # ========== AI SCORING FUNCTIONS ==========
 
-def get_ai_match_score(role, company, description):
-    """
-    Use Gemini to score a job match (0-100) with AI reasoning
-    CRITICAL: Prioritizes Top MNCs and high-paying roles
-    """
+# Prompt token budgets (see prompt_builder)
+PROMPT_TOKENS = 1000          # Resume + description for one job
+RESUME_TOKENS = 750
+
+def _match_messages(role, company, description):
+    """Elite recruiter prompt for one job"""
     
     # Elite recruiter prompt with MNC bias
     system_prompt = """You are an elite Tech Recruiter. Evaluate this job against the candidate's Master Resume. 
@@ -88,13 +106,19 @@ Heavily penalize or score low (<50) for:
 
 Be strict and selective. Only top opportunities deserve high scores."""
 
+    # Resume sections relevant to this job, then the description, within one budget
+    pb = PromptBuilder(PROMPT_TOKENS, label='sheet_match')
+    resume_part = pb.add('resume', MASTER_RESUME, RESUME_TOKENS,
+                         query=f"{role} {description}", priority=PRIORITY_SECTIONS)
+    description_part = pb.add('description', description, query=MASTER_RESUME)
+
     user_prompt = f"""CANDIDATE'S MASTER RESUME:
-{MASTER_RESUME}
+{resume_part}
 
 JOB DETAILS:
 - Role: {role}
 - Company: {company}
-- Description/Snippet: {description[:800]}
+- Description/Snippet: {description_part}
 
 TASK:
 Analyze this job against the resume. Return ONLY a valid JSON object with exactly two keys:
@@ -105,53 +129,71 @@ Analyze this job against the resume. Return ONLY a valid JSON object with exactl
 RESPOND WITH ONLY THE JSON OBJECT, NO OTHER TEXT:
 {{"Match_Score": <number>, "AI_Reasoning": "<explanation>"}}"""
     
+    return [
+        {
+            "role": "system",
+            "content": system_prompt
+        },
+        {
+            "role": "user",
+            "content": user_prompt
+        }
+    ]
+
+def _parse_match(result):
+    match_score = int(result.get('Match_Score', 50))
+    ai_reasoning = result.get('AI_Reasoning', 'AI analysis completed')
+    
+    # Validate score range
+    if match_score < 0 or match_score > 100:
+        match_score = 50
+    
+    return match_score, ai_reasoning
+
+def get_ai_match_score(role, company, description):
+    """
+    Use Gemini to score a job match (0-100) with AI reasoning
+    CRITICAL: Prioritizes Top MNCs and high-paying roles
+    """
     try:
-        # Call Gemini via OpenRouter
-        response = client.chat.completions.create(
-            model=config['model'],
-            messages=[
-                {
-                    "role": "system",
-                    "content": system_prompt
-                },
-                {
-                    "role": "user",
-                    "content": user_prompt
-                }
-            ],
+        # Call Gemini via OpenRouter (identical prompts are served from the cache)
+        result = chat_json(
+            client,
+            config['model'],
+            messages=_match_messages(role, company, description),
             temperature=0.2,  # Low temperature for consistent scoring
-            max_tokens=200
+            max_tokens=200,
+            feature='sheet_match'
         )
-        
-        # Parse the response
-        ai_response = response.choices[0].message.content.strip()
-        
-        # Extract JSON from response (handle markdown code blocks)
-        if "```json" in ai_response:
-            ai_response = ai_response.split("```json")[1].split("```")[0].strip()
-        elif "```" in ai_response:
-            ai_response = ai_response.split("```")[1].split("```")[0].strip()
-        
-        # Parse JSON
-        result = json.loads(ai_response)
-        
-        match_score = int(result.get('Match_Score', 50))
-        ai_reasoning = result.get('AI_Reasoning', 'AI analysis completed')
-        
-        # Validate score range
-        if match_score < 0 or match_score > 100:
-            match_score = 50
-        
-        return match_score, ai_reasoning
+        return _parse_match(result)
         
     except json.JSONDecodeError as e:
         print(f"   ⚠️ JSON parsing error: {e}")
-        print(f"   Raw response: {ai_response[:200]}")
+        print(f"   Raw response: {e.doc[:200]}")
         return None, None
     except Exception as e:
         print(f"   ⚠️ Error getting AI score: {e}")
         return None, None
 
+async def aget_ai_match_score(aclient, job, model=None, feature='sheet_match'):
+    """Async get_ai_match_score for the scoring executor (429s propagate for retry)"""
+    role, company, description = job
+    try:
+        result = await achat_json(
+            aclient,
+            model or config['model'],
+            messages=_match_messages(role, company, description),
+            temperature=0.2,
+            max_tokens=200,
+            feature=feature
+        )
+        return _parse_match(result)
+    except Exception as e:
+        if is_rate_limit(e):
+            raise
+        print(f"   ⚠️ Error getting AI score for {role} at {company}: {e}")
+        return None, None
+
 # ========== BATCH PROCESSING ==========
 
 def ensure_columns_exist(worksheet, headers):
@@ -172,28 +214,57 @@ def ensure_columns_exist(worksheet, headers):
     
     if needs_update:
         # Update the header row
-        worksheet.update('1:1', [headers])
+        get_scheduler().write(worksheet.update, '1:1', [headers])
         print(f"   ✓ Columns added successfully")
-        time.sleep(2)  # Wait for Google Sheets to update
     
     return headers
 
-def process_worksheet(worksheet, sheet_name, batch_size=3):
+SCORE_SCOPE = 'sheet'         # Score store scope for the MNC-weighted prompt
+
+def _row_description(row):
+    """Text scored for a sheet row (the best description-like column)"""
+    role = row.get('Role', 'Unknown Role')
+    company = row.get('Company', 'Unknown Company')
+    return str(
+        row.get('Description', '') or
+        row.get('Snippet', '') or
+        row.get('Summary', '') or
+        f"Role: {role} at {company}"
+    )
+
+def _previous_score(row):
+    try:
+        return float(row.get('Match_Score', ''))
+    except (TypeError, ValueError):
+        return -1.0
+
+def process_worksheet(worksheet, sheet_name, batch_size=30, rescore_stale=False):
     """
-    Process jobs in a worksheet that don't have Match_Score yet
+    Process jobs in a worksheet that don't have Match_Score yet.
+    Each batch is scored concurrently (config['scoring_concurrency'] requests
+    in flight) and written back with a single update_cells call.
+    
+    Scores are also kept in the score store with the resume / job hashes
+    they came from: empty cells with a still-valid stored score are filled
+    without an AI call, and rows whose job text changed are rescored.
+    rescore_stale: also rescore every row scored against an older resume
+    (or before the store existed), best previous scores first.
     """
     print(f"\n📋 Processing: {sheet_name}")
     
+    # All Sheets calls go through the quota-aware scheduler (no fixed sleeps)
+    scheduler = get_scheduler()
+    
     try:
         # Get all data
-        all_data = worksheet.get_all_records()
+        all_data = scheduler.read(worksheet.get_all_records)
         
         if not all_data:
             print(f"   ℹ️ No jobs found in {sheet_name}")
             return 0
         
         # Get headers
-        headers = worksheet.row_values(1)
+        headers = scheduler.read(worksheet.row_values, 1)
         
         # Ensure Match_Score and AI_Reasoning columns exist
         headers = ensure_columns_exist(worksheet, headers)
@@ -207,19 +278,43 @@ def process_worksheet(worksheet, sheet_name, batch_size=3):
             return 0
         
         # Reload data after column addition
-        all_data = worksheet.get_all_records()
+        all_data = scheduler.read(worksheet.get_all_records)
+        
+        # Decide per row from the score store: restore, score, or leave alone
+        store = get_score_store()
+        resume_hash = get_resume_hash()
+        row_jobs = [sheet_job(row, _row_description(row)) for row in all_data]
+        statuses = store.statuses(row_jobs, resume_hash, SCORE_SCOPE)
         
-        # Process jobs without scores
         jobs_processed = 0
         jobs_to_process = []
+        stale_rows = []
+        restored_cells = []
         
-        for idx, row in enumerate(all_data, start=2):  # Start at row 2 (after headers)
-            # Skip if already has a Match_Score
+        for idx, (row, (status, stored)) in enumerate(zip(all_data, statuses), start=2):  # Start at row 2 (after headers)
             score_value = row.get('Match_Score', '')
-            if score_value and str(score_value).strip():
-                continue
-            
-            jobs_to_process.append((idx, row))
+            if not (score_value and str(score_value).strip()):
+                if status == FRESH:
+                    # Same resume, same job: the stored score is still valid
+                    restored_cells.append(gspread.Cell(idx, match_score_col, stored[0]))
+                    restored_cells.append(gspread.Cell(idx, ai_reasoning_col, stored[1]))
+                else:
+                    jobs_to_process.append((idx, row))
+            elif status == STALE_JOB or (rescore_stale and status != FRESH):
+                stale_rows.append((idx, row))
+        
+        if restored_cells:
+            try:
+                scheduler.write(worksheet.update_cells, restored_cells)
+                print(f"   ♻️ Restored {len(restored_cells) // 2} unchanged scores without AI calls")
+            except Exception as update_error:
+                print(f"      ⚠️ Could not restore scores: {update_error}")
+        
+        if stale_rows:
+            # Most promising jobs first, so an interrupted run still refreshes what matters
+            stale_rows.sort(key=lambda item: _previous_score(item[1]), reverse=True)
+            print(f"   🔁 {len(stale_rows)} scored jobs are stale (resume or job text changed)")
+            jobs_to_process.extend(stale_rows)
         
         total_to_process = len(jobs_to_process)
         
@@ -229,51 +324,71 @@ def process_worksheet(worksheet, sheet_name, batch_size=3):
         
         print(f"   🎯 Found {total_to_process} jobs to score")
         
+        executor = ScoringExecutor(
+            lambda: make_async_client(config),
+            concurrency=config.get('scoring_concurrency', DEFAULT_CONCURRENCY)
+        )
+        cascade = ModelCascade.from_config(config)
+        
         # Process in batches
         for i in range(0, len(jobs_to_process), batch_size):
             batch = jobs_to_process[i:i+batch_size]
+            pending_cells = []
             
+            score_requests = []
             for row_idx, job in batch:
                 role = job.get('Role', 'Unknown Role')
                 company = job.get('Company', 'Unknown Company')
-                
-                # Try to get description from various possible columns
-                description = (
-                    job.get('Description', '') or 
-                    job.get('Snippet', '') or 
-                    job.get('Summary', '') or
-                    f"Role: {role} at {company}"
-                )
-                
-                print(f"   🤖 Analyzing: {role} at {company}...")
-                
-                # Get AI match score and reasoning
-                match_score, ai_reasoning = get_ai_match_score(role, company, description)
-                
+                score_requests.append((role, company, _row_description(job)))
+            
+            print(f"   🤖 Analyzing {len(batch)} jobs ({executor.concurrency} in flight)...")
+            
+            # Get AI match scores and reasoning (results keep the batch order)
+            first_model = cascade.fast_model if cascade else config['model']
+            results = executor.map(
+                lambda aclient, job: aget_ai_match_score(aclient, job, model=first_model),
+                score_requests,
+                on_error=lambda job, e: (None, None)   # Cell stays blank and is retried next run
+            )
+            models = [first_model] * len(results)
+            
+            # Cascade: only ambiguous scores go to the strong model
+            if cascade:
+                picked = cascade.escalations(results)
+                if picked:
+                    strong = executor.map(
+                        lambda aclient, i: aget_ai_match_score(aclient, score_requests[i], model=cascade.strong_model,
+                                                               feature='sheet_match_escalated'),
+                        picked,
+                        on_error=lambda i, e: (None, None)   # Keeps the fast score
+                    )
+                    cascade.merge(results, picked, strong, models)
+            
+            for (row_idx, _), (role, company, _), (match_score, ai_reasoning) in zip(batch, score_requests, results):
                 if match_score is not None:
-                    # Update the sheet
-                    try:
-                        # Update Match_Score column
-                        worksheet.update_cell(row_idx, match_score_col, match_score)
-                        # Update AI_Reasoning column
-                        worksheet.update_cell(row_idx, ai_reasoning_col, ai_reasoning)
-                        
-                        print(f"      ✓ Score: {match_score}/100 - {ai_reasoning}")
-                        jobs_processed += 1
-                        
-                    except Exception as update_error:
-                        print(f"      ⚠️ Could not update sheet: {update_error}")
+                    # Collect cells; the whole batch is written in one request
+                    pending_cells.append(gspread.Cell(row_idx, match_score_col, match_score))
+                    pending_cells.append(gspread.Cell(row_idx, ai_reasoning_col, ai_reasoning))
+                    print(f"      ✓ {role} at {company}: {match_score}/100 - {ai_reasoning}")
                 else:
-                    print(f"      ⚠️ Skipping due to AI error")
-                
-                # Delay to avoid rate limits (OpenRouter + Google Sheets)
-                time.sleep(2)
+                    print(f"      ⚠️ Skipping {role} at {company} due to AI error")
             
-            # Longer delay between batches
-            if i + batch_size < len(jobs_to_process):
-                print(f"   ⏳ Batch complete. Waiting 5 seconds before next batch...")
-                time.sleep(5)
+            if pending_cells:
+                try:
+                    scheduler.write(worksheet.update_cells, pending_cells)
+                    jobs_processed += len(pending_cells) // 2
+                    
+                    # Remember what each AI score was computed from (failed rows are retried)
+                    saved = [(sheet_job(row, request[2]), result, model)
+                             for (_, row), request, result, model in zip(batch, score_requests, results, models)
+                             if result[0] is not None]
+                    store.save([job for job, _, _ in saved], [result for _, result, _ in saved], resume_hash,
+                               SCORE_SCOPE, model=[model for _, _, model in saved])
+                except Exception as update_error:
+                    print(f"      ⚠️ Could not update sheet: {update_error}")
         
+        if cascade:
+            print(f"   🪜 Cascade: {cascade.summary()}")
         return jobs_processed
         
     except Exception as e:
@@ -284,8 +399,11 @@ def process_worksheet(worksheet, sheet_name, batch_size=3):
 
 # ========== MAIN EXECUTION ==========
 
-def main():
-    """Main execution function"""
+def main(rescore_stale=False):
+    """
+    Main execution function
+    rescore_stale: rescore jobs whose score predates the current resume
+    """
     print("=" * 70)
     print("🤖 SYSTEM RECOMMENDATION ENGINE - ELITE MNC MATCHER")
     print("=" * 70)
@@ -293,7 +411,10 @@ def main():
     print(f"✓ Resume loaded from: Assets/master resume.txt")
     print(f"✓ Processing 5 sheets with AI analysis")
     print(f"✓ Prioritizing: Top MNCs + High Salary + Tech Stack Match")
+    if rescore_stale:
+        print(f"✓ Rescoring stale jobs (resume changed), best previous scores first")
     print("=" * 70)
+    set_scan(f"Sheet scoring {time.strftime('%Y-%m-%d %H:%M')}")
     
     try:
         # Connect to Google Sheets
@@ -314,8 +435,8 @@ def main():
         # Process each worksheet
         for sheet_name in sheet_names:
             try:
-                worksheet = sheet.worksheet(sheet_name)
-                processed = process_worksheet(worksheet, sheet_name, batch_size=3)
+                worksheet = get_scheduler().read(sheet.worksheet, sheet_name)
+                processed = process_worksheet(worksheet, sheet_name, rescore_stale=rescore_stale)
                 total_processed += processed
             except gspread.exceptions.WorksheetNotFound:
                 print(f"\n⚠️ Worksheet '{sheet_name}' not found. Skipping...")
@@ -344,4 +465,9 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rescore-stale', action='store_true',
+                        help='Rescore jobs scored against an older resume, best previous scores first')
+    args = parser.parse_args()
+    main(rescore_stale=args.rescore_stale)
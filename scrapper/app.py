@@ -12,6 +12,14 @@ from oauth2client.service_account import ServiceAccountCredentials
 from datetime import datetime
 from resume_tailor import ResumeTailor
 from networking_agent import NetworkingAgent
+from job_archive import read_jobs
+from sheets_outbox import get_outbox
+from sheets_scheduler import get_scheduler, PRIORITY_INTERACTIVE
+from search_index import get_index
+from semantic_index import get_semantic_index
+from resume_reader import get_resume_hash
+from resume_analysis import load_latest_analysis
+from llm_metrics import feature_summary, scan_summary
 import json
 
 # ========== PAGE CONFIGURATION ==========
@@ -122,6 +130,17 @@ st.markdown("""
 
 """, unsafe_allow_html=True)
 
+# ========== BACKGROUND SHEETS WRITER ==========
+@st.cache_resource
+def start_sheets_outbox():
+    """
+    Drain rows queued by scans (sheets_outbox) in the background
+    Started once per dashboard process
+    """
+    outbox = get_outbox()
+    outbox.start_background()
+    return outbox
+
 # ========== DATA LOADING FUNCTIONS ==========
 @st.cache_data(ttl=30)  # Cache for 30 seconds (faster refresh)
 def load_from_google_sheets():
@@ -144,7 +163,7 @@ def load_from_google_sheets():
         client = gspread.authorize(creds)
         
         # Open sheet
-        sheet = client.open('Ai Job Tracker')
+        sheet = get_scheduler().read(client.open, 'Ai Job Tracker', priority=PRIORITY_INTERACTIVE)
         
         # Load from all 5 worksheets
         all_dfs = []
@@ -153,8 +172,12 @@ def load_from_google_sheets():
         
         for sheet_name in sheet_names:
             try:
-                worksheet = sheet.worksheet(sheet_name)
-                data = worksheet.get_all_records()
+                worksheet = get_scheduler().read(sheet.worksheet, sheet_name, priority=PRIORITY_INTERACTIVE)
+                data = get_scheduler().read(
+                    worksheet.get_all_records,
+                    priority=PRIORITY_INTERACTIVE,
+                    coalesce_key=f"records:{sheet_name}"
+                )
                 
                 if data:
                     df_temp = pd.DataFrame(data)
@@ -191,12 +214,75 @@ def load_from_google_sheets():
         if 'job_url' in df.columns:
             df = df.drop_duplicates(subset=['job_url'], keep='first')
         
+        # Keep the full-text index in sync (only changed rows are rewritten)
+        try:
+            get_index().index_jobs(df)
+        except Exception as e:
+            st.sidebar.warning(f"Search index not updated ({e}) - filters fall back to plain text matching")
+        
         return df
         
     except Exception as e:
         st.sidebar.warning(f"Could not load from Google Sheets: {e}")
         return None
 
+@st.cache_data(ttl=300)
+def load_from_archive(days=7, columns=None):
+    """
+    Load recently scraped jobs from the Parquet archive
+    Only the requested days and columns are read from disk
+    """
+    try:
+        return read_jobs(columns=columns, days=days)
+    except Exception as e:
+        st.sidebar.warning(f"Could not load job archive: {e}")
+        return pd.DataFrame()
+
+@st.cache_data
+def load_resume_profile(resume_hash):
+    """
+    Saved resume analysis for this resume version (keyed on the file hash,
+    so editing the resume invalidates it). Never calls the LLM.
+    """
+    return load_latest_analysis(resume_hash)
+
+@st.cache_data(ttl=60)
+def load_llm_usage(days=7):
+    """Per-feature and per-scan LLM aggregates from the local metrics store"""
+    try:
+        return pd.DataFrame(feature_summary(days)), pd.DataFrame(scan_summary(20))
+    except Exception:
+        return pd.DataFrame(), pd.DataFrame()
+
+def render_llm_usage():
+    """LLM latency / tokens / cost panel"""
+    by_feature, by_scan = load_llm_usage()
+    with st.expander("💸 LLM Usage (last 7 days)"):
+        if by_feature.empty:
+            st.caption("No LLM calls recorded yet.")
+            return
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Calls", int(by_feature['calls'].sum()),
+                  delta=f"{int(by_feature['cache_hits'].sum())} cached", delta_color="off")
+        m2.metric("Est. Cost", f"${by_feature['cost_usd'].sum():.3f}")
+        m3.metric("Errors", int(by_feature[['errors', 'rate_limited', 'parse_failures']].sum().sum()))
+
+        # Model cascade: escalated calls vs first-tier calls
+        escalated = by_feature[by_feature['feature'].str.endswith('_escalated')]
+        if not escalated.empty:
+            first_tier = by_feature[by_feature['feature'].isin(escalated['feature'].str.replace('_escalated', ''))]
+            if first_tier['calls'].sum():
+                st.caption(f"🪜 Cascade escalation rate: "
+                           f"{escalated['calls'].sum() / first_tier['calls'].sum():.0%} of calls")
+
+        columns = ['calls', 'cache_hits', 'avg_latency_ms', 'prompt_tokens', 'completion_tokens',
+                   'cost_usd', 'retries', 'rate_limited', 'errors', 'parse_failures', 'error_rate']
+        st.markdown("**Per feature**")
+        st.dataframe(by_feature.set_index('feature')[columns], use_container_width=True)
+        if not by_scan.empty:
+            st.markdown("**Per scan**")
+            st.dataframe(by_scan.set_index('scan_id')[columns], use_container_width=True)
+
 @st.cache_data(ttl=300)
 def load_from_csv():
     """
@@ -232,6 +318,9 @@ def load_data():
                 st.sidebar.text(f"{source}: {count}")
         
         st.sidebar.success(f"✅ Loaded {len(df)} jobs total")
+        archived = load_from_archive(days=7, columns=['job_url'])
+        if not archived.empty:
+            st.sidebar.caption(f"🗄️ Scraped last 7 days: {archived['job_url'].nunique()} jobs")
         return df
     
     # No fallback - return empty DataFrame
@@ -258,12 +347,16 @@ def load_applied_jobs():
         client = gspread.authorize(creds)
         
         # Open sheet
-        sheet = client.open('Ai Job Tracker')
+        sheet = get_scheduler().read(client.open, 'Ai Job Tracker', priority=PRIORITY_INTERACTIVE)
         
         # Load Applied_Jobs worksheet
         try:
-            worksheet = sheet.worksheet('Applied_Jobs')
-            data = worksheet.get_all_records()
+            worksheet = get_scheduler().read(sheet.worksheet, 'Applied_Jobs', priority=PRIORITY_INTERACTIVE)
+            data = get_scheduler().read(
+                worksheet.get_all_records,
+                priority=PRIORITY_INTERACTIVE,
+                coalesce_key="records:Applied_Jobs"
+            )
             
             if data:
                 return pd.DataFrame(data)
@@ -289,11 +382,15 @@ def load_my_network():
         scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
         creds = ServiceAccountCredentials.from_json_keyfile_name(credentials_file, scope)
         client = gspread.authorize(creds)
-        sheet = client.open('Ai Job Tracker')
+        sheet = get_scheduler().read(client.open, 'Ai Job Tracker', priority=PRIORITY_INTERACTIVE)
         
         try:
-            worksheet = sheet.worksheet('My_Network')
-            data = worksheet.get_all_records()
+            worksheet = get_scheduler().read(sheet.worksheet, 'My_Network', priority=PRIORITY_INTERACTIVE)
+            data = get_scheduler().read(
+                worksheet.get_all_records,
+                priority=PRIORITY_INTERACTIVE,
+                coalesce_key="records:My_Network"
+            )
             return pd.DataFrame(data) if data else pd.DataFrame()
         except:
             return pd.DataFrame()
@@ -319,17 +416,18 @@ def add_to_applied_jobs(job):
         client = gspread.authorize(creds)
         
         # Open sheet
-        sheet = client.open('Ai Job Tracker')
+        sheet = get_scheduler().read(client.open, 'Ai Job Tracker', priority=PRIORITY_INTERACTIVE)
         
         # Get or create Applied_Jobs worksheet
         try:
-            worksheet = sheet.worksheet('Applied_Jobs')
+            worksheet = get_scheduler().read(sheet.worksheet, 'Applied_Jobs', priority=PRIORITY_INTERACTIVE)
         except:
             # Create the worksheet if it doesn't exist
-            worksheet = sheet.add_worksheet(title='Applied_Jobs', rows=1000, cols=11)
+            worksheet = get_scheduler().write(sheet.add_worksheet, title='Applied_Jobs', rows=1000, cols=11,
+                                              priority=PRIORITY_INTERACTIVE)
             # Add headers
             headers = ['Role', 'Company', 'Location', 'Mode', 'Link', 'Source', 'Salary', 'Posted_Date', 'Score', 'Summary', 'status']
-            worksheet.append_row(headers)
+            get_scheduler().write(worksheet.append_row, headers, priority=PRIORITY_INTERACTIVE)
         
         # Prepare row data
         today = datetime.now().strftime('%Y-%m-%d')
@@ -348,7 +446,7 @@ def add_to_applied_jobs(job):
         ]
         
         # Append the row
-        worksheet.append_row(row_data)
+        get_scheduler().write(worksheet.append_row, row_data, priority=PRIORITY_INTERACTIVE)
         
         # Clear cache so the applied jobs list updates
         load_applied_jobs.clear()
@@ -370,16 +468,22 @@ def add_to_network(person, company, linkedin_url):
         scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
         creds = ServiceAccountCredentials.from_json_keyfile_name(credentials_file, scope)
         client = gspread.authorize(creds)
-        sheet = client.open('Ai Job Tracker')
+        sheet = get_scheduler().read(client.open, 'Ai Job Tracker', priority=PRIORITY_INTERACTIVE)
         
         try:
-            worksheet = sheet.worksheet('My_Network')
+            worksheet = get_scheduler().read(sheet.worksheet, 'My_Network', priority=PRIORITY_INTERACTIVE)
         except:
-            worksheet = sheet.add_worksheet(title='My_Network', rows=1000, cols=5)
-            worksheet.append_row(['Name', 'Headline', 'Company', 'LinkedIn', 'Date_Added'])
+            worksheet = get_scheduler().write(sheet.add_worksheet, title='My_Network', rows=1000, cols=5,
+                                              priority=PRIORITY_INTERACTIVE)
+            get_scheduler().write(worksheet.append_row, ['Name', 'Headline', 'Company', 'LinkedIn', 'Date_Added'],
+                                  priority=PRIORITY_INTERACTIVE)
             
         today = datetime.now().strftime('%Y-%m-%d')
-        worksheet.append_row([str(person.get('name', '')), str(person.get('headline', '')), str(company), str(linkedin_url), today])
+        get_scheduler().write(
+            worksheet.append_row,
+            [str(person.get('name', '')), str(person.get('headline', '')), str(company), str(linkedin_url), today],
+            priority=PRIORITY_INTERACTIVE
+        )
         return True, "Added to My Network"
     except Exception as e:
         return False, f"Error: {str(e)}"
@@ -559,34 +663,98 @@ def render_job_card(job, job_index=None):
         # Divider
         st.markdown("---")
 
-def filter_jobs(df, role_search="", location_search="", remote_only=False):
+def substring_filter_jobs(df, role_search="", location_search="", remote_only=False):
     """
     Filter jobs based on search criteria with safe column access
+    (plain substring matching, used when the search index is unavailable)
     """
     filtered_df = df.copy()
     
     # Role filter - only if title column exists
     if role_search and 'title' in filtered_df.columns:
         filtered_df = filtered_df[
-            filtered_df['title'].str.contains(role_search, case=False, na=False)
+            filtered_df['title'].astype(str).str.contains(role_search, case=False, na=False, regex=False)
         ]
     
     # Location filter - only if location column exists
     if location_search and 'location' in filtered_df.columns:
         filtered_df = filtered_df[
-            filtered_df['location'].str.contains(location_search, case=False, na=False)
+            filtered_df['location'].astype(str).str.contains(location_search, case=False, na=False, regex=False)
         ]
     
     # Remote filter - only if location column exists
     if remote_only and 'location' in filtered_df.columns:
         filtered_df = filtered_df[
-            filtered_df['location'].str.contains('remote', case=False, na=False)
+            filtered_df['location'].astype(str).str.contains('remote', case=False, na=False)
         ]
     
     return filtered_df
 
+def filter_jobs(df, role_search="", location_search="", remote_only=False):
+    """
+    Filter jobs based on search criteria using the full-text index
+    Results are ordered by relevance (title matches first, prefix matching).
+    Only df's own rows are ranked, so archived jobs can't crowd them out.
+    Rows without a usable link are never indexed; they go through the plain
+    substring filter and follow the ranked rows.
+    """
+    if df.empty or not (role_search or location_search or remote_only):
+        return df
+    if 'job_url' not in df.columns:
+        return substring_filter_jobs(df, role_search, location_search, remote_only)
+    
+    job_urls = df['job_url'].fillna('').astype(str).str.strip()
+    unindexed = job_urls.str.lower().isin(['', '#', 'nan', 'none', 'nat']).to_numpy()
+    try:
+        index = get_index()
+        index.index_jobs(df)   # No-op for rows already indexed at load
+        hits = index.search(
+            role_search,
+            location=location_search or None,
+            remote_only=remote_only,
+            job_urls=job_urls[~unindexed].tolist(),
+            limit=max(len(df), 1)
+        )
+    except Exception as e:
+        st.caption(f"⚠️ Search index unavailable ({e}) - using plain text filters")
+        return substring_filter_jobs(df, role_search, location_search, remote_only)
+    
+    order = {hit['job_url']: rank for rank, hit in enumerate(hits)}
+    keep = job_urls.isin(order).to_numpy() & ~unindexed
+    ranked = df[keep].iloc[job_urls[keep].map(order).argsort()]
+    if not unindexed.any():
+        return ranked
+    return pd.concat([ranked, substring_filter_jobs(df[unindexed], role_search, location_search, remote_only)])
+
 # ========== MAIN APP ==========
 def main():
+    outbox = start_sheets_outbox()
+    pending_writes = outbox.pending_count()
+    if pending_writes:
+        st.sidebar.info(f"📮 {pending_writes} jobs waiting to sync to Google Sheets")
+    failed_writes = outbox.dead_count()
+    if failed_writes:
+        st.sidebar.warning(f"📮 {failed_writes} jobs failed to sync to Google Sheets after repeated retries")
+    
+    # Sheets API quota left in the current minute (this dashboard process)
+    quota = get_scheduler().headroom()
+    st.sidebar.caption(
+        f"🚦 Sheets quota/min — reads: {quota['read']['remaining']}/{quota['read']['limit']}"
+        f" · writes: {quota['write']['remaining']}/{quota['write']['limit']}"
+    )
+    
+    # Resume profile from the memoized analysis (updated by each scan)
+    resume_hash = get_resume_hash()
+    profile = load_resume_profile(resume_hash) if resume_hash else None
+    if profile:
+        st.sidebar.markdown("### 🧾 Resume Profile")
+        st.sidebar.caption(
+            f"Level: {profile.get('experience_level', 'N/A')} · "
+            f"Roles: {', '.join(profile.get('roles', [])[:3])}"
+        )
+        if profile.get('skills'):
+            st.sidebar.caption(f"Skills: {', '.join(profile['skills'][:5])}")
+    
     # Header with animated gradient
     st.markdown("""
         <div style="text-align: center; padding: 20px 0;">
@@ -657,6 +825,7 @@ def main():
                     ["Direct_Portals", "International_Remote", "Indian_Remote", "Indian_Onsite", "Career_Portals"]
                 )
                 scan_limit = st.slider("Jobs to Fetch", 5, 60, 20)
+                fast_scan = st.checkbox("⚡ Fast mode (local scoring, no AI calls)", value=False)
                 
                 if st.form_submit_button("⚡ Run Targeted Scan", type="primary", use_container_width=True):
                     # Clear any previous errors
@@ -674,6 +843,8 @@ def main():
                             
                             # Pass arguments
                             cmd = [sys.executable, rec_script, "--category", scan_category, "--limit", str(scan_limit)]
+                            if fast_scan:
+                                cmd.append("--fast")
                             
                             result = subprocess.run(
                                 cmd,
@@ -698,6 +869,8 @@ def main():
                         except Exception as e:
                             st.error(f"❌ Error: {e}")
 
+            render_llm_usage()
+
         with col_filt:
             category_filter = st.selectbox(
                 "📂 Filter by Category",
@@ -711,15 +884,20 @@ def main():
                 ],
                 label_visibility="collapsed"
             )
+            fc1, fc2, fc3 = st.columns([2, 2, 1])
+            role_search = fc1.text_input("🔎 Search jobs", placeholder="e.g. python backend", key="role_search")
+            location_search = fc2.text_input("📍 Location", placeholder="e.g. Bangalore", key="location_search")
+            remote_only = fc3.checkbox("Remote only", key="remote_only")
 
         # Show Jobs
         if df.empty:
             st.info("👋 No jobs found yet. Click 'Run Full Scan' to start your job hunt!")
         else:
+            shown_df = filter_jobs(df, role_search, location_search, remote_only)
             if category_filter == "All AI Recommendations":
-                display_category_jobs(df, "All Jobs")
+                display_category_jobs(shown_df, "All Jobs")
             else:
-                display_category_jobs(df, category_filter)
+                display_category_jobs(shown_df, category_filter)
                 
             
     # ========== TAB 2: MANUAL SEARCH ==========
@@ -765,25 +943,54 @@ def main():
                 default=["Remote", "Hybrid", "Onsite"]
             )
 
+        live_scrape = st.checkbox(
+            "🌐 Also scrape live job boards (slower)",
+            value=False,
+            help="Stored jobs are searched instantly; this adds fresh results from JobSpy"
+        )
+
         st.markdown("---")
         
         if st.button("🚀 Search Jobs", type="primary", use_container_width=True):
             if query:
-                with st.spinner("🔍 Searching for jobs..."):
-                    try:
-                        from manual_search import scrape_jobs_by_query
-                        search_country = None if country == "All Countries" else country
-                        
-                        results_df = scrape_jobs_by_query(
-                            query=query,
-                            country=search_country,
-                            location=location,
-                            work_mode=work_mode,
-                            results_wanted=50
-                        )
-                        st.session_state.manual_search_results = results_df
-                    except Exception as e:
-                        st.error(f"Search failed: {e}")
+                search_country = None if country == "All Countries" else country
+                results = []
+                
+                # 1. Instant ranked matches from every stored job
+                # (country is only a scrape parameter: stored locations rarely name the country)
+                try:
+                    hits = get_semantic_index().search(
+                        query,
+                        limit=50,
+                        location=location,
+                        work_modes=work_mode if 0 < len(work_mode) < 3 else None
+                    )
+                    if hits:
+                        results.append(pd.DataFrame(hits).drop(columns=['id']))
+                except Exception as e:
+                    st.warning(f"Local search unavailable: {e}")
+                
+                # 2. Optional live scrape on top
+                if live_scrape:
+                    with st.spinner("🔍 Scraping job boards..."):
+                        try:
+                            from manual_search import scrape_jobs_by_query
+                            
+                            results.append(scrape_jobs_by_query(
+                                query=query,
+                                country=search_country,
+                                location=location,
+                                work_mode=work_mode,
+                                results_wanted=50
+                            ))
+                        except Exception as e:
+                            st.error(f"Live search failed: {e}")
+                
+                results = [df for df in results if df is not None and not df.empty]
+                results_df = pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+                if 'job_url' in results_df.columns:
+                    results_df = results_df.drop_duplicates(subset=['job_url'], keep='first')
+                st.session_state.manual_search_results = results_df
 
         # Display results
         if 'manual_search_results' in st.session_state and st.session_state.manual_search_results is not None:
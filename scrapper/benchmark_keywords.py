@@ -0,0 +1,139 @@
+"""
+⏱️ KEYWORD MATCHING MICRO-BENCHMARK - PER-JOB CLASSIFIER COST
+Times the job_search classifiers (tech stack, seniority, location, work mode)
+as they were written - one substring scan per keyword - against the same
+classifiers on keyword_engine matchers, a single combined trie regex pass
+over the whole vocabulary, and LocalScorer throughput.
+Also reports how often the two disagree (whole-term matching no longer
+counts 'ai' in "email" or 'intern' in "international").
+
+    python benchmark_keywords.py --jobs 5000
+"""
+
+import re
+import time
+import random
+
+from keyword_engine import KeywordMatcher, INDIAN_LOCATIONS, is_indian_location, keyword_pattern
+from local_scorer import LocalScorer
+
+# ========== VOCABULARY (as in job_search) ==========
+
+TECH_STACK = ['python', 'c++', 'mern', 'react', 'node', 'ai', 'machine learning', 'intern', 'software', 'developer']
+SENIORITY = {
+    'intern': ['intern', 'internship', 'co-op', 'coop'],
+    'entry': ['entry', 'junior', 'graduate', 'associate', 'early career'],
+    'mid': ['mid-level', 'intermediate', 'experienced'],
+    'senior': ['senior', 'sr.', 'lead', 'principal', 'staff'],
+    'executive': ['director', 'vp', 'vice president', 'head of', 'chief', 'cto', 'ceo']
+}
+
+# ========== SUBSTRING SCANS (before) ==========
+
+def substring_classify(title, location, description):
+    text = f"{title} {description}".lower()
+    location_str = location.lower()
+    combined = f"{location_str} {description.lower()}"
+
+    tech = any(keyword in text for keyword in TECH_STACK)
+    seniority = 'Not Specified'
+    for level, keywords in SENIORITY.items():
+        if any(keyword in text for keyword in keywords):
+            seniority = level.capitalize()
+            break
+    national = any(keyword in location_str for keyword in INDIAN_LOCATIONS)
+    if 'remote' in combined:
+        mode = 'Hybrid' if ('hybrid' in combined or 'on-site' in combined or 'onsite' in combined) else 'Remote'
+    else:
+        mode = 'Hybrid' if 'hybrid' in combined else 'Onsite'
+    return tech, seniority, national, mode
+
+# ========== KEYWORD ENGINE (after) ==========
+
+TECH_MATCHER = KeywordMatcher(TECH_STACK + ['internship'], plurals=True)
+SENIORITY_MATCHER = KeywordMatcher(SENIORITY, plurals=True)
+MODE_MATCHER = KeywordMatcher({'remote': ['remote', 'remotely'], 'hybrid': ['hybrid'],
+                               'onsite': ['onsite', 'on-site']})
+
+def engine_classify(title, location, description):
+    text = f"{title} {description}".lower()
+    location_str = location.lower()
+
+    tech = TECH_MATCHER.search(text)
+    level = SENIORITY_MATCHER.first(text)
+    national = is_indian_location(location_str)
+    modes = MODE_MATCHER.labels(f"{location_str} {description.lower()}")
+    if 'remote' in modes:
+        mode = 'Hybrid' if modes & {'hybrid', 'onsite'} else 'Remote'
+    else:
+        mode = 'Hybrid' if 'hybrid' in modes else 'Onsite'
+    return tech, level.capitalize() if level else 'Not Specified', national, mode
+
+# ========== ONE COMBINED REGEX (reference) ==========
+
+ALL_KEYWORDS = (TECH_STACK + [k for keywords in SENIORITY.values() for k in keywords] +
+                INDIAN_LOCATIONS + ['remote', 'remotely', 'hybrid', 'onsite', 'on-site'])
+COMBINED = re.compile(keyword_pattern(ALL_KEYWORDS, capture=True))
+
+def combined_hits(title, location, description):
+    return set(COMBINED.findall(f"{title} {location} {description}".lower()))
+
+# ========== SAMPLE JOBS ==========
+
+TITLES = ['Software Engineer', 'Senior Python Developer', 'ML Engineer Intern', 'Data Analyst',
+          'Staff Backend Engineer', 'Associate Consultant', 'Director of Engineering', 'QA Lead']
+LOCATIONS = ['Bengaluru, Karnataka, India', 'Remote', 'New York, NY', 'Hyderabad, India',
+             'London, UK', 'Remote - India', 'Indianapolis, IN', 'Berlin, Germany']
+FILLER = ("We are looking for people who care about quality and ship reliable software. You will "
+          "maintain internal tools, email stakeholders and work across international teams. Our "
+          "stack includes Python, React, Node.js, Docker, Kubernetes, PostgreSQL and AWS. You "
+          "will design services, review code, write tests, improve observability, mentor peers, "
+          "own features end to end and partner with product, design and data. Benefits include "
+          "health cover, learning budget, flexible hours and a hybrid schedule with two days "
+          "on-site. Leadership opportunities for people who grow with us.").split()
+
+def sample_jobs(count, seed=3):
+    rng = random.Random(seed)
+    return [{
+        'title': rng.choice(TITLES),
+        'location': rng.choice(LOCATIONS),
+        'company': rng.choice(['Google', 'Acme', 'Infosys', 'Stripe']),
+        'description': ' '.join(rng.choice(FILLER) for _ in range(rng.randint(80, 400)))
+    } for _ in range(count)]
+
+# ========== MAIN ==========
+
+def per_job_us(fn, jobs):
+    started = time.perf_counter()
+    results = [fn(job['title'], job['location'], job['description']) for job in jobs]
+    return (time.perf_counter() - started) / len(jobs) * 1e6, results
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Per-job cost of keyword classification')
+    parser.add_argument('--jobs', type=int, default=5000)
+    args = parser.parse_args()
+
+    jobs = sample_jobs(args.jobs)
+    before_us, before = per_job_us(substring_classify, jobs)
+    after_us, after = per_job_us(engine_classify, jobs)
+    combined_us, _ = per_job_us(combined_hits, jobs)
+
+    labels = ['tech stack', 'seniority', 'national', 'work mode']
+    print("=" * 60)
+    print(f"🔎 {len(jobs)} jobs, avg description {sum(len(j['description']) for j in jobs) // len(jobs)} chars")
+    print("=" * 60)
+    print(f"   substring scans : {before_us:8.1f} µs/job")
+    print(f"   keyword engine  : {after_us:8.1f} µs/job  ({after_us / before_us:.1f}x the substring cost)")
+    print(f"   combined regex  : {combined_us:8.1f} µs/job  (all hits, one pass, no classification)")
+    for i, label in enumerate(labels):
+        differ = sum(1 for b, a in zip(before, after) if b[i] != a[i])
+        print(f"   {label:<11} differs on {differ / len(jobs):6.1%} of jobs")
+
+    scorer = LocalScorer(['python', 'react', 'node.js', 'docker', 'aws', 'machine learning', 'sql'],
+                         'Fresher', ['India', 'Remote'])
+    started = time.perf_counter()
+    scorer.score_jobs(jobs)
+    elapsed = time.perf_counter() - started
+    print(f"   LocalScorer     : {elapsed / len(jobs) * 1e6:8.1f} µs/job  ({len(jobs) / elapsed:.0f} jobs/s)")
+    print("=" * 60)
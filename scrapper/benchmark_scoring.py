@@ -0,0 +1,179 @@
+"""
+⏱️ SCORING BENCHMARK - JOBS SCORED PER SECOND FOR EACH SCORING MODE
+Runs the real system_recommendation scoring code against the local LLM stub
+(llm_stub_server), so throughput and failure handling can be measured
+without OpenRouter cost:
+- local    LocalScorer only (the --fast scan path, no LLM)
+- single   one request per job through the scoring executor
+- batch    score_jobs_batch (packed requests, single model)
+- cascade  score_jobs_batch with a fast/strong model cascade
+
+For each mode it reports jobs/s, requests sent, 429s, 500s, malformed
+replies and how many jobs ended on the local fallback score. The LLM cache
+and metrics DB are redirected to a temp folder, so nothing real is touched.
+
+    python benchmark_scoring.py --jobs 300 --latency 600 --rps 25 --errors 0.02 --malformed 0.05
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+import system_recommendation as sr
+import llm_cache
+import llm_metrics
+from llm_client import get_gate
+from local_scorer import is_local_reason
+from llm_stub_server import StubServer, StubSettings
+
+# ========== CONFIGURATION ==========
+
+MODES = ['local', 'single', 'batch', 'cascade']
+
+SAMPLE_RESUME = """Jane Doe - Software Engineer (Fresher)
+SKILLS
+Python, Django, React, JavaScript, SQL, Docker, AWS, Machine Learning, PyTorch
+EXPERIENCE
+Software Engineering Intern - Acme Corp (6 months)
+- Built REST APIs in Django and PostgreSQL used by 10k users
+- Added React dashboards and CI pipelines with Docker
+PROJECTS
+- Resume matcher: NLP pipeline with spaCy and scikit-learn
+- Image classifier with PyTorch (92% accuracy)
+CERTIFICATIONS
+AWS Certified Cloud Practitioner; DeepLearning.AI Machine Learning Specialization
+"""
+
+TITLES = ['Software Engineer', 'Python Developer', 'Machine Learning Engineer', 'Data Analyst',
+          'Frontend Developer', 'Backend Engineer', 'DevOps Engineer', 'Senior Java Developer',
+          'Full Stack Developer', 'Data Scientist', 'QA Engineer', 'Staff Platform Engineer']
+COMPANIES = ['Google', 'Microsoft', 'Acme', 'Stripe', 'Infosys', 'Zomato', 'Startup XYZ', 'Amazon']
+STACKS = ['Python Django PostgreSQL', 'React TypeScript Redux', 'Java Spring Boot Kafka',
+          'PyTorch TensorFlow MLOps', 'AWS Terraform Kubernetes', 'SQL Tableau Excel']
+
+def sample_jobs(count, seed=7):
+    """Synthetic postings with the fields the scorers read"""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        title = rng.choice(TITLES)
+        years = rng.choice([0, 1, 2, 3, 5, 8])
+        jobs.append({
+            'title': f"{title} {i}",
+            'company': rng.choice(COMPANIES),
+            'location': rng.choice(['Remote', 'Bangalore, India', 'Hyderabad, India', 'New York, NY']),
+            'job_url': f"https://example.com/jobs/{i}",
+            'description': (f"We are hiring a {title} with {years}+ years of experience. "
+                            f"Stack: {rng.choice(STACKS)}. You will design, build and ship "
+                            f"features end to end with a small team. " * 3)
+        })
+    return jobs
+
+# ========== MODES ==========
+
+def _setup(url, args, mode, workdir):
+    """Point system_recommendation at the stub with a fresh cache for this mode"""
+    sr.config = {
+        'model': 'stub/default',
+        'openrouter_key': 'stub',
+        'base_url': url,
+        'scoring_concurrency': args.concurrency,
+        'llm_concurrency': args.concurrency * 2,
+    }
+    if mode == 'cascade':
+        sr.config['scoring_cascade'] = {'fast_model': 'stub/fast', 'strong_model': 'stub/strong',
+                                        'band': [55, 85]}
+    sr.MASTER_RESUME = SAMPLE_RESUME
+    sr.client = sr.get_client(sr.config)
+    sr.local_scorer = None
+    llm_cache._default_cache = llm_cache.LLMCache(os.path.join(workdir, f"cache_{mode}.db"))
+
+def run_mode(mode, jobs):
+    if mode == 'local':
+        return sr.get_local_scorer().score_jobs(jobs)
+    if mode == 'single':
+        return sr.get_scoring_executor().map(
+            sr.ascore_job_match, jobs,
+            on_error=lambda job, e: sr.local_fallback(job['title'], job['company'], job['description'])
+        )
+    return sr.score_jobs_batch(jobs)
+
+def benchmark(args):
+    jobs = sample_jobs(args.jobs)
+    settings = StubSettings(args.latency, args.jitter, args.rps, args.errors, args.malformed, args.seed)
+    workdir = tempfile.mkdtemp(prefix='scoring_bench_')
+    llm_metrics._default_store = llm_metrics.MetricsStore(os.path.join(workdir, 'metrics.db'))
+
+    rows = []
+    with StubServer(settings) as stub:
+        print(f"🧪 Stub at {stub.url} (median {args.latency:.0f}ms, rps={args.rps or '∞'}, "
+              f"500s={args.errors:.0%}, malformed={args.malformed:.0%})")
+        for mode in args.modes:
+            _setup(stub.url, args, mode, workdir)
+            stub.reset_stats()
+            gate = get_gate()
+            retries_before = gate.stats['retries']
+
+            print(f"\n▶ {mode}: {len(jobs)} jobs")
+            started = time.perf_counter()
+            results = run_mode(mode, jobs)
+            elapsed = time.perf_counter() - started
+
+            fallbacks = sum(1 for r in results if r and mode != 'local' and is_local_reason(r[1]))
+            rows.append({
+                'mode': mode,
+                'seconds': elapsed,
+                'jobs_per_s': len(jobs) / elapsed if elapsed else 0.0,
+                'requests': stub.stats['requests'],
+                '429s': stub.stats['rate_limited'],
+                '500s': stub.stats['errors'],
+                'malformed': stub.stats['malformed'],
+                'retries': gate.stats['retries'] - retries_before,
+                'fallback': fallbacks,
+                'unscored': sum(1 for r in results if not r or r[0] is None),
+            })
+    return rows
+
+def print_report(rows):
+    columns = ['mode', 'seconds', 'jobs_per_s', 'requests', '429s', '500s', 'malformed',
+               'retries', 'fallback', 'unscored']
+    print("\n" + "=" * 100)
+    print("".join(f"{c:>11}" if c != 'mode' else f"{c:<10}" for c in columns))
+    print("-" * 100)
+    for row in rows:
+        cells = []
+        for c in columns:
+            value = row[c]
+            if c == 'mode':
+                cells.append(f"{value:<10}")
+            elif isinstance(value, float):
+                cells.append(f"{value:>11.2f}")
+            else:
+                cells.append(f"{value:>11}")
+        print("".join(cells))
+    print("=" * 100)
+    print("fallback = jobs that ended on the local score after LLM failures")
+
+# ========== MAIN ==========
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark job scoring modes against the LLM stub')
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--modes', type=lambda s: s.split(','), default=MODES,
+                        help=f"Comma-separated subset of {','.join(MODES)}")
+    parser.add_argument('--concurrency', type=int, default=8, help='scoring_concurrency')
+    parser.add_argument('--latency', type=float, default=600, help='Stub median latency (ms)')
+    parser.add_argument('--jitter', type=float, default=0.5, help='Stub latency log-normal sigma')
+    parser.add_argument('--rps', type=float, default=0, help='Stub rate limit (0 = unlimited)')
+    parser.add_argument('--errors', type=float, default=0.0, help='Share of 500 replies')
+    parser.add_argument('--malformed', type=float, default=0.0, help='Share of broken JSON replies')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    unknown = [m for m in args.modes if m not in MODES]
+    if unknown:
+        sys.exit(f"Unknown mode(s): {', '.join(unknown)}")
+    print_report(benchmark(args))
@@ -0,0 +1,72 @@
+"""
+⏱️ WORK-MODE FILTER BENCHMARK - ROW-WISE APPLY VS COLUMN REGEX
+Times manual_search.filter_by_work_mode (one compiled regex over the
+lower-cased location / description columns) against the row-wise
+df.apply version it replaced, on a large synthetic DataFrame, and checks
+that both keep exactly the same rows.
+
+    python benchmark_work_mode.py --rows 200000
+"""
+
+import time
+import random
+import pandas as pd
+
+from keyword_engine import KeywordMatcher
+from manual_search import WORK_MODE_KEYWORDS, WORK_MODE_DESC_CHARS, filter_by_work_mode
+
+# ========== ROW-WISE (before) ==========
+
+WORK_MODE_MATCHER = KeywordMatcher(WORK_MODE_KEYWORDS)
+
+def filter_by_work_mode_rowwise(df, work_mode):
+    wanted = set(work_mode)
+
+    def matches_work_mode(row):
+        location_str = str(row.get('location', '')).lower()
+        desc_str = str(row.get('description', ''))[:WORK_MODE_DESC_CHARS].lower()
+        return bool(WORK_MODE_MATCHER.labels(f"{location_str}\n{desc_str}") & wanted)
+
+    return df[df.apply(matches_work_mode, axis=1)]
+
+# ========== SAMPLE DATA ==========
+
+LOCATIONS = ['Remote', 'Bengaluru, India', 'Hybrid - Pune', 'New York, NY (On-site)', 'London, UK',
+             'Remote - US', 'Hyderabad', 'Berlin, Germany', None]
+OPENINGS = ['This is a fully remote role.', 'Work from home two days a week.', 'Our office is in the city centre.',
+            'Hybrid working with flexible hours.', 'You will join a small product team.',
+            'Onsite at our new campus.', 'We are an international company with remote-first culture.',
+            'Join our back-office operations group.', 'Great benefits and learning budget.']
+
+def sample_frame(rows, seed=5):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        'title': [f"Software Engineer {i}" for i in range(rows)],
+        'location': [rng.choice(LOCATIONS) for _ in range(rows)],
+        'description': [f"{rng.choice(OPENINGS)} {rng.choice(OPENINGS)} " * 4 for _ in range(rows)],
+    })
+
+# ========== MAIN ==========
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Row-wise vs vectorized work-mode filtering')
+    parser.add_argument('--rows', type=int, default=200000)
+    args = parser.parse_args()
+
+    df = sample_frame(args.rows)
+    print("=" * 60)
+    print(f"🏠 {len(df)} synthetic jobs")
+    print("=" * 60)
+    for modes in (['Remote'], ['Hybrid', 'Onsite'], ['Remote', 'Hybrid', 'Onsite']):
+        before_s, before = timed(filter_by_work_mode_rowwise, df, modes)
+        after_s, after = timed(filter_by_work_mode, df, modes)
+        same = before.index.equals(after.index)
+        print(f"   {'+'.join(modes):<20} apply {before_s:6.2f}s | regex {after_s:6.2f}s "
+              f"({before_s / after_s:5.1f}x) | {len(after)} rows {'✓ same' if same else '✗ DIFFERENT'}")
+    print("=" * 60)
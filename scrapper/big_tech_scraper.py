@@ -2,6 +2,11 @@ import json
 import os
 import requests
 
+try:
+    from job_record import JobRecord
+except ImportError:
+    from scrapper.job_record import JobRecord
+
 try:
     from serpapi import GoogleSearch
 except ImportError:
@@ -53,15 +58,15 @@ class BigTechScraper:
                 job_url = related_links[0].get('link') if related_links else ''
                 desc = job.get('description', '')[:500]
 
-                jobs_list.append({
-                    'title': title,
-                    'company': company,
-                    'location': loc,
-                    'job_url': job_url,
-                    'description': desc + "...",
-                    'source': "Direct: " + company,
-                    'posted_date': job.get('detected_extensions', {}).get('posted_at', 'Recently')
-                })
+                jobs_list.append(JobRecord(
+                    title=title,
+                    company=company,
+                    location=loc,
+                    job_url=job_url,
+                    description=desc + "...",
+                    source="Direct: " + company,
+                    posted_date=job.get('detected_extensions', {}).get('posted_at', 'Recently')
+                ))
             
             print(f"   ✓ Extracted {len(jobs_list)} direct Big Tech jobs via SerpAPI")
         except Exception as e:
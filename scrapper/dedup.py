@@ -0,0 +1,261 @@
+"""
+🧬 NEAR-DUPLICATE JOB DETECTOR - MINHASH + LSH
+Collapses the same posting scraped from different boards (LinkedIn, Indeed,
+Glassdoor, ATS portals) before the expensive scoring/saving stages.
+
+Each job gets two MinHash signatures:
+- header: normalized title + company (required to be near-identical)
+- description: word 3-gram shingles (checked only when both jobs have one)
+The city must also match when both boards report one, so the same title
+in Mumbai and Bengaluru stays two separate postings.
+
+Header signatures are split into LSH bands, so each job is only compared
+against the few jobs sharing a bucket -> near-linear cost.
+"""
+
+import re
+import zlib
+import numpy as np
+import pandas as pd
+
+# ========== CONFIGURATION ==========
+
+NUM_PERM = 64            # MinHash permutations per signature
+LSH_BANDS = 16           # 16 bands x 4 rows
+HEADER_THRESHOLD = 0.7   # Min estimated Jaccard on title/company
+DESC_THRESHOLD = 0.5     # Min estimated Jaccard on description shingles
+DESC_WORDS = 200         # Only the first N description words are shingled
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+COMPANY_SUFFIXES = {
+    'inc', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+    'pvt', 'private', 'plc', 'gmbh', 'technologies', 'technology', 'group'
+}
+
+CITY_ALIASES = {
+    'bangalore': 'bengaluru',
+    'gurgaon': 'gurugram',
+    'bombay': 'mumbai',
+    'new delhi': 'delhi',
+    'madras': 'chennai',
+    'calcutta': 'kolkata',
+    'sf': 'san francisco',
+    'nyc': 'new york',
+}
+
+_NON_WORD = re.compile(r'[^a-z0-9+#]+')
+_HTML_TAG = re.compile(r'<[^>]+>')
+
+# ========== NORMALIZATION ==========
+
+def _tokens(text):
+    """Lowercase, strip HTML/punctuation and split into word tokens"""
+    if text is None:
+        return []
+    text = str(text)
+    if text.lower() in ('nan', 'none', 'n/a'):
+        return []
+    text = _HTML_TAG.sub(' ', text).lower()
+    return [t for t in _NON_WORD.split(text) if t]
+
+def normalize_company(company):
+    """Drop legal suffixes so 'Stripe, Inc.' == 'Stripe'"""
+    tokens = [t for t in _tokens(company) if t not in COMPANY_SUFFIXES]
+    return ' '.join(tokens)
+
+def normalize_city(location):
+    """Keep only the first comma-separated part of a location, with aliases applied"""
+    if location is None:
+        return ''
+    first_part = str(location).split(',')[0]
+    city = ' '.join(_tokens(first_part))
+    return CITY_ALIASES.get(city, city)
+
+def header_features(job):
+    """Title unigrams/bigrams + company as a feature set"""
+    title_tokens = _tokens(job.get('title', ''))
+    features = set(title_tokens)
+    features.update(f"{a} {b}" for a, b in zip(title_tokens, title_tokens[1:]))
+
+    company = normalize_company(job.get('company', ''))
+    if company:
+        features.add(f"c:{company}")
+
+    return features
+
+def description_shingles(job, k=3):
+    """Word k-gram shingles over the start of the description"""
+    words = _tokens(job.get('description', ''))[:DESC_WORDS]
+    if len(words) < k:
+        return set()
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+# ========== MINHASH ==========
+
+class MinHasher:
+    """Vectorized MinHash using universal hashing (a*x + b) mod p"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, features):
+        """Return a (num_perm,) uint64 signature, or None for an empty set"""
+        if not features:
+            return None
+        hashed = np.fromiter(
+            (zlib.crc32(f.encode('utf-8')) % _MERSENNE_PRIME for f in features),
+            dtype=np.uint64,
+            count=len(features)
+        )
+        # a < 2^31 and x < 2^31 so a*x + b fits comfortably in uint64
+        values = (self.a[:, None] * hashed[None, :] + self.b[:, None]) % _MERSENNE_PRIME
+        return values.min(axis=1)
+
+def estimated_jaccard(sig_a, sig_b):
+    """Fraction of matching MinHash slots"""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+# ========== DETECTOR ==========
+
+class NearDuplicateDetector:
+    """
+    Incremental near-duplicate detector.
+    Call check(job) for each job in order; returns the index of the earlier
+    job it duplicates, or None if it is new (and then indexes it).
+    """
+
+    def __init__(self, num_perm=NUM_PERM, bands=LSH_BANDS,
+                 header_threshold=HEADER_THRESHOLD, desc_threshold=DESC_THRESHOLD, seed=1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.header_threshold = header_threshold
+        self.desc_threshold = desc_threshold
+        self.buckets = {}       # (band, band_bytes) -> [doc index]
+        self.header_sigs = {}   # doc index -> signature
+        self.desc_sigs = {}     # doc index -> signature or None
+        self.cities = {}        # doc index -> normalized city
+        self._next_index = 0
+
+    def _band_keys(self, sig):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, sig[start:start + self.rows].tobytes()
+
+    def check(self, job):
+        """Return the index of the matching earlier job, or None (job gets indexed)"""
+        index = self._next_index
+        self._next_index += 1
+
+        header_sig = self.hasher.signature(header_features(job))
+        if header_sig is None:
+            # Nothing to compare on - treat as unique but don't index it
+            return None
+        desc_sig = self.hasher.signature(description_shingles(job))
+        city = normalize_city(job.get('location', ''))
+
+        band_keys = list(self._band_keys(header_sig))
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self.buckets.get(key, ()))
+
+        for candidate in sorted(candidates):
+            if estimated_jaccard(header_sig, self.header_sigs[candidate]) < self.header_threshold:
+                continue
+            other_city = self.cities[candidate]
+            if city and other_city and city != other_city:
+                continue
+            other_desc = self.desc_sigs[candidate]
+            if desc_sig is not None and other_desc is not None:
+                if estimated_jaccard(desc_sig, other_desc) < self.desc_threshold:
+                    continue
+            return candidate
+
+        self.header_sigs[index] = header_sig
+        self.desc_sigs[index] = desc_sig
+        self.cities[index] = city
+        for key in band_keys:
+            self.buckets.setdefault(key, []).append(index)
+        return None
+
+def find_duplicates(jobs, **kwargs):
+    """
+    Map {duplicate position: kept position} for a sequence of job dicts.
+    The first occurrence of each posting is kept.
+    """
+    detector = NearDuplicateDetector(**kwargs)
+    duplicates = {}
+    for position, job in enumerate(jobs):
+        match = detector.check(job)
+        if match is not None:
+            duplicates[position] = match
+    return duplicates
+
+def _is_blank(value):
+    return value is None or str(value).strip().lower() in ('', 'nan', 'none', 'n/a', 'nat')
+
+def _fill_blanks(kept, dup):
+    for key, value in dup.items():
+        if _is_blank(kept.get(key)) and not _is_blank(value):
+            kept[key] = value
+
+def dedupe_jobs(jobs, **kwargs):
+    """
+    Collapse near-duplicate job dicts (keeps first occurrence).
+    Empty fields on the kept job are filled from its duplicates, so a
+    LinkedIn hit without description picks up the Indeed description.
+    """
+    jobs = list(jobs)
+    duplicates = find_duplicates(jobs, **kwargs)
+    if not duplicates:
+        return jobs
+
+    for dup_pos, kept_pos in duplicates.items():
+        _fill_blanks(jobs[kept_pos], jobs[dup_pos])
+
+    print(f"   🧬 Collapsed {len(duplicates)} cross-board duplicates")
+    return [job for pos, job in enumerate(jobs) if pos not in duplicates]
+
+class StreamingDeduper:
+    """
+    dedupe_jobs for jobs that arrive in batches (one scrape source at a time).
+    add(batch) returns the postings not seen in any earlier batch; duplicates
+    still fill empty fields on the job that was kept.
+    """
+
+    def __init__(self, **kwargs):
+        self.detector = NearDuplicateDetector(**kwargs)
+        self.checked = []       # every job passed to the detector (its doc index)
+        self.jobs = []          # unique jobs so far, in arrival order
+        self.collapsed = 0
+
+    def add(self, jobs):
+        fresh = []
+        for job in jobs:
+            match = self.detector.check(job)
+            self.checked.append(job)
+            if match is None:
+                fresh.append(job)
+            else:
+                _fill_blanks(self.checked[match], job)
+                self.collapsed += 1
+        self.jobs.extend(fresh)
+        return fresh
+
+def dedupe_dataframe(df, **kwargs):
+    """DataFrame version of dedupe_jobs (index is reset)"""
+    if df is None or df.empty:
+        return df
+    records = dedupe_jobs(df.to_dict('records'), **kwargs)
+    out = pd.DataFrame(records, columns=df.columns)
+    # Keep categorical columns categorical (JobRecord frames)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype('category')
+    return out
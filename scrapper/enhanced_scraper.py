@@ -14,6 +14,15 @@ import time
 import json
 import os
 
+try:
+    from dedup import dedupe_dataframe
+    from job_archive import append_jobs
+    from job_record import JobRecord, to_dataframe
+except ImportError:
+    from scrapper.dedup import dedupe_dataframe
+    from scrapper.job_archive import append_jobs
+    from scrapper.job_record import JobRecord, to_dataframe
+
 # ========== JOBSPY SCRAPER (LinkedIn, Indeed, Glassdoor) ==========
 
 def scrape_jobspy(role, location="Remote", results_wanted=60):
@@ -45,16 +54,16 @@ def scrape_jobspy(role, location="Remote", results_wanted=60):
                     jobs_df = jobs_df.sort_values('date_posted', ascending=False)
                 
                 for _, job in jobs_df.iterrows():
-                    all_jobs.append({
-                        'title': str(job.get('title', 'N/A')),
-                        'company': str(job.get('company', 'N/A')),
-                        'location': str(job.get('location', 'N/A')),
-                        'job_url': str(job.get('job_url', '')),
-                        'description': str(job.get('description', ''))[:500],
-                        'source': source.capitalize(),
-                        'posted_date': str(job.get('date_posted', '')),
-                        'salary_range': str(job.get('salary_source', ''))
-                    })
+                    all_jobs.append(JobRecord(
+                        title=str(job.get('title', 'N/A')),
+                        company=str(job.get('company', 'N/A')),
+                        location=str(job.get('location', 'N/A')),
+                        job_url=str(job.get('job_url', '')),
+                        description=str(job.get('description', ''))[:500],
+                        source=source.capitalize(),
+                        posted_date=str(job.get('date_posted', '')),
+                        salary_range=str(job.get('salary_source', ''))
+                    ))
                 
                 print(f"   ✓ {source.capitalize()}: {len(jobs_df)} jobs")
                 time.sleep(2)  # Rate limiting
@@ -94,16 +103,16 @@ def scrape_weworkremotely(category="programming"):
                 link_elem = listing.find('a')
                 
                 if title_elem and company_elem and link_elem:
-                    jobs.append({
-                        'title': title_elem.text.strip(),
-                        'company': company_elem.text.strip(),
-                        'location': 'Remote',
-                        'job_url': f"https://weworkremotely.com{link_elem['href']}",
-                        'description': '',
-                        'source': 'WeWorkRemotely',
-                        'posted_date': '',
-                        'salary_range': ''
-                    })
+                    jobs.append(JobRecord(
+                        title=title_elem.text.strip(),
+                        company=company_elem.text.strip(),
+                        location='Remote',
+                        job_url=f"https://weworkremotely.com{link_elem['href']}",
+                        description='',
+                        source='WeWorkRemotely',
+                        posted_date='',
+                        salary_range=''
+                    ))
             except:
                 continue
         
@@ -136,16 +145,16 @@ def scrape_remotive(category="software-dev"):
                 job_title = title_parts[0] if title_parts else entry.title
                 company = title_parts[1] if len(title_parts) > 1 else 'Unknown'
                 
-                jobs.append({
-                    'title': job_title,
-                    'company': company,
-                    'location': 'Remote',
-                    'job_url': entry.link,
-                    'description': entry.get('summary', '')[:500],
-                    'source': 'Remotive',
-                    'posted_date': entry.get('published', ''),
-                    'salary_range': ''
-                })
+                jobs.append(JobRecord(
+                    title=job_title,
+                    company=company,
+                    location='Remote',
+                    job_url=entry.link,
+                    description=entry.get('summary', '')[:500],
+                    source='Remotive',
+                    posted_date=entry.get('published', ''),
+                    salary_range=''
+                ))
             except:
                 continue
         
@@ -175,16 +184,16 @@ def scrape_greenhouse(company_name, company_slug):
             data = response.json()
             
             for job in data.get('jobs', [])[:50]:  # Top 50
-                jobs.append({
-                    'title': job.get('title', 'N/A'),
-                    'company': company_name,
-                    'location': job.get('location', {}).get('name', 'N/A'),
-                    'job_url': job.get('absolute_url', ''),
-                    'description': '',
-                    'source': 'Greenhouse',
-                    'posted_date': job.get('updated_at', ''),
-                    'salary_range': ''
-                })
+                jobs.append(JobRecord(
+                    title=job.get('title', 'N/A'),
+                    company=company_name,
+                    location=job.get('location', {}).get('name', 'N/A'),
+                    job_url=job.get('absolute_url', ''),
+                    description='',
+                    source='Greenhouse',
+                    posted_date=job.get('updated_at', ''),
+                    salary_range=''
+                ))
             
             print(f"   ✓ Found {len(jobs)} jobs")
         
@@ -212,16 +221,16 @@ def scrape_lever(company_name, company_slug):
             data = response.json()
             
             for job in data[:50]:  # Top 50
-                jobs.append({
-                    'title': job.get('text', 'N/A'),
-                    'company': company_name,
-                    'location': job.get('categories', {}).get('location', 'N/A'),
-                    'job_url': job.get('hostedUrl', ''),
-                    'description': '',
-                    'source': 'Lever',
-                    'posted_date': job.get('createdAt', ''),
-                    'salary_range': ''
-                })
+                jobs.append(JobRecord(
+                    title=job.get('text', 'N/A'),
+                    company=company_name,
+                    location=job.get('categories', {}).get('location', 'N/A'),
+                    job_url=job.get('hostedUrl', ''),
+                    description='',
+                    source='Lever',
+                    posted_date=job.get('createdAt', ''),
+                    salary_range=''
+                ))
             
             print(f"   ✓ Found {len(jobs)} jobs")
         
@@ -300,12 +309,15 @@ def scrape_all_platforms(role="Software Engineer", location="Remote", max_jobs_p
         time.sleep(1)
     
     # Convert to DataFrame
-    df = pd.DataFrame(all_jobs)
+    df = to_dataframe(all_jobs)
     
     # Remove duplicates
     if not df.empty and 'job_url' in df.columns:
         df = df.drop_duplicates(subset=['job_url'], keep='first')
     
+    # Collapse the same posting seen on several boards
+    df = dedupe_dataframe(df)
+    
     # Sort by posted_date (most recent first)
     if not df.empty and 'posted_date' in df.columns:
         df['posted_date'] = pd.to_datetime(df['posted_date'], errors='coerce')
@@ -337,5 +349,6 @@ if __name__ == "__main__":
         output_file = "all_jobs_scraped.csv"
         jobs_df.to_csv(output_file, index=False)
         print(f"\n💾 Saved to {output_file}")
+        append_jobs(jobs_df)
     else:
         print("\n⚠️ No jobs found")
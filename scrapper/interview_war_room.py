@@ -1,8 +1,18 @@
 import json
 import os
-from openai import OpenAI
 from fpdf import FPDF
 
+try:
+    from llm import chat
+    from prompt_builder import PromptBuilder, PRIORITY_SECTIONS
+    from llm_client import get_client
+except ImportError:
+    from scrapper.llm import chat
+    from scrapper.prompt_builder import PromptBuilder, PRIORITY_SECTIONS
+    from scrapper.llm_client import get_client
+
+RESUME_TOKENS = 600           # Resume budget for the cheat sheet prompt
+
 try:
     from serpapi import GoogleSearch
 except ImportError:
@@ -17,10 +27,7 @@ class InterviewWarRoom:
         with open(config_path, 'r') as f:
             self.config = json.load(f)
             
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=self.config['openrouter_key']
-        )
+        self.client = get_client(self.config)
         self.model = self.config['model']
         self.serp_api_key = self.config.get('serp_api_key', '')
 
@@ -47,12 +54,15 @@ class InterviewWarRoom:
     def generate_cheat_sheet(self, company_name, role_name, resume_text):
         """Generate the interview cheat sheet content using AI."""
         context = self.get_company_context(company_name, role_name)
+        resume_part = PromptBuilder(RESUME_TOKENS, label='cheat_sheet').add(
+            'resume', resume_text, query=f"{role_name} {company_name} {context}",
+            priority=PRIORITY_SECTIONS)
         
         prompt = f"""
         You are an elite Tech Interview Coach preparing a candidate for an interview at {company_name} for the {role_name} role.
         
         CANDIDATE RESUME:
-        {resume_text[:2000]}
+        {resume_part}
         
         INTERNET CONTEXT ABOUT THIS INTERVIEW:
         {context}
@@ -67,16 +77,17 @@ class InterviewWarRoom:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            return chat(
+                self.client,
+                self.model,
                 messages=[
                     {"role": "system", "content": "You are a FAANG-level Interview Coach."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=1500
+                max_tokens=1500,
+                feature='cheat_sheet'
             )
-            return response.choices[0].message.content.strip()
         except Exception as e:
             return f"Error generating cheat sheet: {e}"
 
@@ -0,0 +1,165 @@
+"""
+🗄️ JOB ARCHIVE - COLUMNAR PARQUET DATASET
+Every scraper run appends its jobs to a Parquet dataset partitioned by
+scrape date and source:
+
+    data/job_archive/scrape_date=2025-01-31/source=Linkedin/part-<run>-0.parquet
+
+Readers only touch the partitions and columns they ask for, so loading
+"title + company for the last 3 days" never parses the rest of the archive.
+Appended jobs are also added to the full-text search index (search_index).
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+    ds = None
+
+try:
+    from search_index import get_index
+    from job_record import JOB_FIELDS, to_dataframe
+except ImportError:
+    from scrapper.search_index import get_index
+    from scrapper.job_record import JOB_FIELDS, to_dataframe
+
+# ========== CONFIGURATION ==========
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_DIR = os.path.join(SCRIPT_DIR, 'data', 'job_archive')
+
+ARCHIVE_COLUMNS = list(JOB_FIELDS)
+
+PARTITION_COLUMNS = ['scrape_date', 'source']
+
+def _partitioning():
+    return ds.partitioning(
+        pa.schema([('scrape_date', pa.string()), ('source', pa.string())]),
+        flavor='hive'
+    )
+
+def _schema():
+    fields = [(col, pa.string()) for col in ARCHIVE_COLUMNS]
+    fields += [('scraped_at', pa.string()), ('scrape_date', pa.string())]
+    return pa.schema(fields)
+
+def is_available():
+    """True if pyarrow is installed"""
+    return pa is not None
+
+# ========== WRITER ==========
+
+def _clean(value):
+    if value is None:
+        return ''
+    try:
+        if pd.isna(value):
+            return ''
+    except (TypeError, ValueError):
+        pass
+    return str(value).strip()
+
+def append_jobs(jobs, default_source='Unknown', archive_dir=ARCHIVE_DIR):
+    """
+    Append a batch of jobs (DataFrame, JobRecords or dicts) to the archive.
+    Returns the number of rows written.
+    """
+    df = jobs if isinstance(jobs, pd.DataFrame) else to_dataframe(jobs)
+    if df.empty:
+        return 0
+
+    # Every stored job is also full-text searchable
+    try:
+        get_index().index_jobs(df)
+    except Exception as e:
+        print(f"   ⚠️ Could not update search index: {e}")
+
+    if not is_available():
+        print("   ⚠️ pyarrow not installed - skipping Parquet archive (pip install pyarrow)")
+        return 0
+
+    now = datetime.now()
+    columns = {}
+    for col in ARCHIVE_COLUMNS:
+        if col in df.columns:
+            columns[col] = [_clean(v) for v in df[col].tolist()]
+        else:
+            columns[col] = [''] * len(df)
+    columns['source'] = [s or default_source for s in columns['source']]
+    columns['scraped_at'] = [now.isoformat(timespec='seconds')] * len(df)
+    columns['scrape_date'] = [now.strftime('%Y-%m-%d')] * len(df)
+
+    try:
+        table = pa.Table.from_pydict(columns, schema=_schema())
+        os.makedirs(archive_dir, exist_ok=True)
+        ds.write_dataset(
+            table,
+            archive_dir,
+            format='parquet',
+            partitioning=_partitioning(),
+            basename_template=f"part-{now.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        print(f"   🗄️ Archived {len(df)} jobs to {archive_dir}")
+        return len(df)
+    except Exception as e:
+        print(f"   ⚠️ Could not archive jobs: {e}")
+        return 0
+
+# ========== READER ==========
+
+def _dataset(archive_dir=ARCHIVE_DIR):
+    if not is_available() or not os.path.isdir(archive_dir):
+        return None
+    return ds.dataset(archive_dir, format='parquet', partitioning=_partitioning())
+
+def read_jobs(columns=None, start_date=None, end_date=None, sources=None, days=None,
+              where=None, archive_dir=ARCHIVE_DIR):
+    """
+    Load archived jobs with column projection and predicate pushdown.
+
+    Args:
+        columns: List of columns to load (default: all)
+        start_date/end_date: 'YYYY-MM-DD' bounds on scrape_date (inclusive)
+        sources: Only these sources (e.g. ['Linkedin', 'Remotive'])
+        days: Shortcut for start_date = today - days
+        where: Extra pyarrow.dataset expression, e.g. ds.field('company') == 'Stripe'
+    """
+    dataset = _dataset(archive_dir)
+    if dataset is None:
+        return pd.DataFrame(columns=columns or ARCHIVE_COLUMNS)
+
+    if days is not None:
+        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+    # Partition filters prune whole directories, other filters use row-group stats
+    expression = None
+    def _and(expr):
+        return expr if expression is None else expression & expr
+
+    if start_date:
+        expression = _and(ds.field('scrape_date') >= str(start_date))
+    if end_date:
+        expression = _and(ds.field('scrape_date') <= str(end_date))
+    if sources:
+        expression = _and(ds.field('source').isin(list(sources)))
+    if where is not None:
+        expression = _and(where)
+
+    table = dataset.to_table(columns=columns, filter=expression)
+    return table.to_pandas()
+
+def list_partitions(archive_dir=ARCHIVE_DIR):
+    """Return [(scrape_date, source)] pairs present in the archive"""
+    dataset = _dataset(archive_dir)
+    if dataset is None:
+        return []
+    table = dataset.to_table(columns=PARTITION_COLUMNS)
+    pairs = table.group_by(PARTITION_COLUMNS).aggregate([]).to_pylist()
+    return sorted((row['scrape_date'], row['source']) for row in pairs)
@@ -0,0 +1,203 @@
+"""
+📦 JOB RECORD - ONE COMPACT SCHEMA FOR EVERY SCRAPER
+All scrapers build JobRecord objects instead of ad-hoc dicts:
+- __slots__ (no per-job __dict__)
+- source / company / work_mode strings are interned, so 5,000 LinkedIn jobs
+  share one 'Linkedin' string
+- in a DataFrame those columns become categoricals
+
+Records keep dict-style access (job.get('title'), job['Score'] = 90) so
+routing, dedup and Sheets code work unchanged. Board-specific column names
+(date_posted, salary_source, company_name, Link, ...) are mapped once here.
+"""
+
+import sys
+import pandas as pd
+
+# ========== SCHEMA ==========
+
+JOB_FIELDS = (
+    'title', 'company', 'location', 'job_url', 'description',
+    'source', 'posted_date', 'salary_range', 'work_mode'
+)
+
+INTERNED_FIELDS = ('source', 'company', 'work_mode')
+CATEGORICAL_COLUMNS = list(INTERNED_FIELDS)
+
+# Board / sheet specific names -> canonical field
+FIELD_ALIASES = {
+    'date_posted': 'posted_date',
+    'salary_source': 'salary_range',
+    'salary': 'salary_range',
+    'job_type': 'work_mode',
+    'company_name': 'company',
+    'url': 'job_url',
+    'Role': 'title',
+    'Company': 'company',
+    'Location': 'location',
+    'Mode': 'work_mode',
+    'Link': 'job_url',
+    'Source': 'source',
+    'Salary': 'salary_range',
+    'Posted_Date': 'posted_date',
+    'Score': 'score',
+    'Summary': 'summary',
+}
+
+def canonical_field(name):
+    return FIELD_ALIASES.get(name, name)
+
+def _text(value):
+    """None/NaN -> '' so every field is a plain string"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value != value:
+        return ''
+    return value if isinstance(value, str) else str(value)
+
+# ========== RECORD ==========
+
+class JobRecord:
+    """A single job posting"""
+
+    __slots__ = JOB_FIELDS + ('score', 'summary', '_extra')
+
+    def __init__(self, title='', company='', location='', job_url='', description='',
+                 source='', posted_date='', salary_range='', work_mode='',
+                 score=None, summary=None, **extra):
+        self.title = _text(title)
+        self.company = sys.intern(_text(company))
+        self.location = _text(location)
+        self.job_url = _text(job_url)
+        self.description = _text(description)
+        self.source = sys.intern(_text(source))
+        self.posted_date = _text(posted_date)
+        self.salary_range = _text(salary_range)
+        self.work_mode = sys.intern(_text(work_mode))
+        self.score = score
+        self.summary = summary
+        self._extra = None
+        for key, value in extra.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data, source=None):
+        """Build a record from any scraper/sheet dict (aliases are mapped)"""
+        record = cls()
+        for key, value in data.items():
+            record[key] = value
+        if source and not record.source:
+            record.source = sys.intern(source)
+        return record
+
+    # ---------- dict-style access ----------
+
+    def __getitem__(self, key):
+        field = canonical_field(key)
+        if field in self.__slots__ and field != '_extra':
+            return getattr(self, field)
+        if self._extra and field in self._extra:
+            return self._extra[field]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        field = canonical_field(key)
+        if field in JOB_FIELDS:
+            value = _text(value)
+            if field in INTERNED_FIELDS:
+                value = sys.intern(value)
+            setattr(self, field, value)
+        elif field in ('score', 'summary'):
+            setattr(self, field, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[field] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def keys(self):
+        keys = list(JOB_FIELDS)
+        if self.score is not None:
+            keys.append('score')
+        if self.summary is not None:
+            keys.append('summary')
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"JobRecord({self.title!r} @ {self.company!r}, {self.source!r})"
+
+# ========== DATAFRAME HELPERS ==========
+
+def as_categorical(df):
+    """Store the low-cardinality string columns as categoricals"""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].fillna('').astype(str).astype('category')
+    return df
+
+def fill_blank(df):
+    """
+    df.fillna('') that also works on categorical columns ('' is added to
+    their categories first - a plain fillna raises TypeError there)
+    """
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and df[col].isna().any() \
+                and '' not in df[col].cat.categories:
+            df[col] = df[col].cat.add_categories([''])
+    return df.fillna('')
+
+def to_dataframe(records):
+    """Records (or plain dicts) -> DataFrame with canonical columns + categoricals"""
+    records = [r if isinstance(r, JobRecord) else JobRecord.from_dict(r) for r in records]
+    if not records:
+        return pd.DataFrame(columns=list(JOB_FIELDS))
+
+    columns = {field: [getattr(r, field) for r in records] for field in JOB_FIELDS}
+    for optional in ('score', 'summary'):
+        if any(getattr(r, optional) is not None for r in records):
+            columns[optional] = [getattr(r, optional) for r in records]
+    extra_keys = []
+    for r in records:
+        for key in (r._extra or ()):
+            if key not in columns and key not in extra_keys:
+                extra_keys.append(key)
+    for key in extra_keys:
+        columns[key] = [(r._extra or {}).get(key, '') for r in records]
+
+    return as_categorical(pd.DataFrame(columns))
+
+def standardize_dataframe(df, source=None):
+    """
+    Rename board-specific columns to the canonical schema in one pass and
+    keep only known fields (vectorized, no per-row remapping).
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=list(JOB_FIELDS))
+
+    df = df.rename(columns={c: canonical_field(c) for c in df.columns})
+    df = df.loc[:, ~df.columns.duplicated()]
+    if 'source' not in df.columns and source:
+        df['source'] = source
+    keep = [col for col in JOB_FIELDS + ('score', 'summary') if col in df.columns]
+    return as_categorical(df[keep].copy())
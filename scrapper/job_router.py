@@ -0,0 +1,125 @@
+"""
+🧭 JOB ROUTER - ONE 5-SHEET ROUTING DECISION PER JOB
+Every job lands in exactly one of the category sheets:
+  Direct_Portals       ATS boards (Greenhouse, Lever) and Big Tech career sites
+  International_Remote remote boards (WWR, Remotive, ...) and non-India remote jobs
+  Indian_Remote        India location + remote
+  Indian_Onsite        India location + onsite / hybrid
+  Career_Portals       everything else (company sites, onsite boards)
+
+The rules are compiled once here instead of being re-typed in every
+pipeline. route_job() decides for one record and remembers the answer on it
+(job['route']), so later stages (filters, save_to_sheets) don't re-derive it;
+route_dataframe() decides for a whole DataFrame with column operations.
+
+    sheet = route_job(job)                 # 'Indian_Remote'
+    df['route'] = route_dataframe(df)
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+try:
+    from keyword_engine import INDIA_MATCHER, is_indian_location
+except ImportError:
+    from scrapper.keyword_engine import INDIA_MATCHER, is_indian_location
+
+# ========== RULES ==========
+
+ROUTES = ['Direct_Portals', 'International_Remote', 'Indian_Remote', 'Indian_Onsite', 'Career_Portals']
+ROUTE_FIELD = 'route'        # Record key the decision is memoized under
+
+# Sources that are ATS boards or Big Tech career sites (exact source name, any case)
+DIRECT_PORTAL_SOURCES = ['greenhouse', 'lever', 'google', 'microsoft', 'apple', 'amazon', 'meta', 'netflix']
+
+# Job URLs on ATS boards or Big Tech career sites
+DIRECT_PORTAL_URLS = ['greenhouse.io', 'lever.co', 'google.com/careers', 'microsoft.com/careers',
+                      'careers.google.com', 'careers.microsoft.com', 'jobs.apple.com', 'amazon.jobs',
+                      'careers.meta.com', 'jobs.netflix.com']
+
+# Remote-first boards (matched in the source name or the URL)
+REMOTE_BOARDS = ['weworkremotely', 'remotive', 'wellfound', 'angellist']
+
+# work_mode values that mean remote ('International' = non-India remote, see categorize_job)
+REMOTE_MODES = {'remote', 'international'}
+
+_DIRECT_SOURCES = frozenset(DIRECT_PORTAL_SOURCES)
+_DIRECT_URL = '|'.join(map(re.escape, DIRECT_PORTAL_URLS))
+_REMOTE_BOARD = '|'.join(map(re.escape, REMOTE_BOARDS))
+_DIRECT_URL_RE = re.compile(_DIRECT_URL)
+_REMOTE_BOARD_RE = re.compile(_REMOTE_BOARD)
+
+# ========== ONE JOB ==========
+
+def _text(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value).strip().lower()
+
+def route(source, job_url, location, work_mode):
+    """Sheet for one job from its routing fields"""
+    source, job_url, location = _text(source), _text(job_url), _text(location)
+
+    if source in _DIRECT_SOURCES or _DIRECT_URL_RE.search(job_url):
+        return 'Direct_Portals'
+    if _REMOTE_BOARD_RE.search(source) or _REMOTE_BOARD_RE.search(job_url):
+        return 'International_Remote'
+
+    remote = 'remote' in location or _text(work_mode) in REMOTE_MODES
+    if is_indian_location(location):
+        return 'Indian_Remote' if remote else 'Indian_Onsite'
+    if remote:
+        return 'International_Remote'
+    return 'Career_Portals'
+
+def route_job(job, refresh=False):
+    """
+    Sheet for a job record (dict or JobRecord), decided once and stored
+    in job['route']. Pass refresh=True after changing its location / work_mode.
+    """
+    if not refresh:
+        known = job.get(ROUTE_FIELD)
+        if known:
+            return known
+    sheet = route(job.get('source', ''), job.get('job_url', ''), job.get('location', ''),
+                  job.get('work_mode', ''))
+    job[ROUTE_FIELD] = sheet
+    return sheet
+
+def route_jobs(jobs, refresh=False):
+    """route_job for every record; returns {sheet: count}"""
+    counts = dict.fromkeys(ROUTES, 0)
+    for job in jobs:
+        counts[route_job(job, refresh)] += 1
+    return counts
+
+# ========== WHOLE DATAFRAME ==========
+
+def _column(df, col):
+    if col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    values = df[col]
+    return values.astype(object).where(values.notna(), '').astype(str).str.strip().str.lower()
+
+def route_dataframe(df):
+    """Sheet for every row of a jobs DataFrame (categorical Series on df.index)"""
+    if df is None or df.empty:
+        return pd.Series(pd.Categorical([], categories=ROUTES), dtype='category')
+
+    source = _column(df, 'source')
+    job_url = _column(df, 'job_url')
+    location = _column(df, 'location')
+    work_mode = _column(df, 'work_mode')
+
+    direct = source.isin(_DIRECT_SOURCES) | job_url.str.contains(_DIRECT_URL, regex=True)
+    board = source.str.contains(_REMOTE_BOARD, regex=True) | job_url.str.contains(_REMOTE_BOARD, regex=True)
+    remote = location.str.contains('remote', regex=False) | work_mode.isin(REMOTE_MODES)
+    india = location.str.contains(INDIA_MATCHER.pattern, regex=True)
+
+    sheets = np.select(
+        [direct.to_numpy(), board.to_numpy(), (india & remote).to_numpy(), india.to_numpy(), remote.to_numpy()],
+        ['Direct_Portals', 'International_Remote', 'Indian_Remote', 'Indian_Onsite', 'International_Remote'],
+        default='Career_Portals'
+    )
+    return pd.Series(pd.Categorical(sheets, categories=ROUTES), index=df.index)
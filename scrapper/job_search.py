@@ -14,16 +14,57 @@ try:
     import gspread
     from oauth2client.service_account import ServiceAccountCredentials
     import re
+    import numpy as np
+    try:
+        from job_archive import append_jobs
+        from sheets_outbox import get_outbox
+        from job_record import JOB_FIELDS, as_categorical
+        from keyword_engine import KeywordMatcher, INDIA_MATCHER
+        from job_router import DIRECT_PORTAL_URLS, route_dataframe
+    except ImportError:
+        from scrapper.job_archive import append_jobs
+        from scrapper.sheets_outbox import get_outbox
+        from scrapper.job_record import JOB_FIELDS, as_categorical
+        from scrapper.keyword_engine import KeywordMatcher, INDIA_MATCHER
+        from scrapper.job_router import DIRECT_PORTAL_URLS, route_dataframe
     
     # ========== CONFIGURATION ==========
-    TECH_STACK_KEYWORDS = ['python', 'c++', 'mern', 'react', 'node', 'ai', 'machine learning', 'intern', 'software', 'developer']
+    TECH_STACK_KEYWORDS = ['python', 'c++', 'mern', 'react', 'node', 'ai', 'machine learning', 'intern', 'internship', 'software', 'developer']
     
-    # Direct ATS portals and Big Tech career sites
-    DIRECT_PORTALS = ['greenhouse.io', 'lever.co', 'careers.google.com', 'careers.microsoft.com', 
-                      'jobs.apple.com', 'amazon.jobs', 'careers.meta.com', 'jobs.netflix.com']
+    SENIORITY_KEYWORDS = {
+        'intern': ['intern', 'internship', 'co-op', 'coop'],
+        'entry': ['entry', 'junior', 'graduate', 'associate', 'early career'],
+        'mid': ['mid-level', 'intermediate', 'experienced'],
+        'senior': ['senior', 'sr.', 'lead', 'principal', 'staff'],
+        'executive': ['director', 'vp', 'vice president', 'head of', 'chief', 'cto', 'ceo']
+    }
     
-    # Remote-first job boards (sources that are inherently remote-focused)
-    REMOTE_BOARDS = ['weworkremotely', 'remotive', 'wellfound', 'angellist']
+    # One compiled matcher per classifier (whole-term matches, single pass per text)
+    TECH_STACK_MATCHER = KeywordMatcher(TECH_STACK_KEYWORDS, plurals=True)
+    SENIORITY_MATCHER = KeywordMatcher(SENIORITY_KEYWORDS, plurals=True)
+    WORK_MODE_MATCHER = KeywordMatcher({
+        'remote': ['remote', 'remotely'],
+        'hybrid': ['hybrid'],
+        'onsite': ['onsite', 'on-site']
+    })
+    
+    # Direct ATS portals and Big Tech career sites (shared with the sheet routing)
+    DIRECT_PORTALS = DIRECT_PORTAL_URLS
+    
+    # Common salary patterns (first match wins)
+    SALARY_PATTERNS = [
+        r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*-\s*\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # $50,000 - $70,000
+        r'(\d{1,3}(?:,\d{3})*)\s*-\s*(\d{1,3}(?:,\d{3})*)\s*(?:usd|dollars?|per year|\/year|annually)',  # 50,000 - 70,000 USD
+        r'(\d{1,3})k\s*-\s*(\d{1,3})k',  # 50k - 70k
+        r'₹\s*(\d{1,3}(?:,\d{3})*)\s*-\s*₹\s*(\d{1,3}(?:,\d{3})*)',  # ₹50,000 - ₹70,000
+    ]
+    
+    # Same patterns without capture groups (yes/no test ahead of the extract)
+    SALARY_TESTS = [re.sub(r'(?<!\\)\((?!\?)', '(?:', pattern) for pattern in SALARY_PATTERNS]
+    
+    # Sort order of the categorical columns (lowest first)
+    PRIORITY_ORDER = ['Normal', 'High']
+    CATEGORY_ORDER = ['International', 'National']
     
     # ========== USER TOGGLES ==========
     REMOTE_ONLY_MODE = False  # Set to True to filter only Remote jobs, False for all modes
@@ -39,120 +80,6 @@ try:
             return ''
         return str(value).strip()
     
-    def categorize_location(location):
-        """
-        Categorize job as 'International' or 'National' based on location
-        National = India-based locations
-        International = Everything else
-        """
-        location_str = safe_str(location).lower()
-        
-        # Indian location indicators
-        indian_keywords = ['india', 'mumbai', 'delhi', 'bangalore', 'bengaluru', 'hyderabad', 
-                          'chennai', 'pune', 'kolkata', 'ahmedabad', 'gurgaon', 'noida',
-                          'chandigarh', 'jaipur', 'kochi', 'indore', 'bhopal', 'lucknow']
-        
-        # Check if location mentions India or Indian cities
-        if any(keyword in location_str for keyword in indian_keywords):
-            return 'National'
-        
-        # Remote jobs without specific country are considered International
-        if 'remote' in location_str and not any(keyword in location_str for keyword in indian_keywords):
-            return 'International'
-        
-        # Default to International for non-India locations
-        return 'International'
-    
-    def extract_salary_range(description, title=''):
-        """
-        Extract salary range from job description or title
-        Returns formatted salary string or empty string
-        """
-        if not description and not title:
-            return ''
-        
-        text = f"{safe_str(description)} {safe_str(title)}".lower()
-        
-        # Common salary patterns
-        patterns = [
-            r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*-\s*\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # $50,000 - $70,000
-            r'(\d{1,3}(?:,\d{3})*)\s*-\s*(\d{1,3}(?:,\d{3})*)\s*(?:usd|dollars?|per year|\/year|annually)',  # 50,000 - 70,000 USD
-            r'(\d{1,3})k\s*-\s*(\d{1,3})k',  # 50k - 70k
-            r'₹\s*(\d{1,3}(?:,\d{3})*)\s*-\s*₹\s*(\d{1,3}(?:,\d{3})*)',  # ₹50,000 - ₹70,000
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return f"${match.group(1)}-${match.group(2)}"
-        
-        return ''
-    
-    def extract_seniority_level(title, description=''):
-        """
-        Extract seniority level from job title or description
-        """
-        text = f"{safe_str(title)} {safe_str(description)}".lower()
-        
-        seniority_map = {
-            'intern': ['intern', 'internship', 'co-op', 'coop'],
-            'entry': ['entry', 'junior', 'graduate', 'associate', 'early career'],
-            'mid': ['mid-level', 'intermediate', 'experienced'],
-            'senior': ['senior', 'sr.', 'lead', 'principal', 'staff'],
-            'executive': ['director', 'vp', 'vice president', 'head of', 'chief', 'cto', 'ceo']
-        }
-        
-        for level, keywords in seniority_map.items():
-            if any(keyword in text for keyword in keywords):
-                return level.capitalize()
-        
-        return 'Not Specified'
-    
-    def check_tech_stack_match(title, description=''):
-        """
-        Check if job mentions any of the required tech stack keywords
-        Returns True if match found, False otherwise
-        """
-        text = f"{safe_str(title)} {safe_str(description)}".lower()
-        
-        for keyword in TECH_STACK_KEYWORDS:
-            if keyword.lower() in text:
-                return True
-        return False
-    
-    def is_remote_job(location, description=''):
-        """
-        Check if job is remote
-        """
-        location_str = safe_str(location).lower()
-        desc_str = safe_str(description).lower()
-        
-        return 'remote' in location_str or 'remote' in desc_str
-    
-    def calculate_priority(location, company, description='', job_url=''):
-        """
-        Calculate job priority based on:
-        - Remote AND Startup = High Priority
-        - Greenhouse/Lever portals = High Priority
-        - Otherwise = Normal Priority
-        """
-        location_str = safe_str(location).lower()
-        company_str = safe_str(company).lower()
-        desc_str = safe_str(description).lower()
-        url_str = safe_str(job_url).lower()
-        
-        # Check if Remote AND Startup
-        is_remote = 'remote' in location_str or 'remote' in desc_str
-        is_startup = 'startup' in company_str or 'startup' in desc_str
-        
-        # Check if from direct portals (Greenhouse/Lever/Big Tech)
-        is_direct_portal = any(portal in url_str for portal in DIRECT_PORTALS)
-        
-        if (is_remote and is_startup) or is_direct_portal:
-            return 'High'
-        
-        return 'Normal'
-    
     def detect_work_mode(location, description=''):
         """
         Detect work mode: Remote, Onsite, or Hybrid
@@ -160,79 +87,137 @@ try:
         location_str = safe_str(location).lower()
         desc_str = safe_str(description).lower()
         combined_text = f"{location_str} {desc_str}"
+        modes = WORK_MODE_MATCHER.labels(combined_text)
         
         # Check for remote indicators
-        if 'remote' in combined_text:
+        if 'remote' in modes:
             # Check if it's hybrid (remote + onsite)
-            if 'hybrid' in combined_text or 'on-site' in combined_text or 'onsite' in combined_text:
+            if 'hybrid' in modes or 'onsite' in modes:
                 return 'Hybrid'
             return 'Remote'
         
         # Check for hybrid indicators
-        if 'hybrid' in combined_text:
+        if 'hybrid' in modes:
             return 'Hybrid'
         
         # Default to Onsite if no remote/hybrid indicators
         return 'Onsite'
     
-    def is_direct_portal(source, job_url=''):
-        """
-        Check if the job is from a direct ATS portal or Big Tech career site
-        (Greenhouse, Lever, Google Careers, Microsoft Careers, etc.)
-        """
-        source_str = safe_str(source).lower()
-        url_str = safe_str(job_url).lower()
-        
-        # Check if URL contains any direct portal domains
-        if any(portal in url_str for portal in DIRECT_PORTALS):
-            return True
-        
-        # Check if source mentions direct portals
-        if any(portal.split('.')[0] in source_str for portal in DIRECT_PORTALS):
-            return True
-        
-        return False
+    # ========== COLUMN-WISE PROCESSING ==========
     
-    def is_remote_board(source, job_url=''):
+    def text_column(df, column, default=''):
         """
-        Check if the job is from a remote-first job board
-        (We Work Remotely, Remotive, Wellfound, etc.)
+        Whole column as clean strings - the vectorized safe_str
+        (NaN, None and 'nan' become '', everything else is stripped)
         """
-        source_str = safe_str(source).lower()
-        url_str = safe_str(job_url).lower()
-        
-        # Check if source or URL contains remote board indicators
-        if any(board in source_str or board in url_str for board in REMOTE_BOARDS):
-            return True
-        
-        return False
+        if column not in df.columns:
+            return pd.Series(default, index=df.index, dtype=object)
+        values = df[column]
+        text = values.astype(object).where(values.notna(), '').astype(str).str.strip()
+        return text.mask(text.str.lower() == 'nan', '')
+    
+    def salary_column(text):
+        """First salary range ("$min-$max") in each row of a lower-cased text column"""
+        salary = pd.Series('', index=text.index, dtype=object)
+        pending = text != ''
+        for pattern, test in zip(SALARY_PATTERNS, SALARY_TESTS):
+            if not pending.any():
+                break
+            candidates = text[pending]
+            # Cheap match test first; only the rows that match run the capturing extract
+            candidates = candidates[candidates.str.contains(test, regex=True)]
+            found = candidates.str.extract(pattern).dropna()
+            salary[found.index] = '$' + found[0] + '-$' + found[1]
+            pending[found.index] = False
+        return salary
+    
+    def seniority_column(text):
+        """First seniority level (intern -> executive) in each row of a lower-cased text column"""
+        level = pd.Series('Not Specified', index=text.index, dtype=object)
+        pending = pd.Series(True, index=text.index)
+        # Levels in order (intern -> executive); each row keeps its first hit
+        for label in SENIORITY_MATCHER.order:
+            if not pending.any():
+                break
+            hit = text[pending].str.contains(SENIORITY_MATCHER.patterns[label], regex=True)
+            hit = hit[hit].index
+            level[hit] = label.capitalize()
+            pending[hit] = False
+        return level
+    
+    def work_mode_column(location_text, description_text):
+        """detect_work_mode for lower-cased location / description columns"""
+        combined_text = location_text + ' ' + description_text
+        modes = {label: combined_text.str.contains(pattern, regex=True).to_numpy()
+                 for label, pattern in WORK_MODE_MATCHER.patterns.items()}
+        return pd.Series(np.select(
+            [modes['remote'] & (modes['hybrid'] | modes['onsite']), modes['remote'], modes['hybrid']],
+            ['Hybrid', 'Remote', 'Hybrid'],
+            default='Onsite'
+        ), index=location_text.index, dtype=object)
+    
+    def posted_date_column(df):
+        """date_posted as 'YYYY-MM-DD' (unparseable values kept as text)"""
+        if 'date_posted' not in df.columns:
+            return pd.Series('', index=df.index, dtype=object)
+        parsed = pd.to_datetime(df['date_posted'], errors='coerce', format='mixed')
+        posted_date = parsed.dt.strftime('%Y-%m-%d').astype(object)
+        return posted_date.where(parsed.notna(), text_column(df, 'date_posted'))
     
-    def is_career_portal(source, job_url=''):
+    def process_jobs(jobs_df):
         """
-        Check if the job is from a company career portal
-        (not from LinkedIn, Glassdoor, Indeed, or remote boards)
-        This is used as a backup category
+        Deep extraction & filtering over the whole scraped DataFrame at once:
+        tech stack / remote filters as boolean masks, salary / seniority /
+        work mode / priority as whole-column string operations.
+        Returns the processed jobs (canonical columns + seniority_level,
+        priority, category), with priority and category as ordered categoricals.
         """
-        source_str = safe_str(source).lower()
-        url_str = safe_str(job_url).lower()
-        
-        # Job board platforms
-        job_boards = ['linkedin', 'glassdoor', 'indeed']
-        
-        # If it's a direct portal or remote board, it's not a generic career portal
-        if is_direct_portal(source, job_url) or is_remote_board(source, job_url):
-            return False
-        
-        # If source is explicitly from a job board, it's not a career portal
-        if any(board in source_str for board in job_boards):
-            return False
-        
-        # If URL contains job board domains, it's not a career portal
-        if any(board in url_str for board in job_boards):
-            return False
-        
-        # Otherwise, it's likely a company career portal
-        return True
+        df = jobs_df.reset_index(drop=True)
+        title = text_column(df, 'title')
+        description = text_column(df, 'description')
+        location = text_column(df, 'location')
+        
+        # TECH STACK FILTER: Only keep jobs mentioning required keywords
+        title_desc = (title + ' ' + description).str.lower()
+        keep = title_desc.str.contains(TECH_STACK_MATCHER.pattern, regex=True)
+        
+        # REMOTE FILTER: If REMOTE_ONLY_MODE is enabled, skip non-remote jobs
+        location_lower = location.str.lower()
+        description_lower = description.str.lower()
+        remote = (location_lower.str.contains('remote', regex=False) |
+                  description_lower.str.contains('remote', regex=False))
+        if REMOTE_ONLY_MODE:
+            keep &= remote
+        
+        df = df[keep]
+        title, description, location = title[keep], description[keep], location[keep]
+        title_desc, location_lower, description_lower = title_desc[keep], location_lower[keep], description_lower[keep]
+        company = text_column(df, 'company')
+        job_url = text_column(df, 'job_url')
+        
+        # Priority: Remote AND Startup, or a direct portal (Greenhouse/Lever/Big Tech)
+        is_startup = (company.str.lower().str.contains('startup', regex=False) |
+                      description_lower.str.contains('startup', regex=False))
+        from_portal = job_url.str.lower().str.contains('|'.join(map(re.escape, DIRECT_PORTALS)), regex=True)
+        high = (remote[keep] & is_startup) | from_portal
+        
+        processed = pd.DataFrame({
+            'title': title,
+            'company': company,
+            'location': location,
+            'job_url': job_url,
+            'description': description,  # Include description for routing
+            'source': text_column(df, 'source', 'Unknown'),
+            'posted_date': posted_date_column(df),
+            'salary_range': salary_column(description_lower + ' ' + title.str.lower()),
+            'work_mode': work_mode_column(location_lower, description_lower),
+            'seniority_level': seniority_column(title_desc),
+            'priority': pd.Categorical(np.where(high, 'High', 'Normal'), categories=PRIORITY_ORDER, ordered=True),
+            'category': pd.Categorical(np.where(location_lower.str.contains(INDIA_MATCHER.pattern, regex=True),
+                                                'National', 'International'),
+                                       categories=CATEGORY_ORDER, ordered=True),
+        }, columns=list(JOB_FIELDS) + ['seniority_level', 'priority', 'category'])
+        return as_categorical(processed.reset_index(drop=True))
     
     def push_to_google_sheets(jobs_df):
         """
@@ -242,6 +227,7 @@ try:
         - Indian_Remote: India location + Remote mode
         - Indian_Onsite: India location + Onsite/Hybrid mode
         - Career_Portals: Other company career sites (backup category)
+        (rules shared with the recommendation engine, see job_router)
         
         Returns the count of new jobs added
         """
@@ -340,9 +326,11 @@ try:
             }
             
             duplicates_skipped = 0  # Track how many duplicates we skip
+            outbox = get_outbox()
             
-            # Iterate through jobs and route them to appropriate worksheets
-            for _, job in jobs_df.iterrows():
+            # Route every job in one vectorized pass, then queue the new ones
+            routes = route_dataframe(jobs_df)
+            for index, job in jobs_df.iterrows():
                 # Extract and clean job data (use fillna to avoid NaN)
                 title = safe_str(job.get('title', ''))
                 company = safe_str(job.get('company', ''))
@@ -358,13 +346,8 @@ try:
                     duplicates_skipped += 1
                     continue
                 
-                # Detect work mode
-                work_mode = detect_work_mode(location, description)
-                
-                # Check source type
-                from_direct_portal = is_direct_portal(source, job_url)
-                from_remote_board = is_remote_board(source, job_url)
-                from_career_portal = is_career_portal(source, job_url)
+                # Work mode (already detected during processing)
+                work_mode = safe_str(job.get('work_mode', '')) or detect_work_mode(location, description)
                 
                 # Prepare the row data to match your Google Sheets structure
                 # Columns: Role | Company | Location | Mode | Link | Source | Salary | Posted_Date
@@ -379,51 +362,15 @@ try:
                     posted_date      # Posted_Date
                 ]
                 
-                # ========== ENHANCED 5-SHEET ROUTING LOGIC ==========
-                target_worksheet = None
-                
-                # PRIORITY 1: Direct Portals (ATS + Big Tech career sites)
-                if from_direct_portal:
-                    target_worksheet = ws_direct_portals
-                    job_counts['Direct_Portals'] += 1
-                
-                # PRIORITY 2: Remote Boards → International_Remote
-                elif from_remote_board:
-                    target_worksheet = ws_international_remote
-                    job_counts['International_Remote'] += 1
-                
-                # PRIORITY 3: Indian Remote
-                elif 'india' in location.lower() and work_mode == 'Remote':
-                    target_worksheet = ws_indian_remote
-                    job_counts['Indian_Remote'] += 1
-                
-                # PRIORITY 4: Indian Onsite/Hybrid
-                elif 'india' in location.lower() and work_mode in ['Onsite', 'Hybrid']:
-                    target_worksheet = ws_indian_onsite
-                    job_counts['Indian_Onsite'] += 1
-                
-                # PRIORITY 5: International Remote (non-India remote jobs)
-                elif 'india' not in location.lower() and work_mode == 'Remote':
-                    target_worksheet = ws_international_remote
-                    job_counts['International_Remote'] += 1
-                
-                # PRIORITY 6: Career Portals (backup for other company sites)
-                elif from_career_portal:
-                    target_worksheet = ws_career_portals
-                    job_counts['Career_Portals'] += 1
-                
-                # Fallback: If no rule matches, put in International_Remote
-                else:
-                    target_worksheet = ws_international_remote
-                    job_counts['International_Remote'] += 1
-                
-                # Append the row to the appropriate worksheet
-                if target_worksheet:
-                    try:
-                        target_worksheet.append_row(new_row)
-                        existing_urls.add(job_url)  # Add to set to avoid duplicates in this batch
-                    except Exception as append_error:
-                        print(f"Warning: Could not append job to {target_worksheet.title}: {append_error}")
+                # Queue the row for its worksheet (delivered in batches by the outbox)
+                target_sheet = routes.at[index]
+                job_counts[target_sheet] += 1
+                outbox.enqueue(target_sheet, new_row, key=job_url)
+                existing_urls.add(job_url)  # Add to set to avoid duplicates in this batch
+            
+            remaining = outbox.drain()
+            if remaining:
+                print(f"\n⚠ {remaining} rows still queued for Google Sheets - they will be retried on the next run")
             
             # Calculate total new jobs
             total_new_jobs = sum(job_counts.values())
@@ -516,66 +463,14 @@ try:
         print(f"{'='*70}")
         
         # ========== DEEP EXTRACTION & FILTERING ==========
-        processed_jobs = []
-        
-        for _, job in combined_jobs.iterrows():
-            title = safe_str(job.get('title', ''))
-            company = safe_str(job.get('company', ''))
-            location = safe_str(job.get('location', ''))
-            job_url = safe_str(job.get('job_url', ''))
-            description = safe_str(job.get('description', ''))
-            source = safe_str(job.get('source', 'Unknown'))
-            
-            # TECH STACK FILTER: Only keep jobs mentioning required keywords
-            if not check_tech_stack_match(title, description):
-                continue
-            
-            # REMOTE FILTER: If REMOTE_ONLY_MODE is enabled, skip non-remote jobs
-            if REMOTE_ONLY_MODE and not is_remote_job(location, description):
-                continue
-            
-            # Extract additional information
-            salary_range = extract_salary_range(description, title)
-            seniority_level = extract_seniority_level(title, description)
-            category = categorize_location(location)
-            work_mode = detect_work_mode(location, description)  # Detect work mode
-            
-            # Extract posted date
-            posted_date = ''
-            if 'date_posted' in job and pd.notna(job['date_posted']):
-                try:
-                    posted_date = pd.to_datetime(job['date_posted']).strftime('%Y-%m-%d')
-                except:
-                    posted_date = safe_str(job.get('date_posted', ''))
-            
-            # Calculate priority
-            priority = calculate_priority(location, company, description, job_url)
-            
-            processed_jobs.append({
-                'title': title,
-                'company': company,
-                'location': location,
-                'job_url': job_url,
-                'description': description,  # Include description for routing
-                'salary_range': salary_range,
-                'posted_date': posted_date,
-                'seniority_level': seniority_level,
-                'priority': priority,
-                'category': category,
-                'source': source,
-                'work_mode': work_mode  # Include work mode
-            })
+        all_processed = process_jobs(combined_jobs)
         
-        if processed_jobs:
-            # Convert to DataFrame
-            final_jobs = pd.DataFrame(processed_jobs)
+        if not all_processed.empty:
+            final_jobs = all_processed.copy()
             
             # Sort by priority (High first), category (National first), and then by posted date
-            final_jobs['priority_score'] = final_jobs['priority'].apply(lambda x: 1 if x == 'High' else 0)
-            final_jobs['category_score'] = final_jobs['category'].apply(lambda x: 1 if x == 'National' else 0)
-            final_jobs = final_jobs.sort_values(['priority_score', 'category_score', 'posted_date'], 
+            final_jobs = final_jobs.sort_values(['priority', 'category', 'posted_date'], 
                                                  ascending=[False, False, False])
-            final_jobs = final_jobs.drop(['priority_score', 'category_score'], axis=1)
             
             # Limit to top results (reduced for testing)
             final_jobs = final_jobs.head(5)
@@ -587,6 +482,9 @@ try:
             # Save to CSV with NaN handling
             final_jobs.to_csv(output_file, index=False, encoding='utf-8')
             
+            # Append every processed job (not just the top 5) to the Parquet archive
+            append_jobs(all_processed)
+            
             print("\n" + "=" * 70)
             print(f"✅ SEARCH COMPLETE! Found {len(final_jobs)} matching jobs.")
             print(f"   📊 BREAKDOWN:")
@@ -0,0 +1,200 @@
+"""
+📸 JOB LIFECYCLE SNAPSHOTS - COMPACT CHANGE DETECTION
+Every scrape run is recorded as a snapshot: one (url_key, content_hash) pair
+of 64-bit integers per job, packed into a single blob (16 bytes per job).
+Diffing two runs is a linear pass over two dicts and tells us which postings
+are new, changed, removed (closed) or reopened, so downstream stages can
+process only what changed. History survives clear_sheets.
+"""
+
+import os
+import sqlite3
+import hashlib
+from array import array
+from datetime import datetime
+
+# ========== CONFIGURATION ==========
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DB = os.path.join(SCRIPT_DIR, 'data', 'job_snapshots.db')
+
+# Fields that define "the posting changed"
+CONTENT_FIELDS = ['title', 'company', 'location', 'description', 'salary_range', 'work_mode']
+
+# ========== HASHING ==========
+
+def _hash64(text):
+    """Signed 64-bit blake2b digest (fits an SQLite INTEGER)"""
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+def _norm(value):
+    if value is None:
+        return ''
+    text = str(value).strip()
+    return '' if text.lower() in ('nan', 'none', 'nat') else ' '.join(text.split()).lower()
+
+def url_key(job_url):
+    return _hash64(_norm(job_url))
+
+def content_hash(job):
+    return _hash64('\x1f'.join(_norm(job.get(field, '')) for field in CONTENT_FIELDS))
+
+# ========== DIFF ==========
+
+class SnapshotDiff:
+    """Result of comparing two snapshots (sets of url_keys)"""
+
+    def __init__(self, new, changed, removed, unchanged, reopened):
+        self.new = new
+        self.changed = changed
+        self.removed = removed
+        self.unchanged = unchanged
+        self.reopened = reopened
+
+    @property
+    def actionable(self):
+        """Keys worth reprocessing: brand new, reopened or changed postings"""
+        return self.new | self.reopened | self.changed
+
+    def summary(self):
+        return {
+            'new': len(self.new),
+            'reopened': len(self.reopened),
+            'changed': len(self.changed),
+            'removed': len(self.removed),
+            'unchanged': len(self.unchanged),
+        }
+
+def diff_snapshots(old, new, previously_seen=frozenset()):
+    """
+    Compare {url_key: content_hash} snapshots in O(len(old) + len(new)).
+    previously_seen: keys seen in an earlier run (of the same label), used to
+    tell reopened from new.
+    """
+    added, changed, unchanged, reopened = set(), set(), set(), set()
+    for key, digest in new.items():
+        old_digest = old.get(key)
+        if old_digest is None:
+            (reopened if key in previously_seen else added).add(key)
+        elif old_digest != digest:
+            changed.add(key)
+        else:
+            unchanged.add(key)
+    removed = {key for key in old if key not in new}
+    return SnapshotDiff(added, changed, removed, unchanged, reopened)
+
+# ========== STORE ==========
+
+def _pack(snapshot):
+    flat = array('q')
+    for key, digest in snapshot.items():
+        flat.append(key)
+        flat.append(digest)
+    return flat.tobytes()
+
+def _unpack(blob):
+    flat = array('q')
+    flat.frombytes(blob)
+    return dict(zip(flat[0::2], flat[1::2]))
+
+class SnapshotStore:
+    """
+    SQLite store of per-run snapshots plus, per label, every url_key ever
+    seen (to tell reopened postings from new ones). Labels are independent:
+    a job first seen in an 'Indian_Onsite' scan is still new to the first
+    'International_Remote' scan that finds it.
+    """
+
+    def __init__(self, db_path=SNAPSHOT_DB):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    label TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    job_count INTEGER NOT NULL,
+                    snapshot BLOB NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_label ON runs(label, run_id)")
+            has_seen = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'seen'"
+            ).fetchone()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS seen (
+                    label TEXT NOT NULL,
+                    url_key INTEGER NOT NULL,
+                    PRIMARY KEY (label, url_key)
+                ) WITHOUT ROWID
+            """)
+            if not has_seen:
+                # Databases from before per-label history: rebuild it from the stored runs
+                for label, blob in conn.execute("SELECT label, snapshot FROM runs").fetchall():
+                    conn.executemany("INSERT OR IGNORE INTO seen (label, url_key) VALUES (?, ?)",
+                                     [(label, key) for key in _unpack(blob)])
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def latest_run(self, label):
+        """(run_id, snapshot dict) of the last run with this label, or (None, {})"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT run_id, snapshot FROM runs WHERE label = ? ORDER BY run_id DESC LIMIT 1",
+                (label,)
+            ).fetchone()
+        if row is None:
+            return None, {}
+        return row[0], _unpack(row[1])
+
+    def record_run(self, jobs, label='default'):
+        """
+        Snapshot a scrape run and diff it against the previous run with the same label.
+        Returns (run_id, SnapshotDiff).
+        """
+        snapshot = {}
+        for job in jobs:
+            job_url = _norm(job.get('job_url', ''))
+            if not job_url or job_url == '#':
+                continue
+            snapshot[url_key(job_url)] = content_hash(job)
+
+        _, previous = self.latest_run(label)
+
+        with self._connect() as conn:
+            seen_before = set()
+            keys = list(snapshot)
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                seen_before.update(
+                    row[0] for row in conn.execute(
+                        f"SELECT url_key FROM seen WHERE label = ? AND url_key IN ({placeholders})",
+                        [label] + chunk
+                    )
+                )
+
+            cursor = conn.execute(
+                "INSERT INTO runs (label, created_at, job_count, snapshot) VALUES (?, ?, ?, ?)",
+                (label, datetime.now().isoformat(timespec='seconds'), len(snapshot), _pack(snapshot))
+            )
+            run_id = cursor.lastrowid
+            conn.executemany("INSERT OR IGNORE INTO seen (label, url_key) VALUES (?, ?)",
+                             [(label, key) for key in keys])
+
+        return run_id, diff_snapshots(previous, snapshot, seen_before)
+
+def filter_changed_jobs(jobs, previous):
+    """
+    Jobs that record_run would report as new, reopened or changed against the
+    `previous` snapshot (latest_run) - usable while a scan is still streaming in
+    """
+    keep = []
+    for job in jobs:
+        job_url = _norm(job.get('job_url', ''))
+        if job_url and job_url != '#' and previous.get(url_key(job_url)) != content_hash(job):
+            keep.append(job)
+    return keep
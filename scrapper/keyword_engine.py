@@ -0,0 +1,155 @@
+"""
+🔎 KEYWORD ENGINE - WHOLE-TERM KEYWORD MATCHING FOR THE JOB CLASSIFIERS
+The job classifiers (tech stack, seniority, location, work mode) each kept
+their own keyword lists and substring loops, and plain substrings misfire:
+'ai' in "email", 'intern' in "internal", 'lead' in "leadership", 'india' in
+"Indianapolis". One matcher now serves all of them:
+
+- KeywordMatcher(groups): keyword -> label lookups with whole-term
+  boundaries (?<![a-z0-9]) ... (?![a-z0-9]), so 'c++', 'sr.' and 'co-op'
+  still match. A keyword is only regex-checked when a C-level substring test
+  finds it, so the cost stays close to the old loops (see below).
+- keyword_pattern(words): ONE regex for a whole vocabulary, factored as a
+  character trie ("bangalore|bengaluru|bhopal" -> "b(?:angalore|engaluru|hopal)"),
+  for vectorized pandas filters (Series.str.contains) over many jobs at once.
+
+    SENIORITY = KeywordMatcher({'Intern': ['intern', 'internship'], 'Senior': ['senior', 'sr.']})
+    SENIORITY.first("Senior Software Engineer Intern")   # 'Intern' (group order decides)
+    SENIORITY.labels(text)                             # every group that hit
+
+Per text, a single combined regex pass measured slower than substring
+prefilter + per-keyword check (Python's regex engine tries the alternation
+at every word start); benchmark_keywords.py prints the per-job costs.
+"""
+
+import re
+from functools import lru_cache
+
+# ========== SHARED VOCABULARY ==========
+
+# Indian locations (used by the routing / categorizing code in several modules)
+INDIAN_LOCATIONS = ['india', 'mumbai', 'delhi', 'bangalore', 'bengaluru', 'hyderabad',
+                    'chennai', 'pune', 'kolkata', 'ahmedabad', 'gurgaon', 'noida',
+                    'chandigarh', 'jaipur', 'kochi', 'indore', 'bhopal', 'lucknow']
+
+# ========== PATTERN BUILDING ==========
+
+def _trie_regex(words):
+    """Regex source matching exactly the given words, factored as a trie"""
+    root = {}
+    for word in words:
+        node = root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        ends_here = '' in node
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        # Greedy '?': the longer keyword is tried first
+        return f"(?:{'|'.join(branches)})" + ('?' if ends_here else '')
+
+    return build(root)
+
+@lru_cache(maxsize=256)
+def _keyword_pattern(words, plurals, capture, consume_edges):
+    words = sorted({w.lower().strip() for w in words if w and w.strip()})
+    if not words:
+        return r'[^\s\S]'   # Matches nothing
+    body = _trie_regex(words)
+    body = f"({body})" if capture else f"(?:{body})"
+    plural = '(?:e?s)?' if plurals else ''
+    if consume_edges:
+        return rf"(?:^|[^a-z0-9]){body}{plural}(?:[^a-z0-9]|$)"
+    return rf"(?<![a-z0-9]){body}{plural}(?![a-z0-9])"
+
+def keyword_pattern(words, plurals=False, capture=False, consume_edges=False):
+    """
+    Regex source matching any of the words as whole terms (for pandas
+    str.contains / str.extract on lower-cased text).
+    plurals: also accept a trailing s/es ('developers' hits 'developer')
+    capture: put the keyword itself (without plural) in group 1
+    consume_edges: write the boundaries as (^|non-alnum) character groups
+        instead of lookarounds. Same yes/no answer for str.contains, and
+        Arrow-backed string columns then run it in RE2 (C++) rather than
+        falling back to Python's re - but matches swallow the neighbouring
+        character, so don't use it for findall / extractall.
+    """
+    return _keyword_pattern(tuple(words), plurals, capture, consume_edges)
+
+# ========== MATCHER ==========
+
+_WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789')
+
+class KeywordMatcher:
+    """
+    Keyword -> group label matcher for one text at a time.
+    A keyword is only searched for when a plain substring test finds it
+    (C speed); the search is a literal-prefixed regex that already enforces
+    the right-hand boundary, and only its few matches are checked for the
+    left-hand one. Group lookups stop at the first confirmed keyword.
+    """
+
+    def __init__(self, groups, plurals=False):
+        if not isinstance(groups, dict):
+            groups = {keyword: [keyword] for keyword in groups}
+        self.order = list(groups)
+        self.plurals = plurals
+        self._groups = {label: list(dict.fromkeys(k.lower().strip() for k in keywords if k and k.strip()))
+                        for label, keywords in groups.items()}
+        self._keywords = list(dict.fromkeys(k for keywords in self._groups.values() for k in keywords))
+        suffix = r'(?:e?s)?' if plurals else ''
+        self._tails = {k: re.compile(re.escape(k) + suffix + r'(?![a-z0-9])') for k in self._keywords}
+        # Whole-term regexes (all keywords / per group), for vectorized str.contains filters
+        self.pattern = keyword_pattern(self._keywords, plurals, consume_edges=True)
+        self.patterns = {label: keyword_pattern(keywords, plurals, consume_edges=True)
+                         for label, keywords in self._groups.items()}
+
+    def _occurs(self, keyword, text):
+        # The right boundary is part of the regex, so the C matcher skips
+        # 'internal' for 'intern'; only the left side is checked here
+        for match in self._tails[keyword].finditer(text):
+            start = match.start()
+            if start == 0 or text[start - 1] not in _WORD_CHARS:
+                return True
+        return False
+
+    @staticmethod
+    def _prepare(text):
+        return str(text or '').lower()
+
+    def search(self, text):
+        """True if any keyword occurs in text"""
+        text = self._prepare(text)
+        return any(k in text and self._occurs(k, text) for k in self._keywords)
+
+    def hits(self, text):
+        """Set of keywords found in text"""
+        text = self._prepare(text)
+        return {k for k in self._keywords if k in text and self._occurs(k, text)}
+
+    def labels(self, text):
+        """Set of group labels with at least one keyword in text"""
+        text = self._prepare(text)
+        return {label for label, keywords in self._groups.items()
+                if any(k in text and self._occurs(k, text) for k in keywords)}
+
+    def first(self, text, default=None):
+        """The first label (in group order) that has a hit, else default"""
+        text = self._prepare(text)
+        for label in self.order:
+            if any(k in text and self._occurs(k, text) for k in self._groups[label]):
+                return label
+        return default
+
+# ========== SHARED MATCHERS ==========
+
+INDIA_MATCHER = KeywordMatcher(INDIAN_LOCATIONS)
+
+def is_indian_location(text):
+    """True if the text names India or an Indian city"""
+    return INDIA_MATCHER.search(text)
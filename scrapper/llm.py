@@ -0,0 +1,175 @@
+"""
+💬 LLM HELPERS - CACHED CHAT COMPLETIONS
+One place for the OpenRouter chat call and the "pull JSON out of the reply"
+snippet that every module used to copy. Responses go through the persistent
+llm_cache, so identical prompts cost nothing the second time, and every
+call is recorded in llm_metrics (latency, tokens, cost, errors) under the
+caller's `feature` name - one row per try when llm_client retries, each
+with its attempt number and its own latency (backoff sleeps excluded).
+"""
+
+import json
+import time
+
+try:
+    from llm_cache import get_cache, make_key
+    from llm_metrics import record_call, classify_error, current_attempt
+    from llm_client import attempt_listener
+except ImportError:
+    from scrapper.llm_cache import get_cache, make_key
+    from scrapper.llm_metrics import record_call, classify_error, current_attempt
+    from scrapper.llm_client import attempt_listener
+
+# ========== JSON EXTRACTION ==========
+
+def extract_json_text(text):
+    """Strip ```json fences around a model reply"""
+    text = (text or '').strip()
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0].strip()
+    return text
+
+def parse_json(text):
+    """Parse a model reply as JSON (raises ValueError if it isn't)"""
+    return json.loads(extract_json_text(text))
+
+def _is_json(text):
+    try:
+        parse_json(text)
+        return True
+    except ValueError:
+        return False
+
+# ========== CHAT ==========
+
+def _lookup(model, temperature, messages, use_cache):
+    """(cache key, cached reply) - both None when caching is off"""
+    if not use_cache:
+        return None, None
+    key = make_key(model, temperature, messages)
+    return key, get_cache().get(key)
+
+def _store(key, model, content, ttl, valid):
+    if key and content and valid:
+        get_cache().put(key, model, content, ttl=ttl)
+
+class _Tries:
+    """attempt_listener for one call: records every retried failure as its own row"""
+
+    def __init__(self, feature, model):
+        self.feature = feature
+        self.model = model
+        self.attempt = current_attempt.get()
+        self.started = time.perf_counter()
+
+    def latency_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def started_try(self, attempt):
+        self.attempt = attempt
+        self.started = time.perf_counter()
+
+    def failed_try(self, error, attempt):
+        record_call(self.feature, self.model, latency_ms=self.latency_ms(),
+                    status=classify_error(error), error=error, attempt=attempt)
+
+def _record_response(tries, response, content, validate):
+    """Record the successful try; returns whether the reply passed validate"""
+    valid = validate is None or validate(content)
+    usage = getattr(response, 'usage', None)
+    record_call(
+        tries.feature, tries.model,
+        latency_ms=tries.latency_ms(),
+        prompt_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+        completion_tokens=getattr(usage, 'completion_tokens', 0) or 0,
+        cost_usd=getattr(usage, 'cost', None),
+        status='ok' if valid else 'parse_error',
+        attempt=tries.attempt
+    )
+    return valid
+
+def _record_failure(tries, error):
+    record_call(tries.feature, tries.model, latency_ms=tries.latency_ms(),
+                status=classify_error(error), error=error, attempt=tries.attempt)
+
+def _request_kwargs(model, messages, temperature, max_tokens):
+    kwargs = {'model': model, 'messages': messages, 'temperature': temperature}
+    if max_tokens is not None:
+        kwargs['max_tokens'] = max_tokens
+    return kwargs
+
+def chat(client, model, messages, temperature=0.7, max_tokens=None, use_cache=True,
+         ttl=None, validate=None, feature=None):
+    """
+    Chat completion -> reply text.
+
+    Args:
+        use_cache: Answer identical (model, temperature, prompt) from the cache
+        ttl: Seconds to keep this response (default: llm_cache.DEFAULT_TTL)
+        validate: Only cache replies for which validate(text) is true
+            (failures are recorded as parse errors)
+        feature: Name the call is recorded under in llm_metrics
+    """
+    started = time.perf_counter()
+    key, cached = _lookup(model, temperature, messages, use_cache)
+    if cached is not None:
+        record_call(feature, model, latency_ms=(time.perf_counter() - started) * 1000,
+                    cost_usd=0, cached=True)
+        return cached
+
+    tries = _Tries(feature, model)
+    token = attempt_listener.set(tries)
+    try:
+        response = client.chat.completions.create(**_request_kwargs(model, messages, temperature, max_tokens))
+    except Exception as e:
+        _record_failure(tries, e)
+        raise
+    finally:
+        attempt_listener.reset(token)
+    content = (response.choices[0].message.content or '').strip()
+
+    valid = _record_response(tries, response, content, validate)
+    _store(key, model, content, ttl, valid)
+    return content
+
+def chat_json(client, model, messages, temperature=0.2, max_tokens=None, use_cache=True, ttl=None,
+              feature=None):
+    """Chat completion parsed as JSON; unparseable replies are never cached"""
+    content = chat(client, model, messages, temperature=temperature, max_tokens=max_tokens,
+                   use_cache=use_cache, ttl=ttl, validate=_is_json, feature=feature)
+    return parse_json(content)
+
+# ========== ASYNC (AsyncOpenAI) ==========
+
+async def achat(client, model, messages, temperature=0.7, max_tokens=None, use_cache=True,
+                ttl=None, validate=None, feature=None):
+    """Async chat() for an AsyncOpenAI client (same cache and metrics)"""
+    started = time.perf_counter()
+    key, cached = _lookup(model, temperature, messages, use_cache)
+    if cached is not None:
+        record_call(feature, model, latency_ms=(time.perf_counter() - started) * 1000,
+                    cost_usd=0, cached=True)
+        return cached
+
+    tries = _Tries(feature, model)
+    token = attempt_listener.set(tries)
+    try:
+        response = await client.chat.completions.create(**_request_kwargs(model, messages, temperature, max_tokens))
+    except Exception as e:
+        _record_failure(tries, e)
+        raise
+    finally:
+        attempt_listener.reset(token)
+    content = (response.choices[0].message.content or '').strip()
+
+    valid = _record_response(tries, response, content, validate)
+    _store(key, model, content, ttl, valid)
+    return content
+
+async def achat_json(client, model, messages, temperature=0.2, max_tokens=None, use_cache=True, ttl=None,
+                     feature=None):
+    content = await achat(client, model, messages, temperature=temperature, max_tokens=max_tokens,
+                          use_cache=use_cache, ttl=ttl, validate=_is_json, feature=feature)
+    return parse_json(content)
@@ -0,0 +1,123 @@
+"""
+🧠 LLM RESPONSE CACHE - PERSISTENT, CONTENT-ADDRESSED
+Identical prompts (same model, temperature and whitespace-normalized
+messages) are answered from a local SQLite cache instead of OpenRouter.
+Entries expire after a TTL and the cache is bounded: once it holds more
+than MAX_ENTRIES responses the least recently used ones are evicted.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# ========== CONFIGURATION ==========
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DB = os.path.join(SCRIPT_DIR, 'data', 'llm_cache.db')
+
+DEFAULT_TTL = 7 * 86400      # Seconds a response stays valid
+MAX_ENTRIES = 5000           # LRU bound on stored responses
+
+def normalize_messages(messages):
+    """Collapse whitespace so re-indented prompts hash the same"""
+    return [(m.get('role', ''), ' '.join(str(m.get('content', '')).split())) for m in messages]
+
+def make_key(model, temperature, messages):
+    payload = json.dumps(
+        [model, round(float(temperature or 0), 3), normalize_messages(messages)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+# ========== CACHE ==========
+
+class LLMCache:
+    """SQLite-backed response cache with TTL and LRU eviction"""
+
+    def __init__(self, db_path=CACHE_DB, max_entries=MAX_ENTRIES, default_ttl=DEFAULT_TTL):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses(last_used)")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, key):
+        """Cached content for key, or None if missing / expired"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT content, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            return row[0]
+
+    def put(self, key, model, content, ttl=None):
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, created_at, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, content, now, now + ttl, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+        excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)", (excess,)
+            )
+
+    def stats(self):
+        with self._lock, self._connect() as conn:
+            entries, hits = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM responses"
+            ).fetchone()
+        return {'entries': entries, 'hits': hits}
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+# ========== SHARED INSTANCE ==========
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_cache():
+    """Process-wide response cache"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
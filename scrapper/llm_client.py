@@ -0,0 +1,252 @@
+"""
+🔌 LLM CLIENT POOL - ONE RATE-LIMIT-AWARE OPENROUTER CLIENT PER PROCESS
+Every module used to build its own OpenAI client with no retry logic. Now
+they all share one client per (base_url, api_key), so HTTP connections are
+reused, and every call goes through a process-wide gate:
+- at most `llm_concurrency` requests in flight (config, default 16), across
+  the dashboard, background scans and the async scoring executor
+- a 429 pauses ALL callers for Retry-After seconds (or a backoff)
+- 429s, 5xx and connection errors are retried with jittered exponential
+  backoff (sync calls here; async 429s are retried by scoring_executor)
+- every try is reported to the caller's attempt_listener (llm.chat records
+  one llm_metrics row per failed try, with its attempt number)
+
+    client = get_client(config)
+    client.chat.completions.create(model=..., messages=...)
+"""
+
+import time
+import random
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager, asynccontextmanager
+
+try:
+    from llm_metrics import current_attempt
+except ImportError:
+    from scrapper.llm_metrics import current_attempt
+
+# ========== CONFIGURATION ==========
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1"
+
+DEFAULT_CONCURRENCY = 16     # Requests in flight across the whole process
+MAX_RETRIES = 4
+BASE_DELAY = 1.0             # First backoff in seconds (doubles per attempt)
+MAX_DELAY = 60.0
+RATE_LIMIT_PAUSE = 10.0      # Pause after a 429 without Retry-After
+
+def status_code(error):
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status
+
+def is_rate_limit(error):
+    """True for an HTTP 429 from the provider"""
+    return status_code(error) == 429 or type(error).__name__ == 'RateLimitError'
+
+def is_retryable(error):
+    """429s, 5xx and network errors are worth another try; 4xx are not"""
+    if is_rate_limit(error):
+        return True
+    status = status_code(error)
+    if status is not None:
+        return status >= 500
+    return type(error).__name__ in ('APIConnectionError', 'APITimeoutError', 'ConnectError',
+                                    'ReadTimeout', 'ConnectTimeout', 'RemoteProtocolError')
+
+def retry_after(error):
+    """Seconds from the Retry-After header of an error response, if present"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return min(MAX_DELAY, float(headers.get('retry-after') or headers.get('Retry-After')))
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(error, attempt):
+    """Retry-After if given, else jittered exponential backoff"""
+    delay = retry_after(error)
+    if delay is None:
+        base = RATE_LIMIT_PAUSE if is_rate_limit(error) else BASE_DELAY
+        delay = min(MAX_DELAY, base * (2 ** attempt))
+    return delay * random.uniform(0.8, 1.2)
+
+# ========== GATE ==========
+
+class RateGate:
+    """Process-wide concurrency limit plus a shared 'paused until' clock"""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY):
+        self.concurrency = max(1, int(concurrency))
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self.paused_until = 0.0
+        self.stats = {'calls': 0, 'retries': 0, 'rate_limited': 0}
+
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        print(f"   ⏳ Rate limited - pausing LLM calls for {seconds:.1f}s")
+
+    def delay(self):
+        return max(0.0, self.paused_until - time.monotonic())
+
+    @contextmanager
+    def slot(self):
+        while self.delay() > 0:
+            time.sleep(self.delay())
+        self._slots.acquire()
+        try:
+            self.stats['calls'] += 1
+            yield
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        # Threads and event loops share the semaphore, so poll instead of blocking the loop
+        while True:
+            if self.delay() > 0:
+                await asyncio.sleep(self.delay())
+            elif self._slots.acquire(blocking=False):
+                break
+            else:
+                await asyncio.sleep(0.05)
+        try:
+            self.stats['calls'] += 1
+            yield
+        finally:
+            self._slots.release()
+
+_gate = None
+_gate_lock = threading.Lock()
+
+def get_gate(concurrency=None):
+    """The process-wide gate (concurrency is fixed by the first caller)"""
+    global _gate
+    with _gate_lock:
+        if _gate is None:
+            _gate = RateGate(concurrency or DEFAULT_CONCURRENCY)
+        return _gate
+
+# ========== CLIENTS ==========
+
+# Optional per-call observer: .started_try(attempt) before each try and
+# .failed_try(error, attempt) for each failure that is retried here.
+# Attempts continue from current_attempt (scoring_executor's 429 retries).
+attempt_listener = contextvars.ContextVar('llm_attempt_listener', default=None)
+
+def _started_try(attempt):
+    listener = attempt_listener.get()
+    if listener is not None:
+        listener.started_try(attempt)
+
+def _failed_try(error, attempt):
+    listener = attempt_listener.get()
+    if listener is not None:
+        listener.failed_try(error, attempt)
+
+class _Completions:
+    def __init__(self, completions, gate):
+        self._completions = completions
+        self._gate = gate
+
+    def create(self, **kwargs):
+        base = current_attempt.get()
+        attempt = 0
+        while True:
+            try:
+                with self._gate.slot():
+                    _started_try(base + attempt)
+                    return self._completions.create(**kwargs)
+            except Exception as e:
+                if not is_retryable(e) or attempt >= MAX_RETRIES:
+                    raise
+                _failed_try(e, base + attempt)
+                delay = backoff_delay(e, attempt)
+                attempt += 1
+                self._gate.stats['retries'] += 1
+                if is_rate_limit(e):
+                    self._gate.stats['rate_limited'] += 1
+                    self._gate.pause(delay)
+                else:
+                    time.sleep(delay)
+
+class _AsyncCompletions:
+    def __init__(self, completions, gate):
+        self._completions = completions
+        self._gate = gate
+
+    async def create(self, **kwargs):
+        base = current_attempt.get()
+        attempt = 0
+        while True:
+            try:
+                async with self._gate.aslot():
+                    _started_try(base + attempt)
+                    return await self._completions.create(**kwargs)
+            except Exception as e:
+                if not is_retryable(e) or attempt >= MAX_RETRIES:
+                    raise
+                delay = backoff_delay(e, attempt)
+                if is_rate_limit(e):
+                    # Everyone waits; scoring_executor owns the 429 retry
+                    self._gate.stats['rate_limited'] += 1
+                    self._gate.pause(delay)
+                    raise
+                _failed_try(e, base + attempt)
+                attempt += 1
+                self._gate.stats['retries'] += 1
+                await asyncio.sleep(delay)
+
+class _Chat:
+    def __init__(self, completions):
+        self.completions = completions
+
+class PooledClient:
+    """OpenAI client whose chat.completions.create goes through the shared gate"""
+
+    def __init__(self, raw, gate):
+        self.raw = raw
+        self.chat = _Chat(_Completions(raw.chat.completions, gate))
+
+class AsyncPooledClient:
+    """AsyncOpenAI counterpart of PooledClient (one per event loop)"""
+
+    def __init__(self, raw, gate):
+        self.raw = raw
+        self.chat = _Chat(_AsyncCompletions(raw.chat.completions, gate))
+
+    async def close(self):
+        await self.raw.close()
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _settings(config):
+    config = config or {}
+    return config.get('base_url') or OPENROUTER_URL, config['openrouter_key']
+
+def get_client(config):
+    """Shared sync client for this config's endpoint and key"""
+    base_url, api_key = _settings(config)
+    gate = get_gate(config.get('llm_concurrency'))
+    with _clients_lock:
+        client = _clients.get((base_url, api_key))
+        if client is None:
+            from openai import OpenAI
+            client = PooledClient(OpenAI(base_url=base_url, api_key=api_key, max_retries=0), gate)
+            _clients[(base_url, api_key)] = client
+        return client
+
+def make_async_client(config):
+    """
+    New async client for one event loop (AsyncOpenAI connections cannot be
+    shared across loops), still limited by the process-wide gate.
+    """
+    from openai import AsyncOpenAI
+    base_url, api_key = _settings(config)
+    return AsyncPooledClient(AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=0),
+                             get_gate(config.get('llm_concurrency')))
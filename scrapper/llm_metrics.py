@@ -0,0 +1,179 @@
+"""
+📊 LLM METRICS - LATENCY, TOKENS, COST AND ERRORS PER CALL
+Every chat call made through llm.chat / llm.achat is recorded in a local
+SQLite store (data/llm_metrics.db): feature, scan, model, latency, prompt /
+completion tokens, estimated cost, retry attempt, cache hits, rate limits,
+errors and JSON parse failures. The dashboard reads the aggregates.
+
+    set_scan("Indian_Remote 2025-01-01 10:00")   # tag the calls of one run
+    feature_summary(days=7)                       # per-feature aggregates
+    scan_summary(limit=20)                        # per-scan aggregates
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import contextvars
+
+# ========== CONFIGURATION ==========
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS_DB = os.path.join(SCRIPT_DIR, 'data', 'llm_metrics.db')
+
+RETENTION_DAYS = 90          # Older call rows are pruned
+
+# USD per 1M (prompt, completion) tokens - used when the provider reports no cost
+MODEL_PRICES = {
+    'google/gemini-2.5-flash': (0.30, 2.50),
+    'google/gemini-2.5-flash-lite': (0.10, 0.40),
+    'google/gemini-2.0-flash-001': (0.10, 0.40),
+    'google/gemini-2.5-pro': (1.25, 10.00),
+    'openai/gpt-4o-mini': (0.15, 0.60),
+    'openai/gpt-4o': (2.50, 10.00),
+    'anthropic/claude-3.5-haiku': (0.80, 4.00),
+    'meta-llama/llama-3.1-8b-instruct': (0.02, 0.05),
+}
+
+# Retry attempt of the current call (set by scoring_executor around each try)
+current_attempt = contextvars.ContextVar('llm_attempt', default=0)
+
+_scan_id = None
+
+def set_scan(scan_id):
+    """Tag all following calls in this process with a scan / run id"""
+    global _scan_id
+    _scan_id = scan_id
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    base = str(model or '').split(':')[0]
+    prompt_price, completion_price = MODEL_PRICES.get(base, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+def classify_error(error):
+    """'rate_limited' for 429s, otherwise 'error'"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status == 429 or type(error).__name__ == 'RateLimitError':
+        return 'rate_limited'
+    return 'error'
+
+# ========== STORE ==========
+
+class MetricsStore:
+    """Append-only SQLite log of LLM calls with aggregate queries"""
+
+    def __init__(self, db_path=METRICS_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts REAL NOT NULL,
+                    feature TEXT NOT NULL,
+                    scan_id TEXT,
+                    model TEXT,
+                    latency_ms REAL NOT NULL DEFAULT 0,
+                    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+                    completion_tokens INTEGER NOT NULL DEFAULT 0,
+                    cost_usd REAL NOT NULL DEFAULT 0,
+                    attempt INTEGER NOT NULL DEFAULT 0,
+                    cached INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    error TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_calls_ts ON calls(ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_calls_scan ON calls(scan_id)")
+            conn.execute("DELETE FROM calls WHERE ts < ?", (time.time() - RETENTION_DAYS * 86400,))
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def record(self, feature, model, latency_ms=0.0, prompt_tokens=0, completion_tokens=0,
+               cost_usd=None, cached=False, status='ok', error=None, attempt=None, scan_id=None):
+        if cost_usd is None:
+            cost_usd = estimate_cost(model, prompt_tokens, completion_tokens)
+        row = (
+            time.time(), feature or 'other', scan_id or _scan_id, model, round(latency_ms, 1),
+            int(prompt_tokens or 0), int(completion_tokens or 0), float(cost_usd or 0),
+            current_attempt.get() if attempt is None else attempt,
+            int(bool(cached)), status, (str(error)[:300] if error else None)
+        )
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO calls (ts, feature, scan_id, model, latency_ms, prompt_tokens, "
+                "completion_tokens, cost_usd, attempt, cached, status, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+            )
+
+    def _aggregate(self, group_col, where, params, order, limit=None):
+        query = f"""
+            SELECT {group_col},
+                   COUNT(*) AS calls,
+                   SUM(cached) AS cache_hits,
+                   ROUND(AVG(CASE WHEN cached = 0 AND status != 'error' THEN latency_ms END), 0) AS avg_latency_ms,
+                   MAX(latency_ms) AS max_latency_ms,
+                   SUM(prompt_tokens) AS prompt_tokens,
+                   SUM(completion_tokens) AS completion_tokens,
+                   ROUND(SUM(cost_usd), 4) AS cost_usd,
+                   SUM(attempt > 0) AS retries,
+                   SUM(status = 'rate_limited') AS rate_limited,
+                   SUM(status = 'error') AS errors,
+                   SUM(status = 'parse_error') AS parse_failures,
+                   MIN(ts) AS first_ts,
+                   MAX(ts) AS last_ts
+            FROM calls WHERE {where}
+            GROUP BY {group_col} ORDER BY {order}
+        """
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        with self._lock, self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = [dict(r) for r in conn.execute(query, params).fetchall()]
+        for r in rows:
+            live = r['calls'] - (r['cache_hits'] or 0)
+            r['error_rate'] = round(((r['errors'] or 0) + (r['rate_limited'] or 0)) / live, 3) if live else 0.0
+        return rows
+
+    def feature_summary(self, days=7):
+        """Aggregates per feature over the last `days` days"""
+        return self._aggregate('feature', 'ts >= ?', (time.time() - days * 86400,), 'cost_usd DESC')
+
+    def scan_summary(self, limit=20):
+        """Aggregates per scan id, newest first"""
+        return self._aggregate('scan_id', 'scan_id IS NOT NULL', (), 'last_ts DESC', limit)
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM calls")
+
+# ========== SHARED INSTANCE ==========
+
+_default_store = None
+_default_lock = threading.Lock()
+
+def get_metrics():
+    """Process-wide metrics store"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = MetricsStore()
+        return _default_store
+
+def record_call(*args, **kwargs):
+    """Record one call; metrics must never break the call itself"""
+    try:
+        get_metrics().record(*args, **kwargs)
+    except Exception as e:
+        print(f"   ⚠️ Could not record LLM metrics: {e}")
+
+def feature_summary(days=7):
+    return get_metrics().feature_summary(days)
+
+def scan_summary(limit=20):
+    return get_metrics().scan_summary(limit)
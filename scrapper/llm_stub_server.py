@@ -0,0 +1,265 @@
+"""
+🧪 LLM STUB SERVER - LOCAL OPENAI-COMPATIBLE ENDPOINT FOR BENCHMARKS
+Answers /v1/chat/completions like OpenRouter would, without cost or network:
+- replies in the shape each prompt asks for (batch score arrays, single
+  match scores, sheet Match_Score, gap analysis, resume parsing, plain text)
+- latency drawn from a log-normal distribution around a median
+- optional rate limit (requests/second) answered with 429 + Retry-After
+- optional random 500s and truncated (malformed) JSON replies
+- usage.prompt_tokens / completion_tokens from the message lengths
+
+Scores are a deterministic hash of the job title, so runs are comparable.
+
+Run it:
+    python llm_stub_server.py --port 8765 --latency 800 --rps 20 --malformed 0.05
+
+Then point system_recommendation / ai_processor / resume_tailor at it in
+ai_config.json:
+    "base_url": "http://127.0.0.1:8765/v1"
+
+benchmark_scoring.py starts one in-process with StubServer(...).
+"""
+
+import re
+import json
+import math
+import time
+import zlib
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ========== CONFIGURATION ==========
+
+DEFAULT_PORT = 8765
+DEFAULT_LATENCY_MS = 800     # Median reply time
+DEFAULT_JITTER = 0.5         # Log-normal sigma (0 = constant latency)
+MAX_LATENCY_MS = 30000
+
+_BATCH_JOB = re.compile(r'^\[(\d+)\] Title: (.*)$', re.MULTILINE)
+_SINGLE_TITLE = re.compile(r'^- (?:Title|Role): (.*)$', re.MULTILINE)
+
+# ========== REPLIES ==========
+
+def stub_score(title):
+    """Deterministic 15-95 score for a job title"""
+    return 15 + zlib.crc32(str(title).strip().lower().encode('utf-8')) % 81
+
+def _reason(title):
+    return f"Stub score for {str(title).strip()[:60]}"
+
+def reply_for(messages):
+    """Reply text in the format the prompt asks for"""
+    prompt = str(messages[-1].get('content', '')) if messages else ''
+
+    jobs = _BATCH_JOB.findall(prompt)
+    if jobs:
+        return json.dumps([{'id': int(job_id), 'score': stub_score(title), 'reason': _reason(title)}
+                           for job_id, title in jobs])
+
+    match = _SINGLE_TITLE.search(prompt)
+    title = match.group(1) if match else ''
+    if '"Match_Score"' in prompt:
+        return json.dumps({'Match_Score': stub_score(title), 'AI_Reasoning': _reason(title)})
+    if '"score"' in prompt:
+        return json.dumps({'score': stub_score(title), 'reason': _reason(title)})
+    if '"missing_keywords"' in prompt:
+        return json.dumps({
+            'missing_keywords': ['Docker', 'Kubernetes'],
+            'suggested_points': [{'original': 'Worked on backend',
+                                  'new': 'Built Dockerized backend services on Kubernetes',
+                                  'reason': 'JD asks for container experience.'}]
+        })
+    if '"experience"' in prompt and '"education"' in prompt:
+        return json.dumps({'name': 'Stub Candidate', 'email': 'stub@example.com', 'phone': '',
+                           'linkedin': '', 'summary': 'Stub summary.', 'skills': ['Python'],
+                           'experience': [], 'education': [], 'projects': []})
+    if '"roles"' in prompt:
+        return json.dumps({'roles': ['Software Engineer'], 'skills': ['Python'],
+                           'experience_level': 'Fresher', 'locations': ['Remote']})
+    return "This is a stub reply from the local LLM server."
+
+def count_tokens(text):
+    return len(str(text)) // 4 + 1
+
+# ========== SERVER ==========
+
+class StubSettings:
+    """Behaviour knobs; all may be changed while the server runs"""
+
+    def __init__(self, latency_ms=DEFAULT_LATENCY_MS, jitter=DEFAULT_JITTER, rps=0,
+                 error_rate=0.0, malformed_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.rps = rps                       # 0 = no rate limit
+        self.error_rate = error_rate         # Share of requests answered with a 500
+        self.malformed_rate = malformed_rate # Share of replies cut off mid-JSON
+        self.rng = random.Random(seed)
+
+class StubServer:
+    """OpenAI-compatible stub on a background thread"""
+
+    def __init__(self, settings=None, host='127.0.0.1', port=0):
+        self.settings = settings or StubSettings()
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        self._refilled = time.monotonic()
+        self.stats = {'requests': 0, 'ok': 0, 'rate_limited': 0, 'errors': 0, 'malformed': 0,
+                      'prompt_tokens': 0, 'completion_tokens': 0}
+        self.httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _draw(self):
+        """(latency seconds, fail with 500?, malformed?) for one request"""
+        s = self.settings
+        with self._lock:
+            latency = s.latency_ms
+            if s.jitter > 0 and latency > 0:
+                latency = s.rng.lognormvariate(math.log(latency), s.jitter)
+            return (min(latency, MAX_LATENCY_MS) / 1000.0,
+                    s.rng.random() < s.error_rate,
+                    s.rng.random() < s.malformed_rate)
+
+    def _admit(self):
+        """Token bucket; returns 0 when admitted, else seconds until a slot frees"""
+        rps = self.settings.rps
+        if not rps:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(rps), self._tokens + (now - self._refilled) * rps)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / rps
+
+    def complete(self, body):
+        """(status, headers, payload) for one chat completion request"""
+        self._count('requests')
+        wait = self._admit()
+        if wait:
+            self._count('rate_limited')
+            return 429, {'Retry-After': f"{max(wait, 0.1):.2f}"}, \
+                {'error': {'message': 'Rate limit exceeded (stub)', 'type': 'rate_limit', 'code': 429}}
+
+        latency, fail, malformed = self._draw()
+        time.sleep(latency)
+        if fail:
+            self._count('errors')
+            return 500, {}, {'error': {'message': 'Internal error (stub)', 'type': 'server_error', 'code': 500}}
+
+        messages = body.get('messages') or []
+        content = reply_for(messages)
+        if malformed and content.startswith(('{', '[')):
+            self._count('malformed')
+            content = content[:len(content) // 2]
+
+        prompt_tokens = sum(count_tokens(m.get('content', '')) for m in messages)
+        completion_tokens = count_tokens(content)
+        self._count('ok')
+        self._count('prompt_tokens', prompt_tokens)
+        self._count('completion_tokens', completion_tokens)
+        return 200, {}, {
+            'id': f"stub-{zlib.crc32(content.encode('utf-8'))}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens}
+        }
+
+def _handler_for(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, payload, headers=None):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip('/').endswith('/models'):
+                self._send(200, {'object': 'list', 'data': [{'id': 'stub', 'object': 'model'}]})
+            elif self.path.rstrip('/').endswith('/stats'):
+                self._send(200, dict(server.stats))
+            else:
+                self._send(404, {'error': {'message': 'Not found'}})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self._send(400, {'error': {'message': 'Invalid JSON body'}})
+                return
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                self._send(404, {'error': {'message': 'Not found'}})
+                return
+            status, headers, payload = server.complete(body)
+            self._send(status, payload, headers)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+# ========== MAIN ==========
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Local OpenAI-compatible stub for LLM benchmarks')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY_MS, help='Median latency (ms)')
+    parser.add_argument('--jitter', type=float, default=DEFAULT_JITTER, help='Log-normal sigma of the latency')
+    parser.add_argument('--rps', type=float, default=0, help='Requests/second before 429s (0 = unlimited)')
+    parser.add_argument('--errors', type=float, default=0.0, help='Share of requests failing with 500')
+    parser.add_argument('--malformed', type=float, default=0.0, help='Share of replies with broken JSON')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    stub = StubServer(StubSettings(args.latency, args.jitter, args.rps, args.errors,
+                                   args.malformed, args.seed), port=args.port)
+    print(f"🧪 LLM stub listening on {stub.url}")
+    print(f"   Set \"base_url\": \"{stub.url}\" in ai_config.json")
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
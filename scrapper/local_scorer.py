@@ -0,0 +1,210 @@
+"""
+📐 LOCAL SCORING ENGINE - DETERMINISTIC, NO NETWORK
+Scores jobs 0-100 from four signals, vectorized over a DataFrame:
+- skill overlap   (resume skills found in title / description, title counts double)
+- seniority match (intern/entry/mid/senior/executive + "N years" vs candidate level)
+- location        (preferred locations or remote)
+- company tier    (Top MNC / well-known tech)
+
+Used as the fallback when OpenRouter fails (instead of a flat 50) and as a
+"fast mode" that scores thousands of jobs per second.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+try:
+    from keyword_engine import KeywordMatcher, keyword_pattern
+except ImportError:
+    from scrapper.keyword_engine import KeywordMatcher, keyword_pattern
+
+# ========== CONFIGURATION ==========
+
+WEIGHTS = {'skills': 0.45, 'seniority': 0.25, 'location': 0.15, 'company': 0.15}
+
+SKILL_VOCAB = [
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'golang', 'rust', 'kotlin',
+    'swift', 'sql', 'react', 'node.js', 'node', 'express', 'mongodb', 'mern', 'next.js', 'angular',
+    'vue', 'django', 'flask', 'fastapi', 'spring', 'html', 'css', 'tailwind', 'docker', 'kubernetes',
+    'aws', 'azure', 'gcp', 'linux', 'git', 'machine learning', 'deep learning', 'ai', 'nlp', 'llm',
+    'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'data science', 'computer vision',
+    'generative ai', 'langchain', 'rest api', 'graphql', 'postgresql', 'mysql', 'redis', 'devops',
+    'ci/cd', 'android', 'flutter', 'react native', 'power bi', 'tableau', 'excel', 'figma'
+]
+SKILL_MATCHER = KeywordMatcher(SKILL_VOCAB)
+
+# Ordered: first match wins (same precedence as job_search.seniority_column)
+SENIORITY_PATTERNS = [
+    ('Intern', r'\b(?:intern|internship|co-?op|trainee)\b'),
+    ('Entry', r'\b(?:entry|junior|jr\.?|graduate|fresher|associate|early career)\b'),
+    ('Mid', r'\b(?:mid-level|intermediate|experienced)\b'),
+    ('Senior', r'\b(?:senior|sr\.?|lead|principal|staff)\b'),
+    ('Executive', r'\b(?:director|vp|vice president|head of|chief|cto|ceo)\b'),
+]
+LEVEL_RANK = {'Intern': 0, 'Entry': 1, 'Mid': 2, 'Senior': 3, 'Executive': 4}
+CANDIDATE_LEVELS = {'intern': 0, 'fresher': 0, 'student': 0, 'junior': 1, 'entry': 1,
+                    'mid': 2, 'senior': 3, 'lead': 3}
+
+YEARS_PATTERN = r'(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years|yrs)'
+
+TOP_MNC = ['google', 'microsoft', 'amazon', 'meta', 'apple', 'netflix', 'adobe', 'salesforce',
+           'oracle', 'ibm', 'nvidia', 'intel', 'uber', 'linkedin', 'atlassian', 'cisco', 'sap',
+           'qualcomm', 'intuit', 'vmware', 'paypal', 'walmart', 'goldman sachs', 'jpmorgan']
+WELL_KNOWN = ['stripe', 'airbnb', 'shopify', 'gitlab', 'coinbase', 'notion', 'figma', 'doordash',
+              'instacart', 'canva', 'dropbox', 'asana', 'grammarly', 'spotify', 'twitch', 'reddit',
+              'robinhood', 'lyft', 'databricks', 'snowflake', 'flipkart', 'swiggy', 'zomato',
+              'razorpay', 'phonepe', 'paytm', 'cred', 'infosys', 'tcs', 'wipro', 'accenture']
+
+LOCAL_REASON_PREFIX = "Local score: "
+
+def is_local_reason(reason):
+    """True for a reason produced by this engine (e.g. an LLM fallback)"""
+    return LOCAL_REASON_PREFIX in str(reason or '')
+
+def _text_column(df, col):
+    if col not in df.columns:
+        return pd.Series([''] * len(df), index=df.index)
+    return df[col].astype(str).fillna('').str.lower()
+
+# ========== RESUME SIGNALS ==========
+
+def skills_from_text(text):
+    """Vocabulary skills mentioned in a resume"""
+    found = SKILL_MATCHER.hits(text)
+    return [s for s in SKILL_VOCAB if s in found]
+
+def analysis_from_text(resume_text):
+    """LLM-free resume analysis (same keys as analyze_resume_for_roles)"""
+    text = str(resume_text or '').lower()
+    skills = skills_from_text(text)
+    if re.search(r'\b(?:b\.?tech|student|pursuing|expected \d{4}|intern)\b', text):
+        level = 'Fresher'
+    elif re.search(r'\b(?:senior|lead|[5-9]\+? years)\b', text):
+        level = 'Senior'
+    else:
+        level = 'Junior'
+
+    roles = ['Software Engineer']
+    if any(s in skills for s in ('machine learning', 'deep learning', 'ai', 'llm', 'generative ai')):
+        roles.insert(0, 'AI/ML Engineer')
+    if any(s in skills for s in ('react', 'node.js', 'node', 'mern')):
+        roles.append('Full Stack Developer')
+    if 'python' in skills:
+        roles.append('Python Developer')
+    if level == 'Fresher':
+        roles = [f"{r} Intern" for r in roles[:2]] + roles
+    return {'experience_level': level, 'roles': roles[:5], 'skills': skills[:15],
+            'locations': ['India', 'Remote']}
+
+# ========== SCORER ==========
+
+class LocalScorer:
+    """Deterministic job scorer for one candidate profile"""
+
+    def __init__(self, skills, experience_level='Fresher', locations=None):
+        self.skills = [s.lower().strip() for s in (skills or []) if str(s).strip()]
+        self.candidate_rank = CANDIDATE_LEVELS.get(str(experience_level or '').split()[0].lower()
+                                                   if experience_level else 'fresher', 1)
+        self.locations = [l.lower().strip() for l in (locations or []) if str(l).strip()]
+        self._skill_matcher = KeywordMatcher(self.skills) if self.skills else None
+
+    @classmethod
+    def from_analysis(cls, analysis, resume_text=''):
+        analysis = analysis or {}
+        skills = list(analysis.get('skills') or [])
+        # Resume vocabulary adds the skills the analysis did not list
+        for skill in skills_from_text(resume_text):
+            if skill not in [s.lower() for s in skills]:
+                skills.append(skill)
+        return cls(skills, analysis.get('experience_level', 'Fresher'), analysis.get('locations'))
+
+    def score_dataframe(self, df):
+        """Return df with 'local_score' (0-100 int) and 'local_reason' columns added"""
+        if df is None or df.empty:
+            out = pd.DataFrame(df).copy() if df is not None else pd.DataFrame()
+            out['local_score'] = pd.Series(dtype=int)
+            out['local_reason'] = pd.Series(dtype=str)
+            return out
+
+        title = _text_column(df, 'title')
+        body = _text_column(df, 'description').str.slice(0, 3000)
+        location = _text_column(df, 'location')
+        company = _text_column(df, 'company')
+        full = title + ' ' + body
+
+        # Skills: fraction of (up to 8 best-case) resume skills present; title hits count double
+        if self._skill_matcher:
+            # One matcher pass per text instead of one regex scan per skill
+            hits = np.fromiter((len(self._skill_matcher.hits(t)) for t in full), dtype=int, count=len(full))
+            in_title = np.fromiter((len(self._skill_matcher.hits(t)) for t in title), dtype=int, count=len(title))
+            weighted = hits + in_title
+            skill_score = np.minimum(1.0, weighted / min(8, len(self.skills)))
+        else:
+            hits = np.zeros(len(df), dtype=int)
+            skill_score = np.full(len(df), 0.5)
+
+        # Seniority: job level from keywords, then years of experience asked for
+        job_rank = pd.Series(np.nan, index=df.index)
+        for level, pattern in SENIORITY_PATTERNS:
+            mask = job_rank.isna() & full.str.contains(pattern, regex=True)
+            job_rank[mask] = LEVEL_RANK[level]
+        years = pd.to_numeric(full.str.extract(YEARS_PATTERN, expand=False), errors='coerce')
+        years_rank = pd.cut(years, bins=[-1, 0, 2, 4, 8, 100], labels=[0, 1, 2, 3, 4]).astype(float)
+        job_rank = job_rank.fillna(years_rank).fillna(self.candidate_rank).to_numpy()
+        gap = job_rank - self.candidate_rank
+        seniority_score = np.where(gap <= 0, 1.0 - 0.15 * np.abs(gap), np.maximum(0.0, 1.0 - 0.45 * gap))
+
+        # Location: preferred place or remote
+        remote = location.str.contains('remote', regex=False) | body.str.slice(0, 300).str.contains('remote', regex=False)
+        if self.locations:
+            preferred = location.str.contains(keyword_pattern(self.locations), regex=True)
+        else:
+            preferred = pd.Series(False, index=df.index)
+        location_score = np.where(preferred, 1.0, np.where(remote, 0.8, 0.3))
+
+        # Company tier
+        top = company.str.contains(keyword_pattern(TOP_MNC), regex=True).to_numpy()
+        known = company.str.contains(keyword_pattern(WELL_KNOWN), regex=True).to_numpy()
+        company_score = np.where(top, 1.0, np.where(known, 0.7, 0.35))
+
+        total = (WEIGHTS['skills'] * skill_score + WEIGHTS['seniority'] * seniority_score +
+                 WEIGHTS['location'] * location_score + WEIGHTS['company'] * company_score)
+
+        out = df.copy()
+        out['local_score'] = np.clip(np.rint(total * 100), 0, 100).astype(int)
+        out['local_reason'] = self._reasons(hits, gap, preferred.to_numpy(), remote.to_numpy(), top, known)
+        return out
+
+    def _reasons(self, hits, gap, preferred, remote, top, known):
+        total = len(self.skills)
+        reasons = []
+        for h, g, p, r, t, k in zip(hits, gap, preferred, remote, top, known):
+            parts = [f"{int(h)}/{total} resume skills" if total else "no resume skills"]
+            parts.append('level fits' if g <= 0 else ('slightly senior' if g <= 1 else 'too senior'))
+            if p:
+                parts.append('preferred location')
+            elif r:
+                parts.append('remote')
+            if t:
+                parts.append('Top MNC')
+            elif k:
+                parts.append('well-known company')
+            reasons.append(LOCAL_REASON_PREFIX + ", ".join(parts))
+        return reasons
+
+    def score_jobs(self, jobs):
+        """[(score, reason)] for a list of job dicts/records, in order"""
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        df = pd.DataFrame({
+            col: [str(job.get(col, '') or '') for job in jobs]
+            for col in ('title', 'company', 'location', 'description')
+        })
+        scored = self.score_dataframe(df)
+        return list(zip(scored['local_score'].tolist(), scored['local_reason'].tolist()))
+
+    def score_one(self, title, company, description, location=''):
+        return self.score_jobs([{'title': title, 'company': company,
+                                 'description': description, 'location': location}])[0]
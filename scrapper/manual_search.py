@@ -12,6 +12,19 @@ import time
 import feedparser
 import re
 
+try:
+    from dedup import dedupe_dataframe
+    from job_archive import append_jobs
+    from search_index import rank_jobs
+    from job_record import JobRecord, to_dataframe, standardize_dataframe, as_categorical, fill_blank
+    from keyword_engine import keyword_pattern
+except ImportError:
+    from scrapper.dedup import dedupe_dataframe
+    from scrapper.job_archive import append_jobs
+    from scrapper.search_index import rank_jobs
+    from scrapper.job_record import JobRecord, to_dataframe, standardize_dataframe, as_categorical, fill_blank
+    from scrapper.keyword_engine import keyword_pattern
+
 # ========== CONFIGURATION ==========
 
 INDIAN_CITIES = [
@@ -25,6 +38,13 @@ COUNTRIES = [
     "Singapore", "Malaysia", "Europe"
 ]
 
+WORK_MODE_KEYWORDS = {
+    'Remote': ['remote', 'work from home', 'wfh'],
+    'Hybrid': ['hybrid'],
+    'Onsite': ['onsite', 'on-site', 'office']
+}
+WORK_MODE_DESC_CHARS = 200   # Only the start of the description is checked for work mode
+
 # ========== BIG TECH COMPANIES ==========
 
 BIG_TECH_COMPANIES = {
@@ -120,22 +140,23 @@ def scrape_weworkremotely(query):
             company = title_parts[0].strip() if len(title_parts) > 0 else "Unknown"
             role = title_parts[1].strip() if len(title_parts) > 1 else entry.title
             
-            # Check if query matches
-            if query.lower() in role.lower() or query.lower() in entry.description.lower():
-                jobs.append({
-                    'title': role,
-                    'company': company,
-                    'location': 'Remote',
-                    'job_url': entry.link,
-                    'posted_date': entry.published if hasattr(entry, 'published') else '',
-                    'description': entry.description[:500] if hasattr(entry, 'description') else '',
-                    'source': 'We Work Remotely',
-                    'work_mode': 'Remote'
-                })
+            jobs.append(JobRecord(
+                title=role,
+                company=company,
+                location='Remote',
+                job_url=entry.link,
+                posted_date=entry.published if hasattr(entry, 'published') else '',
+                description=entry.description[:500] if hasattr(entry, 'description') else '',
+                source='We Work Remotely',
+                work_mode='Remote'
+            ))
+        
+        # Keep entries matching any query term, best (BM25) matches first
+        jobs = rank_jobs(jobs, query)
         
         if jobs:
             print(f"   ✓ Found {len(jobs)} jobs from We Work Remotely")
-            return pd.DataFrame(jobs)
+            return to_dataframe(jobs)
         
     except Exception as e:
         print(f"   ⚠️ WWR error: {e}")
@@ -154,24 +175,29 @@ def scrape_remotive(query):
             data = response.json()
             jobs = []
             
+            categories = {}
             for job in data.get('jobs', [])[:30]:
-                # Filter by query
-                if query.lower() in job.get('title', '').lower() or query.lower() in job.get('category', '').lower():
-                    jobs.append({
-                        'title': job.get('title', 'N/A'),
-                        'company': job.get('company_name', 'N/A'),
-                        'location': 'Remote',
-                        'job_url': job.get('url', ''),
-                        'posted_date': job.get('publication_date', ''),
-                        'description': job.get('description', '')[:500],
-                        'source': 'Remotive',
-                        'work_mode': 'Remote',
-                        'salary_range': job.get('salary', '')
-                    })
+                jobs.append(JobRecord(
+                    title=job.get('title', 'N/A'),
+                    company=job.get('company_name', 'N/A'),
+                    location='Remote',
+                    job_url=job.get('url', ''),
+                    posted_date=job.get('publication_date', ''),
+                    description=job.get('description', '')[:500],
+                    source='Remotive',
+                    work_mode='Remote',
+                    salary_range=job.get('salary', '')
+                ))
+                categories[job.get('url', '')] = job.get('category', '')
+            
+            # Rank on title + category + description (category is only used for matching)
+            by_url = {job['job_url']: job for job in jobs}
+            searchable = [dict(job, description=f"{categories.get(job['job_url'], '')} {job['description']}") for job in jobs]
+            jobs = [by_url[job['job_url']] for job in rank_jobs(searchable, query)]
             
             if jobs:
                 print(f"   ✓ Found {len(jobs)} jobs from Remotive")
-                return pd.DataFrame(jobs)
+                return to_dataframe(jobs)
         
     except Exception as e:
         print(f"   ⚠️ Remotive error: {e}")
@@ -210,21 +236,21 @@ def scrape_greenhouse_jobs(query, location=None):
                                 location_elem = job.find('span', class_='location')
                                 job_location = location_elem.text.strip() if location_elem else 'Not specified'
                                 
-                                jobs.append({
-                                    'title': title,
-                                    'company': company.title(),
-                                    'location': job_location,
-                                    'job_url': job_url,
-                                    'posted_date': '',
-                                    'source': 'Greenhouse ATS',
-                                    'work_mode': 'Remote' if 'remote' in job_location.lower() else 'Onsite'
-                                })
+                                jobs.append(JobRecord(
+                                    title=title,
+                                    company=company.title(),
+                                    location=job_location,
+                                    job_url=job_url,
+                                    posted_date='',
+                                    source='Greenhouse ATS',
+                                    work_mode='Remote' if 'remote' in job_location.lower() else 'Onsite'
+                                ))
             except:
                 continue
         
         if jobs:
             print(f"   ✓ Found {len(jobs)} jobs from Greenhouse")
-            return pd.DataFrame(jobs)
+            return to_dataframe(jobs)
         
     except Exception as e:
         print(f"   ⚠️ Greenhouse error: {e}")
@@ -265,21 +291,21 @@ def scrape_lever_jobs(query, location=None):
                                 location_elem = job.find('span', class_='sort-by-location')
                                 job_location = location_elem.text.strip() if location_elem else 'Not specified'
                                 
-                                jobs.append({
-                                    'title': title,
-                                    'company': company.title(),
-                                    'location': job_location,
-                                    'job_url': job_url,
-                                    'posted_date': '',
-                                    'source': 'Lever ATS',
-                                    'work_mode': 'Remote' if 'remote' in job_location.lower() else 'Onsite'
-                                })
+                                jobs.append(JobRecord(
+                                    title=title,
+                                    company=company.title(),
+                                    location=job_location,
+                                    job_url=job_url,
+                                    posted_date='',
+                                    source='Lever ATS',
+                                    work_mode='Remote' if 'remote' in job_location.lower() else 'Onsite'
+                                ))
             except:
                 continue
         
         if jobs:
             print(f"   ✓ Found {len(jobs)} jobs from Lever")
-            return pd.DataFrame(jobs)
+            return to_dataframe(jobs)
         
     except Exception as e:
         print(f"   ⚠️ Lever error: {e}")
@@ -382,8 +408,13 @@ def scrape_jobs_by_query(query, country=None, location=None, work_mode=None, res
         # Remove duplicates
         final_df = final_df.drop_duplicates(subset=['job_url'], keep='first')
         
+        # Remove cross-board near-duplicates (same posting, different URL)
+        final_df = dedupe_dataframe(final_df)
+        
         # Fill NaNs to prevent JSON errors
-        final_df = final_df.fillna("")
+        final_df = as_categorical(fill_blank(final_df))
+        
+        append_jobs(final_df)
         
         print("\n" + "="*70)
         print(f"✅ TOTAL JOBS FOUND: {len(final_df)}")
@@ -400,50 +431,34 @@ def scrape_jobs_by_query(query, country=None, location=None, work_mode=None, res
 # ========== HELPER FUNCTIONS ==========
 
 def standardize_columns(df, source_name):
-    """Standardize column names"""
-    column_mapping = {
-        'title': 'title',
-        'company': 'company',
-        'location': 'location',
-        'job_url': 'job_url',
-        'date_posted': 'posted_date',
-        'description': 'description',
-        'salary_source': 'salary_range',
-        'job_type': 'work_mode'
-    }
-    
-    existing_cols = {k: v for k, v in column_mapping.items() if k in df.columns}
-    df = df.rename(columns=existing_cols)
-    
-    if 'source' not in df.columns:
-        df['source'] = source_name
-    
-    required_cols = ['title', 'company', 'location', 'job_url', 'posted_date', 'source']
-    optional_cols = ['description', 'salary_range', 'work_mode']
-    
-    final_cols = [col for col in required_cols + optional_cols if col in df.columns]
-    return df[final_cols]
+    """Map board-specific columns onto the shared JobRecord schema"""
+    return standardize_dataframe(df, source_name)
+
+def _lower_column(df, col, chars=None):
+    """Lower-cased column with safe_str semantics (NaN, None and 'nan' become '')"""
+    if col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    values = df[col]
+    text = values.astype(object).where(values.notna(), '').astype(str).str.strip()
+    text = text.mask(text.str.lower() == 'nan', '')
+    if chars:
+        text = text.str.slice(0, chars)
+    return text.str.lower()
 
 def filter_by_work_mode(df, work_mode):
-    """Filter by work mode"""
-    mode_keywords = {
-        'Remote': ['remote', 'work from home', 'wfh'],
-        'Hybrid': ['hybrid'],
-        'Onsite': ['onsite', 'on-site', 'office']
-    }
-    
-    def matches_work_mode(row):
-        location_str = str(row.get('location', '')).lower()
-        desc_str = str(row.get('description', ''))[:200].lower()
-        
-        for mode in work_mode:
-            keywords = mode_keywords.get(mode, [])
-            for keyword in keywords:
-                if keyword in location_str or keyword in desc_str:
-                    return True
-        return False
+    """
+    Filter by work mode: one whole-term regex for the selected modes' keywords,
+    run over the lower-cased location / description columns (no per-row Python)
+    """
+    keywords = [keyword for mode in work_mode for keyword in WORK_MODE_KEYWORDS.get(mode, [])]
+    if df.empty or not keywords:
+        return df.iloc[0:0]
     
-    return df[df.apply(matches_work_mode, axis=1)]
+    pattern = keyword_pattern(keywords, consume_edges=True)
+    location = _lower_column(df, 'location')
+    description = _lower_column(df, 'description', WORK_MODE_DESC_CHARS)
+    matches = location.str.contains(pattern, regex=True) | description.str.contains(pattern, regex=True)
+    return df[matches.to_numpy()]
 
 def get_ai_role_suggestions(resume_text=None, generic=True):
     """Get role suggestions"""
@@ -0,0 +1,82 @@
+"""
+🪜 MODEL CASCADE - CHEAP MODEL FIRST, STRONG MODEL FOR THE GREY ZONE
+Every job is scored by a fast/cheap model; only jobs whose score lands in
+the ambiguous band (default 55-85) are re-scored by the strong model.
+Clear rejects and clear matches never pay for the expensive call.
+
+ai_config.json:
+    "scoring_cascade": {
+        "fast_model": "google/gemini-2.5-flash-lite",
+        "strong_model": "google/gemini-2.5-pro",     (default: "model")
+        "band": [55, 85],
+        "enabled": true
+    }
+
+Escalated calls are recorded in llm_metrics under "<feature>_escalated",
+so the dashboard shows escalation rate and cost per tier.
+"""
+
+try:
+    from local_scorer import is_local_reason
+except ImportError:
+    from scrapper.local_scorer import is_local_reason
+
+# ========== CONFIGURATION ==========
+
+DEFAULT_BAND = (55, 85)
+
+class ModelCascade:
+    """Two-tier scoring plan plus escalation stats"""
+
+    def __init__(self, fast_model, strong_model, band=DEFAULT_BAND):
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.band = (int(band[0]), int(band[1]))
+        self.stats = {'scored': 0, 'escalated': 0, 'changed': 0}
+
+    @classmethod
+    def from_config(cls, config):
+        """Cascade from config['scoring_cascade'], or None when it is off"""
+        settings = (config or {}).get('scoring_cascade') or {}
+        if not settings.get('fast_model') or not settings.get('enabled', True):
+            return None
+        strong_model = settings.get('strong_model') or config.get('model')
+        if strong_model == settings['fast_model']:
+            return None
+        return cls(settings['fast_model'], strong_model, settings.get('band', DEFAULT_BAND))
+
+    def needs_escalation(self, score):
+        low, high = self.band
+        return score is not None and low <= score <= high
+
+    def escalations(self, results):
+        """Indices of (score, reason) results that go to the strong model"""
+        picked = [i for i, (score, _) in enumerate(results) if self.needs_escalation(score)]
+        self.stats['scored'] += len(results)
+        self.stats['escalated'] += len(picked)
+        return picked
+
+    def merge(self, results, picked, strong_results, models=None):
+        """
+        Strong-model results replace the fast ones in place. A strong result
+        that is only a local fallback (the call failed) keeps the fast score.
+        models: optional per-job model names, updated for the replaced scores.
+        """
+        for i, (score, reason) in zip(picked, strong_results):
+            if score is None or is_local_reason(reason):
+                continue
+            if score != results[i][0]:
+                self.stats['changed'] += 1
+            results[i] = (score, reason)
+            if models is not None:
+                models[i] = self.strong_model
+        return results
+
+    @property
+    def escalation_rate(self):
+        return self.stats['escalated'] / self.stats['scored'] if self.stats['scored'] else 0.0
+
+    def summary(self):
+        return (f"{self.stats['scored']} scored by {self.fast_model}, "
+                f"{self.stats['escalated']} escalated to {self.strong_model} "
+                f"({self.escalation_rate:.0%}), {self.stats['changed']} changed score")
@@ -1,9 +1,17 @@
 
 import json
 import os
-from openai import OpenAI
 from serpapi import GoogleSearch
 
+try:
+    from llm import chat
+    from prompt_builder import PromptBuilder, PRIORITY_SECTIONS
+    from llm_client import get_client
+except ImportError:
+    from scrapper.llm import chat
+    from scrapper.prompt_builder import PromptBuilder, PRIORITY_SECTIONS
+    from scrapper.llm_client import get_client
+
 class NetworkingAgent:
     def __init__(self, config_path=None):
         if config_path is None:
@@ -13,10 +21,7 @@ class NetworkingAgent:
         with open(config_path, 'r') as f:
             self.config = json.load(f)
             
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=self.config['openrouter_key']
-        )
+        self.client = get_client(self.config)
         self.model = self.config['model']
         self.serp_api_key = self.config.get('serp_api_key', 'YOUR_SERP_API_KEY')  # Needs SerpApi
 
@@ -65,13 +70,16 @@ class NetworkingAgent:
         Return ONLY the message text.
         """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            # Uncached: every request should be a fresh draft
+            return chat(
+                self.client,
+                self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
-                max_tokens=300
+                max_tokens=300,
+                use_cache=False,
+                feature='connection_request'
             )
-            return response.choices[0].message.content.strip()
         except Exception:
             return f"Hi {recipient_name}, I'm {candidate_name}, an aspiring engineer. I admire {company_name}'s work and would love to connect!"
 
@@ -79,11 +87,13 @@ class NetworkingAgent:
         """
         Generate a cold email body
         """
+        sender_profile = PromptBuilder(150, label='cold_email').add(
+            'resume', candidate_resume, query=f"{job_role} {company_name}", priority=PRIORITY_SECTIONS)
         prompt = f"""
         Write a short, value-driven Cold Email to a Recruiter/Hiring Manager.
         
         Recipient: {recipient_name} at {company_name}
-        Sender Profile: {candidate_resume[:500]}
+        Sender Profile: {sender_profile}
         Target Role: {job_role}
         
         Structure:
@@ -95,12 +105,14 @@ class NetworkingAgent:
         Return the full email text with Subject line first.
         """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            return chat(
+                self.client,
+                self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
-                max_tokens=1000
+                max_tokens=1000,
+                use_cache=False,
+                feature='cold_email'
             )
-            return response.choices[0].message.content.strip()
         except:
             return "Error generating email."
@@ -0,0 +1,107 @@
+"""
+🎯 PRE-RANKER - LOCAL TF-IDF SIMILARITY BEFORE LLM SCORING
+Ranks the whole scraped pool by cosine similarity between the master resume
+and each job (title weighted x3 + company + description), so the limited LLM
+budget goes to the most promising jobs instead of whatever was scraped first.
+
+CPU only, no extra dependencies: words and word bigrams are hashed into a
+fixed 2^18-dim space (crc32), weighted by sublinear TF x IDF over the pool,
+and all dot products are computed in one NumPy bincount pass.
+"""
+
+import re
+import zlib
+import numpy as np
+
+# ========== CONFIGURATION ==========
+
+HASH_BITS = 18
+HASH_DIM = 1 << HASH_BITS
+TITLE_WEIGHT = 3          # Title tokens are repeated this many times
+DESC_CHARS = 3000         # Only the start of long descriptions is used
+
+STOPWORDS = {
+    'a', 'an', 'and', 'the', 'for', 'of', 'in', 'on', 'at', 'to', 'with', 'as', 'or',
+    'is', 'are', 'be', 'will', 'you', 'your', 'we', 'our', 'this', 'that', 'by', 'from',
+    'it', 'its', 'have', 'has', 'work', 'team', 'job', 'role', 'experience', 'etc'
+}
+
+_WORD = re.compile(r'[a-z0-9+#]+')
+_HTML_TAG = re.compile(r'<[^>]+>')
+
+# ========== FEATURES ==========
+
+def _tokens(text):
+    text = _HTML_TAG.sub(' ', str(text or '')).lower()
+    return [t for t in _WORD.findall(text) if t not in STOPWORDS and len(t) > 1]
+
+def _hashed_terms(tokens):
+    """Hashed unigram + bigram ids for a token list"""
+    terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return np.fromiter(
+        (zlib.crc32(t.encode('utf-8')) & (HASH_DIM - 1) for t in terms),
+        dtype=np.int64, count=len(terms)
+    )
+
+def job_text(job):
+    title = str(job.get('title', '') or '')
+    return ' '.join([title] * TITLE_WEIGHT + [
+        str(job.get('company', '') or ''),
+        str(job.get('description', '') or '')[:DESC_CHARS]
+    ])
+
+def _sparse_tf(text):
+    """(term ids, sublinear tf weights) for one document"""
+    ids = _hashed_terms(_tokens(text))
+    if ids.size == 0:
+        return ids, np.zeros(0)
+    unique, counts = np.unique(ids, return_counts=True)
+    return unique, 1.0 + np.log(counts)
+
+# ========== SIMILARITY ==========
+
+def similarity_scores(resume_text, texts):
+    """Cosine similarity (0-1) of each text to the resume, as a NumPy array"""
+    docs = [_sparse_tf(text) for text in texts]
+    if not docs:
+        return np.zeros(0)
+
+    lengths = np.array([ids.size for ids, _ in docs])
+    doc_ids = np.repeat(np.arange(len(docs)), lengths)
+    term_ids = np.concatenate([ids for ids, _ in docs])
+    tf = np.concatenate([w for _, w in docs])
+
+    # IDF over the job pool (+ resume), smoothed
+    df = np.bincount(term_ids, minlength=HASH_DIM)
+    resume_ids, resume_tf = _sparse_tf(resume_text)
+    df[resume_ids] += 1
+    idf = np.log((len(docs) + 2) / (df + 1)) + 1.0
+
+    weights = tf * idf[term_ids]
+    doc_norms = np.sqrt(np.bincount(doc_ids, weights=weights ** 2, minlength=len(docs)))
+
+    resume_vec = np.zeros(HASH_DIM)
+    resume_vec[resume_ids] = resume_tf * idf[resume_ids]
+    resume_norm = np.linalg.norm(resume_vec)
+    if resume_norm == 0:
+        return np.zeros(len(docs))
+
+    dots = np.bincount(doc_ids, weights=weights * resume_vec[term_ids], minlength=len(docs))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = dots / (doc_norms * resume_norm)
+    return np.nan_to_num(scores)
+
+def pre_rank(jobs, resume_text, top_k=None):
+    """
+    Order jobs by resume similarity (best first); stable for ties.
+    Returns (ranked jobs, similarity scores in the same order).
+    """
+    jobs = list(jobs)
+    if not jobs or not str(resume_text or '').strip():
+        return jobs[:top_k] if top_k else jobs, np.zeros(min(len(jobs), top_k or len(jobs)))
+
+    scores = similarity_scores(resume_text, [job_text(job) for job in jobs])
+    order = np.argsort(-scores, kind='stable')
+    if top_k:
+        order = order[:top_k]
+    return [jobs[i] for i in order], scores[order]
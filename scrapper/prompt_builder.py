@@ -0,0 +1,202 @@
+"""
+✂️ PROMPT BUILDER - TOKEN BUDGETS INSTEAD OF CHARACTER CUTS
+Fits the resume and job description into a per-call token budget:
+- tokens are counted with tiktoken when installed (~4 chars/token otherwise)
+- text is split into sections / paragraphs / sentence groups
+- when a query (the job, or the resume) is given, the chunks most similar
+  to it are kept (same hashed TF-IDF as pre_ranker), in their original order
+- text that already fits is passed through untouched
+
+Token usage per prompt part is recorded so runs can report what they sent
+and how much was trimmed.
+"""
+
+import re
+import threading
+from functools import lru_cache
+
+try:
+    from pre_ranker import similarity_scores
+except ImportError:
+    from scrapper.pre_ranker import similarity_scores
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+# ========== CONFIGURATION ==========
+
+CHUNK_TOKENS = 120           # Sections longer than this are split further
+MIN_TAIL_TOKENS = 30         # Leftover budget worth filling with a truncated chunk
+
+# Resume sections that carry experience-level / skill signal for every job
+PRIORITY_SECTIONS = ('summary', 'objective', 'skills', 'technical skills', 'education', 'experience')
+PRIORITY_BONUS = 0.15
+
+_HEADING = re.compile(r'^\s*([A-Z][A-Z &/]{2,40}|[A-Za-z][A-Za-z &/]{2,30}:)\s*$')
+_BLOCK_SPLIT = re.compile(r'\n\s*\n|\n(?=\s*[•\-*▪●]\s)')
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# ========== TOKENS ==========
+
+def count_tokens(text):
+    text = str(text or '')
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+def truncate_tokens(text, budget):
+    """Cut text to at most `budget` tokens, on a word boundary"""
+    text = str(text or '')
+    if budget <= 0:
+        return ''
+    if count_tokens(text) <= budget:
+        return text
+    if _ENCODING is not None:
+        cut = _ENCODING.decode(_ENCODING.encode(text, disallowed_special=())[:budget])
+    else:
+        cut = text[:budget * 4]
+    space = cut.rfind(' ')
+    return (cut[:space] if space > len(cut) // 2 else cut).rstrip()
+
+# ========== CHUNKING ==========
+
+def _split_long(block):
+    """Break a block above CHUNK_TOKENS into sentence/line groups"""
+    if count_tokens(block) <= CHUNK_TOKENS:
+        return [block]
+    pieces = [p for line in block.splitlines() for p in _SENTENCE_SPLIT.split(line) if p.strip()]
+    groups, current = [], ''
+    for piece in pieces:
+        candidate = f"{current}\n{piece}" if current else piece
+        if current and count_tokens(candidate) > CHUNK_TOKENS:
+            groups.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        groups.append(current)
+    return groups
+
+@lru_cache(maxsize=128)
+def split_sections(text):
+    """
+    Resume-style text -> tuple of (heading, chunk) in document order.
+    Headings are ALL-CAPS lines or short 'Title:' lines; chunks stay under
+    about CHUNK_TOKENS.
+    """
+    sections, heading, lines = [], '', []
+    for line in str(text or '').splitlines():
+        if _HEADING.match(line) and len(line.split()) <= 5:
+            if lines:
+                sections.append((heading, '\n'.join(lines).strip()))
+            heading, lines = line.strip().rstrip(':'), [line]
+        else:
+            lines.append(line)
+    if lines:
+        sections.append((heading, '\n'.join(lines).strip()))
+
+    chunks = []
+    for heading, body in sections:
+        for block in _BLOCK_SPLIT.split(body):
+            for piece in _split_long(block.strip()):
+                if piece.strip():
+                    chunks.append((heading, piece.strip()))
+    return tuple(chunks)
+
+# ========== SELECTION ==========
+
+def fit_text(text, budget, query=None, priority=()):
+    """
+    Text reduced to `budget` tokens. Without a query the head of the text is
+    kept; with one, the chunks most similar to the query (plus a bonus for
+    headings in `priority`) are kept in document order.
+    """
+    text = str(text or '').strip()
+    if count_tokens(text) <= budget:
+        return text
+    if not query:
+        return truncate_tokens(text, budget)
+
+    chunks = split_sections(text)
+    if len(chunks) <= 1:
+        return truncate_tokens(text, budget)
+
+    scores = similarity_scores(query, [body for _, body in chunks])
+    for i, (heading, _) in enumerate(chunks):
+        if heading.lower() in priority:
+            scores[i] += PRIORITY_BONUS
+
+    keep, used = {}, 0
+    for i in sorted(range(len(chunks)), key=lambda i: (-scores[i], i)):
+        cost = count_tokens(chunks[i][1]) + 1
+        if used + cost <= budget:
+            keep[i] = chunks[i][1]
+            used += cost
+        elif budget - used >= MIN_TAIL_TOKENS:
+            keep[i] = truncate_tokens(chunks[i][1], budget - used - 1)
+            used = budget
+        if used >= budget:
+            break
+    return '\n'.join(keep[i] for i in sorted(keep))
+
+# ========== USAGE ==========
+
+_usage = {}
+_usage_lock = threading.Lock()
+
+def _record(label, sent, original):
+    with _usage_lock:
+        entry = _usage.setdefault(label, {'calls': 0, 'tokens': 0, 'original_tokens': 0})
+        entry['calls'] += 1
+        entry['tokens'] += sent
+        entry['original_tokens'] += original
+
+def usage_stats():
+    """{label: {'calls', 'tokens', 'original_tokens'}} since the process started"""
+    with _usage_lock:
+        return {label: dict(entry) for label, entry in _usage.items()}
+
+def usage_summary():
+    """One line per label, e.g. for end-of-run logs"""
+    lines = []
+    for label, entry in sorted(usage_stats().items()):
+        saved = entry['original_tokens'] - entry['tokens']
+        lines.append(f"{label}: {entry['tokens']} tokens in {entry['calls']} parts "
+                     f"({saved} trimmed)")
+    return lines
+
+class PromptBuilder:
+    """
+    Fits the parts of one prompt into a shared token budget.
+
+        pb = PromptBuilder(900, label='match')
+        resume = pb.add('resume', MASTER_RESUME, 600, query=job_text)
+        desc = pb.add('description', description, query=MASTER_RESUME)
+        pb.tokens  # tokens used by the parts so far
+    """
+
+    def __init__(self, budget, label='prompt'):
+        self.budget = budget
+        self.label = label
+        self.parts = {}
+
+    @property
+    def tokens(self):
+        return sum(self.parts.values())
+
+    @property
+    def remaining(self):
+        return max(0, self.budget - self.tokens)
+
+    def add(self, name, text, budget=None, query=None, priority=()):
+        """Fitted text for one part; `budget` is capped by what is left"""
+        limit = self.remaining if budget is None else min(budget, self.remaining)
+        original = count_tokens(text)
+        fitted = fit_text(text, limit, query=query, priority=priority)
+        used = count_tokens(fitted)
+        self.parts[name] = used
+        _record(f"{self.label}.{name}", used, original)
+        return fitted
@@ -0,0 +1,80 @@
+"""
+🧾 RESUME ANALYSIS MEMO
+The resume analysis (experience level, roles, skills, locations) is stored
+in data/resume_analysis.json, keyed on the resume file's sha256 and the
+model name. Scans, the unified scraper and the dashboard reuse it without
+touching the PDF or OpenRouter. It is invalidated automatically: when the
+resume file changes its hash changes, and the next analysis is recomputed.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+try:
+    from resume_reader import get_resume_hash
+except ImportError:
+    from scrapper.resume_reader import get_resume_hash
+
+# ========== CONFIGURATION ==========
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYSIS_FILE = os.path.join(SCRIPT_DIR, 'data', 'resume_analysis.json')
+
+MAX_ENTRIES = 20             # Old resume versions / models kept around
+
+_lock = threading.Lock()
+
+def _key(resume_hash, model):
+    return f"{resume_hash}:{model}"
+
+def _load(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+# ========== MEMO ==========
+
+def load_cached_analysis(model, resume_hash=None, path=ANALYSIS_FILE):
+    """Stored analysis for the current resume + model, or None"""
+    resume_hash = resume_hash or get_resume_hash()
+    if not resume_hash:
+        return None
+    with _lock:
+        entry = _load(path).get(_key(resume_hash, model))
+    return entry.get('analysis') if entry else None
+
+def load_latest_analysis(resume_hash=None, path=ANALYSIS_FILE):
+    """Stored analysis for the current resume with any model (for display), or None"""
+    resume_hash = resume_hash or get_resume_hash()
+    if not resume_hash:
+        return None
+    with _lock:
+        entries = [e for e in _load(path).values() if e.get('resume_hash') == resume_hash]
+    if not entries:
+        return None
+    return max(entries, key=lambda e: e.get('created_at', ''))['analysis']
+
+def save_analysis(model, analysis, resume_hash=None, path=ANALYSIS_FILE):
+    resume_hash = resume_hash or get_resume_hash()
+    if not resume_hash or not analysis:
+        return
+    with _lock:
+        data = _load(path)
+        data[_key(resume_hash, model)] = {
+            'resume_hash': resume_hash,
+            'model': model,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'analysis': analysis
+        }
+        if len(data) > MAX_ENTRIES:
+            newest = sorted(data.items(), key=lambda kv: kv[1].get('created_at', ''), reverse=True)
+            data = dict(newest[:MAX_ENTRIES])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
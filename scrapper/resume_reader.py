@@ -1,51 +1,133 @@
 import os
 import glob
+import hashlib
 try:
     import PyPDF2
     import pdfplumber
 except ImportError:
     pass
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
 
-def get_master_resume():
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), 'Assets')
+
+# Generated files that also live in Assets/ and must never be read as the resume
+GENERATED_SUFFIXES = ('_CheatSheet.pdf',)
+
+# (path, mtime, size) -> text / sha256, so an unchanged file is parsed and hashed once
+_text_cache = {}
+_hash_cache = {}
+
+def _candidates(pattern):
+    files = sorted(glob.glob(os.path.join(ASSETS_DIR, pattern)))
+    return [f for f in files if not f.endswith(GENERATED_SUFFIXES)]
+
+def get_master_resume_path():
     """
-    Reads the master resume from the Assets folder.
-    Prioritizes .pdf files over .txt files.
+    Path of the master resume in Assets/ (or None).
+    'master resume.pdf' wins, then any other PDF, then TXT files.
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    assets_dir = os.path.join(os.path.dirname(script_dir), 'Assets')
-    
-    if not os.path.exists(assets_dir):
-        return "Assets folder not found."
-        
-    # Check for PDFs first
-    pdf_files = glob.glob(os.path.join(assets_dir, '*.pdf'))
+    if not os.path.exists(ASSETS_DIR):
+        return None
+    preferred = os.path.join(ASSETS_DIR, 'master resume.pdf')
+    if os.path.exists(preferred):
+        return preferred
+    pdf_files = _candidates('*.pdf')
     if pdf_files:
+        return pdf_files[0]
+    preferred = os.path.join(ASSETS_DIR, 'master resume.txt')
+    if os.path.exists(preferred):
+        return preferred
+    txt_files = _candidates('*.txt')
+    return txt_files[0] if txt_files else None
+
+def _file_key(path):
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+def get_resume_hash(path=None):
+    """sha256 of the master resume file contents (None if there is no resume)"""
+    path = path or get_master_resume_path()
+    if not path or not os.path.exists(path):
+        return None
+    key = _file_key(path)
+    if key not in _hash_cache:
+        with open(path, 'rb') as f:
+            _hash_cache[key] = hashlib.sha256(f.read()).hexdigest()
+    return _hash_cache[key]
+
+def _read_pdf(path):
+    try:
+        # Let's try PyPDF2 first
+        with open(path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            text = ""
+            for page in reader.pages:
+                text += page.extract_text() + "\n"
+            if text.strip():
+                return text.strip()
+    except Exception as e:
         try:
-            # Let's try PyPDF2 first
-            with open(pdf_files[0], 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
+            # Fallback to pdfplumber
+            with pdfplumber.open(path) as pdf:
                 text = ""
-                for page in reader.pages:
+                for page in pdf.pages:
                     text += page.extract_text() + "\n"
                 if text.strip():
                     return text.strip()
-        except Exception as e:
-            try:
-                # Fallback to pdfplumber
-                with pdfplumber.open(pdf_files[0]) as pdf:
-                    text = ""
-                    for page in pdf.pages:
-                        text += page.extract_text() + "\n"
+        except Exception as e2:
+            if pypdf is not None:
+                try:
+                    with open(path, 'rb') as f:
+                        text = "\n".join(page.extract_text() or "" for page in pypdf.PdfReader(f).pages)
                     if text.strip():
                         return text.strip()
-            except Exception as e2:
-                print(f"Error reading PDF: {e} | {e2}")
-                pass # Fallback to txt
+                except Exception:
+                    pass
+            print(f"Error reading PDF: {e} | {e2}")
+    return None
 
-    # Fallback to TXT
-    txt_files = glob.glob(os.path.join(assets_dir, '*.txt'))
+def read_resume_text(path=None):
+    """
+    Text of the master resume file - the same file get_resume_hash() hashes,
+    so anything keyed on the hash matches the text that was read.
+    None if there is no resume or it has no extractable text.
+    """
+    path = path or get_master_resume_path()
+    if not path or not os.path.exists(path):
+        return None
+    key = _file_key(path)
+    if key not in _text_cache:
+        if path.lower().endswith('.pdf'):
+            text = _read_pdf(path)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read().strip()
+        if not text:
+            return None
+        _text_cache[key] = text
+    return _text_cache[key]
+
+def get_master_resume():
+    """
+    Reads the master resume from the Assets folder.
+    Prioritizes .pdf files over .txt files.
+    The extracted text is cached until the file changes.
+    """
+    if not os.path.exists(ASSETS_DIR):
+        return "Assets folder not found."
+
+    text = read_resume_text()
+    if text:
+        return text
+
+    # Fallback to TXT (e.g. the PDF has no extractable text)
+    txt_files = _candidates('*.txt')
     if txt_files:
         with open(txt_files[0], 'r', encoding='utf-8') as f:
             return f.read().strip()
-            
+
     return "Resume not found in Assets folder. Please add a pdf or txt file."
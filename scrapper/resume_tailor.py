@@ -1,9 +1,30 @@
 
 import json
 import os
-from openai import OpenAI
 from fpdf import FPDF
 
+try:
+    from llm import chat, chat_json
+    from prompt_builder import PromptBuilder, PRIORITY_SECTIONS
+    from llm_client import get_client
+except ImportError:
+    from scrapper.llm import chat, chat_json
+    from scrapper.prompt_builder import PromptBuilder, PRIORITY_SECTIONS
+    from scrapper.llm_client import get_client
+
+# Prompt token budgets (see prompt_builder)
+RESUME_TOKENS = 600
+JD_TOKENS = 600
+PARSE_RESUME_TOKENS = 1200
+
+def _resume_and_jd(resume_text, job_description, label):
+    """Resume sections relevant to the JD and JD paragraphs relevant to the resume"""
+    pb = PromptBuilder(RESUME_TOKENS + JD_TOKENS, label=label)
+    resume_part = pb.add('resume', resume_text, RESUME_TOKENS, query=job_description,
+                         priority=PRIORITY_SECTIONS)
+    jd_part = pb.add('job_description', job_description, query=resume_text)
+    return resume_part, jd_part
+
 class ResumeTailor:
     def __init__(self, config_path=None):
         if config_path is None:
@@ -13,10 +34,7 @@ class ResumeTailor:
         with open(config_path, 'r') as f:
             self.config = json.load(f)
             
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=self.config['openrouter_key']
-        )
+        self.client = get_client(self.config)
         self.model = self.config['model']
 
     def analyze_gap(self, resume_text, job_description):
@@ -24,14 +42,15 @@ class ResumeTailor:
         Analyze gaps between resume and job description
         Returns JSON with missing skills and suggested points
         """
+        resume_part, jd_part = _resume_and_jd(resume_text, job_description, 'gap')
         prompt = f"""
         Analyze this Resume against the Job Description (JD).
         
         RESUME:
-        {resume_text[:2000]}
+        {resume_part}
         
         JOB DESCRIPTION:
-        {job_description[:2000]}
+        {jd_part}
         
         Identify:
         1. **Missing Keywords**: Important skills/tools in JD but not in Resume.
@@ -54,23 +73,17 @@ class ResumeTailor:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            return chat_json(
+                self.client,
+                self.model,
                 messages=[
                     {"role": "system", "content": "You are an expert ATS Resume Optimizer."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=1500
+                max_tokens=1500,
+                feature='gap_analysis'
             )
-            
-            content = response.choices[0].message.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-                
-            return json.loads(content)
         except Exception as e:
             # Fallback: Return original resume content wrapped in expected structure
             print(f"Error in gap analysis: {e}")
@@ -89,14 +102,15 @@ class ResumeTailor:
         """
         Generate a tailored cover letter
         """
+        resume_part, jd_part = _resume_and_jd(resume_text, job_description, 'cover_letter')
         prompt = f"""
         Write a punchy, professional Cover Letter for {company_name}.
         
         RESUME:
-        {resume_text[:2000]}
+        {resume_part}
         
         JOB DESCRIPTION:
-        {job_description[:2000]}
+        {jd_part}
         
         Guidelines:
         - Hook the reader in the first sentence.
@@ -109,16 +123,17 @@ class ResumeTailor:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            return chat(
+                self.client,
+                self.model,
                 messages=[
                     {"role": "system", "content": "You are a professional career coach."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=1000
+                max_tokens=1000,
+                feature='cover_letter'
             )
-            return response.choices[0].message.content.strip()
         except Exception as e:
             return f"Error generating cover letter: {str(e)}"
             
@@ -126,11 +141,12 @@ class ResumeTailor:
         """
         Parse raw resume text into structured JSON using AI
         """
+        resume_part = PromptBuilder(PARSE_RESUME_TOKENS, label='parse').add('resume', resume_text)
         prompt = f"""
         You are an expert resume parser. Convert the following resume text into a structured JSON format.
         
         RESUME TEXT:
-        {resume_text[:4000]}
+        {resume_part}
         
         Return ONLY valid JSON with this exact structure:
         {{
@@ -165,18 +181,13 @@ class ResumeTailor:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            return chat_json(
+                self.client,
+                self.model,
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.1
+                temperature=0.1,
+                feature='resume_parse'
             )
-            content = response.choices[0].message.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(content)
         except Exception as e:
             print(f"Error parsing resume: {e}")
             return {}
@@ -0,0 +1,152 @@
+"""
+🧮 SCORE STORE - SCORES KEYED ON THE INPUTS THEY CAME FROM
+Every LLM match score is saved with the resume hash (resume_reader) and the
+job content hash (job_snapshots.content_hash) it was computed from. A score
+is reused while both are unchanged; when either changes it is "stale".
+
+    store = get_score_store()
+    cached = store.lookup(jobs, resume_hash, scope='recommendation')   # None = needs scoring
+    store.save(jobs, results, resume_hash, scope='recommendation', model=models)
+
+Scopes keep the two prompts apart: 'recommendation' (system_recommendation)
+and 'sheet' (ai_processor's MNC-weighted sheet scoring).
+"""
+
+import os
+import time
+import sqlite3
+import threading
+
+try:
+    from job_snapshots import url_key, content_hash
+    from job_record import JobRecord
+except ImportError:
+    from scrapper.job_snapshots import url_key, content_hash
+    from scrapper.job_record import JobRecord
+
+# ========== CONFIGURATION ==========
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCORE_DB = os.path.join(SCRIPT_DIR, 'data', 'job_scores.db')
+
+FRESH, STALE_RESUME, STALE_JOB, MISSING = 'fresh', 'stale_resume', 'stale_job', 'missing'
+
+def job_key(job):
+    """Stable key: the job URL, or title + company when there is none"""
+    url = str(job.get('job_url', '') or '').strip()
+    if url and url.lower() not in ('nan', 'none'):
+        return url_key(url)
+    return url_key(f"{job.get('title', '')}|{job.get('company', '')}")
+
+def sheet_job(row, description=''):
+    """Sheet row (Role/Company/Location/Link...) -> job dict with canonical fields"""
+    job = JobRecord.from_dict(row)
+    if description:
+        job['description'] = description
+    return job
+
+# ========== STORE ==========
+
+class ScoreStore:
+    """SQLite table of the latest score per (job, scope)"""
+
+    def __init__(self, db_path=SCORE_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    job_key INTEGER NOT NULL,
+                    scope TEXT NOT NULL,
+                    job_hash INTEGER NOT NULL,
+                    resume_hash TEXT,
+                    model TEXT,
+                    score INTEGER NOT NULL,
+                    reason TEXT,
+                    scored_at REAL NOT NULL,
+                    PRIMARY KEY (job_key, scope)
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _rows(self, keys, scope):
+        rows = {}
+        keys = list(set(keys))
+        with self._lock, self._connect() as conn:
+            # Chunked IN (...) to stay under SQLite's parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for row in conn.execute(
+                    f"SELECT job_key, job_hash, resume_hash, score, reason FROM scores "
+                    f"WHERE scope = ? AND job_key IN ({placeholders})", [scope] + chunk
+                ):
+                    rows[row[0]] = row[1:]
+        return rows
+
+    def statuses(self, jobs, resume_hash, scope):
+        """[(status, stored (score, reason) or None)] for each job, in order"""
+        keyed = [(job_key(job), content_hash(job)) for job in jobs]
+        rows = self._rows([key for key, _ in keyed], scope)
+        out = []
+        for key, digest in keyed:
+            row = rows.get(key)
+            if row is None:
+                out.append((MISSING, None))
+                continue
+            stored_hash, stored_resume, score, reason = row
+            if stored_hash != digest:
+                status = STALE_JOB
+            elif stored_resume != resume_hash:
+                status = STALE_RESUME
+            else:
+                status = FRESH
+            out.append((status, (score, reason)))
+        return out
+
+    def lookup(self, jobs, resume_hash, scope):
+        """Stored (score, reason) where resume and job are unchanged, else None"""
+        return [stored if status == FRESH else None
+                for status, stored in self.statuses(jobs, resume_hash, scope)]
+
+    def save(self, jobs, results, resume_hash, scope, model=None):
+        """model: the model name, or a list with the model that scored each job"""
+        now = time.time()
+        models = model if isinstance(model, (list, tuple)) else [model] * len(jobs)
+        rows = [
+            (job_key(job), scope, content_hash(job), resume_hash, model, int(score), reason, now)
+            for job, (score, reason), model in zip(jobs, results, models) if score is not None
+        ]
+        if not rows:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO scores "
+                "(job_key, scope, job_hash, resume_hash, model, score, reason, scored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def stats(self, resume_hash=None):
+        with self._lock, self._connect() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            current = conn.execute(
+                "SELECT COUNT(*) FROM scores WHERE resume_hash = ?", (resume_hash,)
+            ).fetchone()[0]
+        return {'scores': total, 'current_resume': current, 'stale_resume': total - current}
+
+# ========== SHARED INSTANCE ==========
+
+_default_store = None
+_default_lock = threading.Lock()
+
+def get_score_store():
+    """Process-wide score store"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ScoreStore()
+        return _default_store
@@ -0,0 +1,108 @@
+"""
+⚡ SCORING EXECUTOR - BOUNDED-PARALLEL ASYNC LLM CALLS
+Runs many scoring requests in flight at once with an AsyncOpenAI client:
+- at most `concurrency` requests outstanding (asyncio.Semaphore), within
+  the process-wide limit of llm_client
+- a 429 pauses ALL LLM callers (shared llm_client gate) for Retry-After
+  seconds, then the call is retried
+- results come back in input order, whatever order the replies arrive in
+
+Usage:
+    executor = ScoringExecutor(make_client, concurrency=8)
+    results = executor.map(score_one, jobs)   # score_one(client, job) is async
+"""
+
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from llm_metrics import current_attempt
+    from llm_client import get_gate, is_rate_limit, retry_after
+except ImportError:
+    from scrapper.llm_metrics import current_attempt
+    from scrapper.llm_client import get_gate, is_rate_limit, retry_after
+
+# ========== CONFIGURATION ==========
+
+DEFAULT_CONCURRENCY = 8      # Requests in flight at once
+MAX_RETRIES = 4              # Retries per item after a 429
+DEFAULT_PAUSE = 10           # Seconds to back off when a 429 has no Retry-After
+MAX_PAUSE = 120
+
+# ========== EXECUTOR ==========
+
+class ScoringExecutor:
+    """Map an async scoring function over items with bounded concurrency"""
+
+    def __init__(self, make_client, concurrency=DEFAULT_CONCURRENCY, max_retries=MAX_RETRIES):
+        self.make_client = make_client
+        self.concurrency = max(1, int(concurrency))
+        self.max_retries = max_retries
+        self.stats = {'calls': 0, 'rate_limited': 0, 'failed': 0}
+
+    async def _run_one(self, fn, client, item, semaphore, gate):
+        attempt = 0
+        while True:
+            # Honour a pause set by any caller that hit a 429
+            delay = gate.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with semaphore:
+                try:
+                    self.stats['calls'] += 1
+                    current_attempt.set(attempt)
+                    return await fn(client, item)
+                except Exception as e:
+                    if not is_rate_limit(e) or attempt >= self.max_retries:
+                        self.stats['failed'] += 1
+                        raise
+                    attempt += 1
+                    self.stats['rate_limited'] += 1
+                    if gate.delay() <= 0:
+                        # Not already paused by the client pool
+                        pause = retry_after(e) or min(MAX_PAUSE, DEFAULT_PAUSE * (2 ** (attempt - 1)))
+                        gate.pause(pause * random.uniform(1.0, 1.2))
+
+    async def _map(self, fn, items, on_error):
+        client = self.make_client()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        gate = get_gate()
+        try:
+            results = await asyncio.gather(
+                *(self._run_one(fn, client, item, semaphore, gate) for item in items),
+                return_exceptions=True
+            )
+        finally:
+            close = getattr(client, 'close', None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception:
+                    pass
+
+        ordered = []
+        for item, result in zip(items, results):
+            if isinstance(result, BaseException):
+                ordered.append(on_error(item, result) if on_error else None)
+            else:
+                ordered.append(result)
+        return ordered
+
+    def map(self, fn, items, on_error=None):
+        """
+        Run fn(client, item) for every item. Returns results in input order.
+        on_error(item, exception) supplies the result for items that failed
+        (default None).
+        """
+        items = list(items)
+        if not items:
+            return []
+        coro = self._map(fn, items, on_error)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # Already inside an event loop (e.g. a notebook): run on a helper thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
@@ -0,0 +1,291 @@
+"""
+🔎 JOB SEARCH INDEX - SQLITE FTS5
+Full-text index over every stored job (title, company, description) with
+BM25 ranking, prefix matching and location / work-mode / source filters.
+Queries over tens of thousands of jobs return in milliseconds, instead of
+running str.contains over a DataFrame on every Streamlit rerun.
+
+Falls back to LIKE matching if the local SQLite build has no FTS5.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+# ========== CONFIGURATION ==========
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SEARCH_DB = os.path.join(SCRIPT_DIR, 'data', 'job_search.db')
+
+# BM25 column weights: title, company, description
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+INDEXED_FIELDS = ['job_url', 'title', 'company', 'location', 'work_mode', 'source', 'description']
+
+STOPWORDS = {
+    'a', 'an', 'and', 'the', 'for', 'of', 'in', 'on', 'at', 'to', 'with', 'as', 'or',
+    'i', 'im', 'am', 'me', 'my', 'looking', 'want', 'need', 'find', 'job', 'jobs',
+    'role', 'roles', 'position', 'positions', 'opening', 'openings', 'some', 'any'
+}
+
+_TERM = re.compile(r'[a-z0-9+#.]+')
+
+def query_terms(query):
+    """Lowercase word terms of a free-text query, minus stopwords"""
+    terms = [t.strip('.') for t in _TERM.findall(str(query or '').lower())]
+    return [t for t in terms if t and t not in STOPWORDS]
+
+def _clean(value):
+    if value is None:
+        return ''
+    text = str(value).strip()
+    return '' if text.lower() in ('nan', 'none', 'nat') else text
+
+# ========== INDEX ==========
+
+class JobSearchIndex:
+    """Persistent (or ':memory:') full-text index of jobs keyed by job_url"""
+
+    def __init__(self, db_path=SEARCH_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.has_fts = self._create_schema()
+
+    def _create_schema(self):
+        conn = self._conn
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                job_url TEXT UNIQUE NOT NULL,
+                title TEXT, company TEXT, location TEXT,
+                work_mode TEXT, source TEXT, description TEXT,
+                indexed_at TEXT
+            )
+        """)
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                    title, company, description,
+                    content='jobs', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+
+        # Keep the FTS table in sync with the jobs table
+        conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts(rowid, title, company, description)
+                VALUES (new.id, new.title, new.company, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description)
+                VALUES ('delete', old.id, old.title, old.company, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description)
+                VALUES ('delete', old.id, old.title, old.company, old.description);
+                INSERT INTO jobs_fts(rowid, title, company, description)
+                VALUES (new.id, new.title, new.company, new.description);
+            END;
+        """)
+        conn.commit()
+        return True
+
+    def index_jobs(self, jobs):
+        """Insert or update jobs (DataFrame, list of dicts). Returns rows written."""
+        if hasattr(jobs, 'to_dict'):
+            jobs = jobs.to_dict('records')
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = []
+        for job in jobs:
+            job_url = _clean(job.get('job_url', ''))
+            if not job_url or job_url == '#':
+                continue
+            rows.append(tuple(_clean(job.get(field, '')) for field in INDEXED_FIELDS) + (now,))
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO jobs (job_url, title, company, location, work_mode, source, description, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_url) DO UPDATE SET
+                    title = excluded.title, company = excluded.company,
+                    location = excluded.location, work_mode = excluded.work_mode,
+                    source = excluded.source,
+                    description = CASE WHEN excluded.description != '' THEN excluded.description
+                                       ELSE jobs.description END,
+                    indexed_at = excluded.indexed_at
+                WHERE jobs.title IS NOT excluded.title OR jobs.company IS NOT excluded.company
+                   OR jobs.location IS NOT excluded.location OR jobs.work_mode IS NOT excluded.work_mode
+                   OR jobs.source IS NOT excluded.source
+                   OR (excluded.description != '' AND jobs.description IS NOT excluded.description)
+            """, rows)
+            self._conn.commit()
+        return len(rows)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def search(self, query='', location=None, work_modes=None, remote_only=False,
+               sources=None, match='all', limit=50, job_urls=None):
+        """
+        Ranked search. Every query term is prefix-matched ("pyth" finds "python").
+
+        Args:
+            query: Free text; stopwords are ignored
+            location: Substring filter on location (e.g. "Bangalore")
+            work_modes: Only these work modes (e.g. ["Remote", "Hybrid"])
+            remote_only: Location or work mode mentions remote
+            sources: Only these sources
+            match: 'all' terms (AND) or 'any' term (OR, best matches first)
+            job_urls: Only rank these jobs (e.g. the rows currently on screen),
+                so the rest of the archive can't push them past the limit
+        Returns list of dicts (best first) with a 'rank' key (lower is better).
+        """
+        terms = query_terms(query)
+        where, params = [], []
+
+        if location:
+            where.append("j.location LIKE ?")
+            params.append(f"%{location}%")
+        if work_modes:
+            where.append(f"j.work_mode IN ({','.join('?' * len(work_modes))})")
+            params.extend(work_modes)
+        if remote_only:
+            where.append("(j.location LIKE '%remote%' OR j.work_mode = 'Remote')")
+        if sources:
+            where.append(f"j.source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        if job_urls is not None:
+            where.append("j.job_url IN (SELECT job_url FROM temp.search_scope)")
+
+        columns = ', '.join(f"j.{field}" for field in INDEXED_FIELDS)
+
+        if terms and self.has_fts:
+            joiner = ' AND ' if match == 'all' else ' OR '
+            fts_query = joiner.join('"' + term.replace('"', '') + '"*' for term in terms)
+            weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+            sql = (f"SELECT {columns}, bm25(jobs_fts, {weights}) AS rank "
+                   f"FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid "
+                   f"WHERE jobs_fts MATCH ?")
+            params = [fts_query] + params
+            if where:
+                sql += " AND " + " AND ".join(where)
+            sql += " ORDER BY rank LIMIT ?"
+        else:
+            term_clauses = []
+            for term in terms:
+                term_clauses.append("(j.title LIKE ? OR j.company LIKE ? OR j.description LIKE ?)")
+                params.extend([f"%{term}%"] * 3)
+            if term_clauses:
+                where.append('(' + (' AND ' if match == 'all' else ' OR ').join(term_clauses) + ')')
+            sql = f"SELECT {columns}, 0 AS rank FROM jobs j"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY j.indexed_at DESC LIMIT ?"
+        params.append(int(limit))
+
+        with self._lock:
+            if job_urls is not None:
+                self._set_scope(job_urls)
+            cursor = self._conn.execute(sql, params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def _set_scope(self, job_urls):
+        """Fill the connection's temp table of URLs a search is restricted to"""
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS search_scope (job_url TEXT PRIMARY KEY)")
+        self._conn.execute("DELETE FROM temp.search_scope")
+        self._conn.executemany("INSERT OR IGNORE INTO temp.search_scope VALUES (?)",
+                               ((_clean(url),) for url in job_urls))
+
+    def changes_since(self, max_id=0, since=''):
+        """Rows added after id max_id or re-indexed at or after `since` (for derived indexes)"""
+        columns = ', '.join(['id'] + INDEXED_FIELDS + ['indexed_at'])
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT {columns} FROM jobs WHERE id > ? OR indexed_at >= ? ORDER BY id",
+                (int(max_id), since or '')
+            )
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def version(self):
+        """(max id, latest indexed_at) - changes whenever jobs are added or updated"""
+        with self._lock:
+            max_id, latest = self._conn.execute(
+                "SELECT COALESCE(MAX(id), 0), COALESCE(MAX(indexed_at), '') FROM jobs"
+            ).fetchone()
+        return int(max_id), latest
+
+    def fetch(self, ids):
+        """Jobs by row id, as {id: dict}"""
+        ids = [int(i) for i in ids]
+        columns = ', '.join(['id'] + INDEXED_FIELDS)
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                cursor = self._conn.execute(
+                    f"SELECT {columns} FROM jobs WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                )
+                names = [d[0] for d in cursor.description]
+                for row in cursor.fetchall():
+                    found[row[0]] = dict(zip(names, row))
+        return found
+
+    def ids_where(self, locations=None, work_modes=None, remote_only=False):
+        """
+        Row ids passing the filters:
+            locations: any of these substrings in the location
+            work_modes: work_mode in these (case-insensitive; blank modes pass)
+            remote_only: location or work mode says remote ('International' = remote abroad)
+        """
+        where, params = [], []
+        if locations:
+            where.append('(' + ' OR '.join('location LIKE ?' for _ in locations) + ')')
+            params.extend(f"%{location}%" for location in locations)
+        if work_modes:
+            where.append(f"(COALESCE(work_mode, '') = '' OR LOWER(work_mode) IN ({','.join('?' * len(work_modes))}))")
+            params.extend(mode.lower() for mode in work_modes)
+        if remote_only:
+            where.append("(location LIKE '%remote%' OR LOWER(work_mode) IN ('remote', 'international'))")
+        sql = "SELECT id FROM jobs" + (" WHERE " + " AND ".join(where) if where else "")
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+# ========== HELPERS ==========
+
+_default_index = None
+_default_lock = threading.Lock()
+
+def get_index():
+    """Process-wide persistent index"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = JobSearchIndex()
+        return _default_index
+
+def rank_jobs(jobs, query, match='any', limit=1000, **filters):
+    """
+    Rank an ad-hoc list of job dicts against a query with a throwaway
+    in-memory index. Returns the matching jobs, best first.
+    """
+    jobs = list(jobs)
+    if not query_terms(query):
+        return jobs
+    index = JobSearchIndex(':memory:')
+    index.index_jobs(jobs)
+    by_url = {_clean(job.get('job_url', '')): job for job in jobs}
+    hits = index.search(query, match=match, limit=limit, **filters)
+    return [by_url[hit['job_url']] for hit in hits if hit['job_url'] in by_url]
@@ -0,0 +1,274 @@
+"""
+🧭 SEMANTIC JOB INDEX - HASHED N-GRAM VECTORS, MEMORY-MAPPED
+Natural-language search over every stored job (the search_index corpus)
+without calling a scraper or an API:
+- each job becomes a 512-dim signed feature-hashing vector of its words,
+  word bigrams and title sub-word trigrams (title weighted x3), L2-normalized
+- queries are expanded with a small career vocabulary ("ai" -> machine
+  learning, "1 year experience" -> junior / entry level, ...) and hashed
+  the same way
+- vectors live in data/semantic_index/vectors.npy (float16) and are opened
+  with np.load(mmap_mode='r'), so a search is one matrix-vector product
+
+The index follows the search DB incrementally: only jobs added or changed
+since the last refresh are vectorized.
+
+    hits = get_semantic_index().search("AI jobs for 1 year experience", limit=30)
+"""
+
+import os
+import re
+import json
+import zlib
+import threading
+import numpy as np
+
+try:
+    from search_index import get_index
+    from job_router import REMOTE_MODES
+except ImportError:
+    from scrapper.search_index import get_index
+    from scrapper.job_router import REMOTE_MODES
+
+# ========== CONFIGURATION ==========
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_DIR = os.path.join(SCRIPT_DIR, 'data', 'semantic_index')
+
+DIM = 512                    # Vector size (power of two)
+TITLE_WEIGHT = 3.0
+DESC_CHARS = 1500            # Only the start of long descriptions is embedded
+
+# City filter -> spellings postings use
+LOCATION_ALIASES = {
+    'bangalore': ['bangalore', 'bengaluru'],
+    'bengaluru': ['bangalore', 'bengaluru'],
+    'gurgaon': ['gurgaon', 'gurugram'],
+    'gurugram': ['gurgaon', 'gurugram'],
+    'mumbai': ['mumbai', 'bombay'],
+    'chennai': ['chennai', 'madras'],
+    'kolkata': ['kolkata', 'calcutta'],
+    'delhi': ['delhi', 'new delhi'],
+}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'the', 'for', 'of', 'in', 'on', 'at', 'to', 'with', 'as', 'or', 'is',
+    'are', 'be', 'will', 'you', 'your', 'we', 'our', 'this', 'that', 'by', 'from', 'it',
+    'i', 'im', 'am', 'me', 'my', 'looking', 'want', 'need', 'find', 'job', 'jobs', 'role',
+    'roles', 'position', 'opening', 'openings', 'some', 'any', 'who', 'can', 'have', 'has'
+}
+
+# Query phrase -> terms that postings actually use
+EXPANSIONS = [
+    (r'\b(?:ai|a\.i\.)\b', 'machine learning deep learning artificial intelligence ml'),
+    (r'\bml\b', 'machine learning'),
+    (r'\bgen ?ai\b|\bgenerative\b', 'generative ai llm'),
+    (r'\bdata\b', 'data analytics'),
+    (r'\bfresher|\bfresh graduate|\bnew grad', 'entry level junior graduate associate'),
+    (r'\b(?:0|1|one)\s*(?:\+\s*)?(?:years?|yrs?)\b', 'junior entry level associate'),
+    (r'\b(?:2|3|two|three)\s*(?:\+\s*)?(?:years?|yrs?)\b', 'mid level engineer ii'),
+    (r'\bintern(?:ship)?s?\b', 'intern internship trainee'),
+    (r'\bremote\b|\bwfh\b|work from home', 'remote anywhere distributed'),
+    (r'\bfront ?end\b', 'frontend react javascript ui'),
+    (r'\bback ?end\b', 'backend api server'),
+    (r'\bfull ?stack\b', 'full stack frontend backend'),
+    (r'\bdevops\b', 'devops cloud kubernetes infrastructure'),
+    (r'\bsde\b', 'software development engineer'),
+    (r'\bswe\b', 'software engineer'),
+]
+_EXPANSIONS = [(re.compile(pattern), terms) for pattern, terms in EXPANSIONS]
+
+_WORD = re.compile(r'[a-z0-9+#]+')
+_HTML_TAG = re.compile(r'<[^>]+>')
+
+# ========== VECTORS ==========
+
+def _words(text):
+    text = _HTML_TAG.sub(' ', str(text or '')).lower()
+    return [w for w in _WORD.findall(text) if w not in STOPWORDS and len(w) > 1]
+
+def _features(text, subwords=False):
+    words = _words(text)
+    feats = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if subwords:
+        # Trigrams of padded words: "developer" ~ "development", "python" ~ "python3"
+        feats += [f"#{w[i:i + 3]}" for w in (f"<{w}>" for w in words) for i in range(len(w) - 2)]
+    return feats
+
+def _accumulate(vec, feats, weight):
+    if not feats:
+        return
+    hashes = np.fromiter((zlib.crc32(f.encode('utf-8')) for f in feats), dtype=np.uint32, count=len(feats))
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+    vec += np.bincount(hashes & (DIM - 1), weights=signs * weight, minlength=DIM)
+
+def _normalize(vec):
+    # Sublinear term weighting, then unit length for cosine scores
+    vec = np.sign(vec) * np.log1p(np.abs(vec))
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+def job_vector(job):
+    vec = np.zeros(DIM)
+    _accumulate(vec, _features(job.get('title', ''), subwords=True), TITLE_WEIGHT)
+    _accumulate(vec, _features(job.get('company', '')), 1.0)
+    _accumulate(vec, _features(str(job.get('description', '') or '')[:DESC_CHARS]), 1.0)
+    return _normalize(vec)
+
+def location_variants(location):
+    location = str(location or '').strip()
+    return LOCATION_ALIASES.get(location.lower(), [location]) if location else []
+
+def mode_variants(work_modes):
+    """Selected work modes as stored values ('Remote' also covers 'International')"""
+    modes = {str(m).lower() for m in (work_modes or [])}
+    if modes & REMOTE_MODES:
+        modes |= REMOTE_MODES
+    return sorted(modes)
+
+def expand_query(query):
+    text = str(query or '').lower()
+    extra = [terms for pattern, terms in _EXPANSIONS if pattern.search(text)]
+    return ' '.join([text] + extra)
+
+def query_vector(query):
+    vec = np.zeros(DIM)
+    expanded = expand_query(query)
+    _accumulate(vec, _features(expanded, subwords=True), 1.0)
+    return _normalize(vec)
+
+# ========== INDEX ==========
+
+class SemanticIndex:
+    """Dense vectors for every job in the search DB, keyed by its row id"""
+
+    def __init__(self, index_dir=INDEX_DIR, source=None):
+        self.index_dir = index_dir
+        self.source = source
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._ids = None
+        self._meta = None
+
+    @property
+    def _source(self):
+        return self.source or get_index()
+
+    def _paths(self):
+        return (os.path.join(self.index_dir, 'vectors.npy'),
+                os.path.join(self.index_dir, 'ids.npy'),
+                os.path.join(self.index_dir, 'meta.json'))
+
+    def _load(self):
+        if self._meta is not None:
+            return
+        vectors_path, ids_path, meta_path = self._paths()
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('dim') != DIM:
+                raise ValueError("dimension changed")
+            self._vectors = np.load(vectors_path, mmap_mode='r')
+            self._ids = np.load(ids_path)
+            self._meta = meta
+        except (OSError, ValueError):
+            self._vectors = np.zeros((0, DIM), dtype=np.float16)
+            self._ids = np.zeros(0, dtype=np.int64)
+            self._meta = {'dim': DIM, 'max_id': 0, 'indexed_at': ''}
+
+    def _save(self, vectors, ids, meta):
+        os.makedirs(self.index_dir, exist_ok=True)
+        vectors_path, ids_path, meta_path = self._paths()
+        # Write aside and swap, so readers never see a half-written matrix
+        for path, array in ((vectors_path, vectors), (ids_path, ids)):
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, array)
+            os.replace(path + '.tmp', path)
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+        self._vectors = np.load(vectors_path, mmap_mode='r')
+        self._ids = ids
+        self._meta = meta
+
+    def refresh(self):
+        """Vectorize jobs added / changed since the last refresh. Returns jobs embedded."""
+        with self._lock:
+            self._load()
+            max_id, latest = self._source.version()
+            if (max_id, latest) == (self._meta['max_id'], self._meta['indexed_at']):
+                return 0
+
+            changed = self._source.changes_since(self._meta['max_id'], self._meta['indexed_at'])
+            if not changed:
+                return 0
+            new_ids = np.array([job['id'] for job in changed], dtype=np.int64)
+            new_vectors = np.vstack([job_vector(job) for job in changed]).astype(np.float16)
+
+            # Changed jobs overwrite their row, new jobs are appended (ids stay sorted)
+            vectors = np.array(self._vectors)
+            ids = self._ids
+            positions = np.searchsorted(ids, new_ids)
+            existing = (positions < len(ids)) & (ids[np.minimum(positions, len(ids) - 1)] == new_ids) \
+                if len(ids) else np.zeros(len(new_ids), dtype=bool)
+            vectors[positions[existing]] = new_vectors[existing]
+            vectors = np.vstack([vectors, new_vectors[~existing]])
+            ids = np.concatenate([ids, new_ids[~existing]])
+            order = np.argsort(ids, kind='stable')
+
+            self._save(vectors[order], ids[order],
+                       {'dim': DIM, 'max_id': max_id, 'indexed_at': latest, 'count': int(len(ids))})
+            return len(changed)
+
+    def count(self):
+        with self._lock:
+            self._load()
+            return len(self._ids)
+
+    def search(self, query, limit=50, location=None, work_modes=None, remote_only=False):
+        """
+        Jobs most similar to a free-text query, best first, each with a
+        'similarity' key (cosine, 0-1). location is a city (spelling variants
+        included), work_modes a list like ["Remote", "Hybrid"]. Filters are
+        applied before ranking, so a narrow filter still gets `limit` hits.
+        """
+        self.refresh()
+        allowed = None
+        if location or work_modes or remote_only:
+            allowed = self._source.ids_where(location_variants(location), mode_variants(work_modes), remote_only)
+        with self._lock:
+            if not len(self._ids) or not str(query or '').strip():
+                return []
+            scores = np.asarray(self._vectors @ query_vector(query).astype(np.float16), dtype=np.float32)
+            ids = self._ids
+
+        if allowed is not None:
+            scores[~np.isin(ids, np.asarray(allowed, dtype=np.int64))] = 0
+        top = min(int(np.count_nonzero(scores > 0)), limit)
+        if not top:
+            return []
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        rows = self._source.fetch(ids[best])
+
+        hits = []
+        for position in best:
+            job = rows.get(int(ids[position]))
+            if job is None:
+                continue
+            job['similarity'] = round(float(scores[position]), 3)
+            hits.append(job)
+        return hits
+
+# ========== SHARED INSTANCE ==========
+
+_default_index = None
+_default_lock = threading.Lock()
+
+def get_semantic_index():
+    """Process-wide semantic index over the search DB"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = SemanticIndex()
+        return _default_index
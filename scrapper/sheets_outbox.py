@@ -0,0 +1,369 @@
+"""
+📮 SHEETS OUTBOX - DURABLE WRITE-AHEAD QUEUE FOR GOOGLE SHEETS
+Pipeline stages commit rows to a local SQLite outbox and return immediately.
+A background flusher drains the outbox to Google Sheets in batches with
+retry + exponential backoff, so a slow or over-quota Sheets API never loses
+a scan's results.
+
+Idempotency: each row carries a key (the job URL). Only one pending row per
+key is kept locally, and before appending the flusher skips keys that are
+already present in the sheet's Link column - a crash between "append" and
+"mark sent" can't create duplicates. A sheet whose Link column can't be read
+is not written to in that pass.
+
+Rows that keep failing are moved to a 'dead' state after MAX_ATTEMPTS
+(see dead_count / retry_dead) instead of being retried forever. A missing
+google_key.json (or gspread) isn't a delivery attempt: rows just wait.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import hashlib
+
+try:
+    from sheets_scheduler import get_scheduler
+except ImportError:
+    from scrapper.sheets_scheduler import get_scheduler
+
+# ========== CONFIGURATION ==========
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTBOX_DB = os.path.join(SCRIPT_DIR, 'data', 'sheets_outbox.db')
+
+SPREADSHEET_NAME = 'Ai Job Tracker'
+CATEGORY_SHEETS = ['Direct_Portals', 'International_Remote', 'Indian_Remote',
+                   'Indian_Onsite', 'Career_Portals']
+KEY_COLUMN = 'Link'          # Header of the column holding the idempotency key
+
+BATCH_SIZE = 50              # Rows per append_rows call
+BASE_BACKOFF = 5             # Seconds before the first retry
+MAX_BACKOFF = 300            # Cap on the retry delay
+MAX_ATTEMPTS = 8             # Failed deliveries before a row is dead-lettered
+DRAIN_TIMEOUT = 20           # Default seconds drain() waits at process exit
+FLUSH_INTERVAL = 5           # Seconds between background flush passes
+SENT_RETENTION_DAYS = 7      # Delivered rows are purged after this
+
+def open_default_spreadsheet():
+    """Open the 'Ai Job Tracker' spreadsheet with the service account key"""
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    credentials_file = os.path.join(SCRIPT_DIR, 'google_key.json')
+    if not os.path.exists(credentials_file):
+        raise FileNotFoundError(f"google_key.json not found at {credentials_file}")
+
+    scope = ['https://spreadsheets.google.com/feeds',
+             'https://www.googleapis.com/auth/drive']
+    creds = ServiceAccountCredentials.from_json_keyfile_name(credentials_file, scope)
+    return gspread.authorize(creds).open(SPREADSHEET_NAME)
+
+def _retry_after(error):
+    """Seconds from a Retry-After header on a gspread APIError, if any"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+def _is_setup_error(error):
+    """Missing google_key.json / gspread: no delivery was actually attempted"""
+    return isinstance(error, (FileNotFoundError, ImportError))
+
+# ========== OUTBOX ==========
+
+class SheetsOutbox:
+    """SQLite-backed outbox of rows waiting to be appended to worksheets"""
+
+    def __init__(self, db_path=OUTBOX_DB, open_spreadsheet=open_default_spreadsheet,
+                 dedupe_worksheets=CATEGORY_SHEETS):
+        self.db_path = db_path
+        self.open_spreadsheet = open_spreadsheet
+        self.dedupe_worksheets = list(dedupe_worksheets)
+        self._spreadsheet = None
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    worksheet TEXT NOT NULL,
+                    row_json TEXT NOT NULL,
+                    idem_key TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                )
+            """)
+            # One pending row per key; delivered keys may be queued again
+            # (e.g. after clear_sheets wiped the sheet)
+            conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_outbox_pending_key
+                ON outbox(idem_key) WHERE status = 'pending'
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    # ---------- producer side ----------
+
+    @staticmethod
+    def make_key(row, key=None):
+        """Use the given key (job URL) or a hash of the row contents"""
+        key = str(key or '').strip()
+        if key and key != '#':
+            return key
+        return 'row:' + hashlib.sha1(json.dumps(row, default=str).encode('utf-8')).hexdigest()
+
+    def enqueue(self, worksheet, row, key=None):
+        """Durably queue one row. Returns False if the key is already pending."""
+        return self.enqueue_many([(worksheet, row, key)]) == 1
+
+    def enqueue_many(self, items):
+        """Queue [(worksheet, row, key)] in one transaction. Returns rows queued."""
+        now = time.time()
+        queued = 0
+        with self._connect() as conn:
+            for worksheet, row, key in items:
+                row = ['' if v is None else v for v in row]
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO outbox (worksheet, row_json, idem_key, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (worksheet, json.dumps(row, default=str), self.make_key(row, key), now)
+                )
+                queued += cursor.rowcount
+        self._wake.set()
+        return queued
+
+    def pending_count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def dead_count(self):
+        """Rows that gave up after MAX_ATTEMPTS failed deliveries"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'dead'").fetchone()[0]
+
+    def retry_dead(self):
+        """Queue dead-lettered rows again (e.g. after fixing the sheet). Returns rows requeued."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE OR IGNORE outbox SET status = 'pending', attempts = 0, next_attempt_at = 0 "
+                "WHERE status = 'dead'"
+            )
+            requeued = cursor.rowcount
+        self._wake.set()
+        return requeued
+
+    # ---------- consumer side ----------
+
+    def _get_spreadsheet(self):
+        if self._spreadsheet is None:
+            self._spreadsheet = self.open_spreadsheet()
+        return self._spreadsheet
+
+    def _existing_keys(self, spreadsheet, worksheet_names):
+        """
+        Collect values of the Link column across the given worksheets.
+        Returns (keys, {worksheet: error}) for the sheets that couldn't be read.
+        """
+        scheduler = get_scheduler()
+        keys = set()
+        unreadable = {}
+        for name in worksheet_names:
+            try:
+                worksheet = scheduler.read(spreadsheet.worksheet, name)
+                headers = scheduler.read(worksheet.row_values, 1)
+                if KEY_COLUMN not in headers:
+                    continue
+                values = scheduler.read(worksheet.col_values, headers.index(KEY_COLUMN) + 1)
+                keys.update(str(v).strip() for v in values[1:] if str(v).strip())
+            except Exception as e:
+                unreadable[name] = e
+        return keys, unreadable
+
+    def _mark_sent(self, conn, ids):
+        conn.executemany(
+            "UPDATE outbox SET status = 'sent', sent_at = ?, last_error = NULL WHERE id = ?",
+            [(time.time(), row_id) for row_id in ids]
+        )
+
+    def _postpone(self, conn, ids, error):
+        """Retry after MAX_BACKOFF without counting an attempt"""
+        conn.executemany(
+            "UPDATE outbox SET next_attempt_at = ?, last_error = ? WHERE id = ?",
+            [(time.time() + MAX_BACKOFF, str(error)[:500], row_id) for row_id in ids]
+        )
+
+    def _mark_retry(self, conn, ids, error):
+        """Back off the rows; after MAX_ATTEMPTS they are dead-lettered. Returns rows given up on."""
+        retry_after = _retry_after(error)
+        dead = 0
+        for row_id in ids:
+            attempts = conn.execute("SELECT attempts FROM outbox WHERE id = ?", (row_id,)).fetchone()[0] + 1
+            delay = retry_after or min(MAX_BACKOFF, BASE_BACKOFF * (2 ** (attempts - 1)))
+            delay *= random.uniform(0.8, 1.2)
+            status = 'dead' if attempts >= MAX_ATTEMPTS else 'pending'
+            dead += status == 'dead'
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (status, attempts, time.time() + delay, str(error)[:500], row_id)
+            )
+        if dead:
+            print(f"   ❌ Outbox: gave up on {dead} rows after {MAX_ATTEMPTS} attempts ({error})")
+        return dead
+
+    def flush(self):
+        """
+        One pass over due rows. Returns the number of rows delivered
+        (rows already present in the sheet count as delivered).
+        """
+        with self._flush_lock:
+            with self._connect() as conn:
+                due = conn.execute(
+                    "SELECT id, worksheet, row_json, idem_key FROM outbox "
+                    "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id",
+                    (time.time(),)
+                ).fetchall()
+            if not due:
+                return 0
+
+            try:
+                spreadsheet = self._get_spreadsheet()
+            except Exception as e:
+                with self._connect() as conn:
+                    if _is_setup_error(e):
+                        # Nothing was attempted - wait for the setup to be fixed without
+                        # spending the rows' attempts (they'd be dead-lettered unsent)
+                        self._postpone(conn, [row[0] for row in due], e)
+                    else:
+                        self._mark_retry(conn, [row[0] for row in due], e)
+                print(f"   ⚠️ Outbox: could not open spreadsheet ({e}); will retry")
+                return 0
+
+            by_worksheet = {}
+            for row_id, worksheet, row_json, key in due:
+                by_worksheet.setdefault(worksheet, []).append((row_id, json.loads(row_json), key))
+
+            check_names = set(self.dedupe_worksheets) | set(by_worksheet)
+            existing, unreadable = self._existing_keys(spreadsheet, check_names)
+
+            delivered = 0
+            for worksheet_name, entries in by_worksheet.items():
+                # Without the sheet's keys we can't tell what's already there - skip it this pass
+                if worksheet_name in unreadable:
+                    error = unreadable[worksheet_name]
+                    with self._connect() as conn:
+                        self._mark_retry(conn, [e[0] for e in entries], error)
+                    print(f"   ⚠️ Outbox: could not read {worksheet_name} ({error}); will retry")
+                    continue
+
+                already = [e[0] for e in entries if e[2] in existing]
+                fresh = []
+                for entry in entries:
+                    if entry[2] in existing:
+                        continue
+                    existing.add(entry[2])  # also drops duplicates inside this pass
+                    fresh.append(entry)
+                with self._connect() as conn:
+                    self._mark_sent(conn, already)
+                delivered += len(already)
+
+                for start in range(0, len(fresh), BATCH_SIZE):
+                    batch = fresh[start:start + BATCH_SIZE]
+                    ids = [e[0] for e in batch]
+                    try:
+                        worksheet = get_scheduler().read(spreadsheet.worksheet, worksheet_name)
+                        get_scheduler().write(worksheet.append_rows, [e[1] for e in batch])
+                        with self._connect() as conn:
+                            self._mark_sent(conn, ids)
+                        delivered += len(batch)
+                    except Exception as e:
+                        with self._connect() as conn:
+                            self._mark_retry(conn, [e_[0] for e_ in fresh[start:]], e)
+                        print(f"   ⚠️ Outbox: append to {worksheet_name} failed ({e}); will retry")
+                        break
+
+            self._purge_sent()
+            return delivered
+
+    def _purge_sent(self):
+        cutoff = time.time() - SENT_RETENTION_DAYS * 86400
+        with self._connect() as conn:
+            conn.execute("DELETE FROM outbox WHERE status = 'sent' AND sent_at < ?", (cutoff,))
+
+    # ---------- background flusher ----------
+
+    def start_background(self, interval=FLUSH_INTERVAL):
+        """Start a daemon thread that keeps draining the outbox"""
+        if self._thread and self._thread.is_alive():
+            self._wake.set()
+            return self._thread
+
+        def _loop():
+            while True:
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"   ⚠️ Outbox flusher error: {e}")
+                self._wake.wait(interval)
+                self._wake.clear()
+
+        self._thread = threading.Thread(target=_loop, name='sheets-outbox', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _next_attempt_at(self):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    def drain(self, timeout=DRAIN_TIMEOUT):
+        """
+        Flush until empty or timeout. Returns rows still pending.
+        Returns right away when the spreadsheet can't be opened, or when the
+        next retry is due after the deadline - the rows stay queued for the
+        next run instead of blocking the exit.
+        """
+        deadline = time.time() + timeout
+        while True:
+            if self.pending_count() == 0:
+                return 0
+            try:
+                self._get_spreadsheet()
+            except Exception as e:
+                print(f"   ⚠️ Outbox: Google Sheets unavailable ({e}); rows stay queued")
+                return self.pending_count()
+
+            self.flush()
+            next_attempt = self._next_attempt_at()
+            if next_attempt is None:
+                return 0
+            if next_attempt > deadline or time.time() >= deadline:
+                return self.pending_count()
+            time.sleep(min(FLUSH_INTERVAL, max(0, next_attempt - time.time())))
+
+# ========== SHARED INSTANCE ==========
+
+_default_outbox = None
+_default_lock = threading.Lock()
+
+def get_outbox():
+    """Process-wide outbox instance"""
+    global _default_outbox
+    with _default_lock:
+        if _default_outbox is None:
+            _default_outbox = SheetsOutbox()
+        return _default_outbox
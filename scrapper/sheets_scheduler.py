@@ -0,0 +1,207 @@
+"""
+🚦 SHEETS REQUEST SCHEDULER - QUOTA-AWARE, PRIORITIZED, COALESCING
+Google Sheets allows ~60 read and ~60 write requests per minute per user.
+Every Sheets call in this process goes through one scheduler that:
+- tracks consumption in a sliding 60s window per kind (read/write)
+- lets interactive dashboard reads jump ahead of background work and keeps
+  a small reserve of quota that only interactive calls may use
+- coalesces identical in-flight reads (e.g. several sessions loading the
+  same worksheet) into a single API request
+- pauses a kind after a 429 and retries, instead of fixed sleeps
+
+headroom() exposes the remaining quota for the dashboard.
+Note: quotas are tracked per process (dashboard and CLI scans count separately).
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+# ========== CONFIGURATION ==========
+
+READ_QUOTA_PER_MINUTE = 60
+WRITE_QUOTA_PER_MINUTE = 60
+WINDOW_SECONDS = 60
+INTERACTIVE_RESERVE = 0.1    # Share of each quota only interactive calls may use
+MAX_RETRIES = 3              # Retries after a 429
+DEFAULT_PAUSE = 15           # Seconds to pause a kind after a 429 without Retry-After
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+READ = 'read'
+WRITE = 'write'
+
+def _is_rate_limit(error):
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status == 429 or '429' in str(error) or 'RESOURCE_EXHAUSTED' in str(error)
+
+def _retry_after(error):
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+class _InFlight:
+    """Result holder shared by coalesced callers"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+# ========== SCHEDULER ==========
+
+class SheetsScheduler:
+    """Process-wide gate for Google Sheets API calls"""
+
+    def __init__(self, read_quota=READ_QUOTA_PER_MINUTE, write_quota=WRITE_QUOTA_PER_MINUTE,
+                 window=WINDOW_SECONDS, interactive_reserve=INTERACTIVE_RESERVE):
+        self.limits = {READ: read_quota, WRITE: write_quota}
+        self.window = window
+        self.reserve = {kind: max(1, int(limit * interactive_reserve)) for kind, limit in self.limits.items()}
+        self._used = {READ: deque(), WRITE: deque()}
+        self._waiting = {READ: [], WRITE: []}
+        self._paused_until = {READ: 0.0, WRITE: 0.0}
+        self._inflight = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.stats = {'calls': 0, 'coalesced': 0, 'throttled': 0, 'wait_seconds': 0.0}
+
+    # ---------- quota bookkeeping ----------
+
+    def _expire(self, kind, now):
+        used = self._used[kind]
+        while used and used[0] <= now - self.window:
+            used.popleft()
+
+    def _available(self, kind, priority, now):
+        self._expire(kind, now)
+        limit = self.limits[kind]
+        if priority > PRIORITY_INTERACTIVE:
+            limit -= self.reserve[kind]
+        return len(self._used[kind]) < limit
+
+    def _next_slot_in(self, kind, now):
+        if now < self._paused_until[kind]:
+            return self._paused_until[kind] - now
+        used = self._used[kind]
+        if used:
+            return max(0.05, used[0] + self.window - now)
+        return 0.05
+
+    def _acquire(self, kind, priority):
+        start = time.time()
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting[kind], ticket)
+            while True:
+                now = time.time()
+                if (self._waiting[kind][0] == ticket and now >= self._paused_until[kind]
+                        and self._available(kind, priority, now)):
+                    heapq.heappop(self._waiting[kind])
+                    self._used[kind].append(now)
+                    self.stats['calls'] += 1
+                    self.stats['wait_seconds'] += now - start
+                    self._cond.notify_all()
+                    return
+                self._cond.wait(timeout=self._next_slot_in(kind, now))
+
+    def _pause(self, kind, seconds):
+        with self._cond:
+            self._paused_until[kind] = max(self._paused_until[kind], time.time() + seconds)
+            self.stats['throttled'] += 1
+            self._cond.notify_all()
+
+    # ---------- public API ----------
+
+    def call(self, kind, fn, *args, priority=PRIORITY_BACKGROUND, coalesce_key=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) once quota allows.
+        Calls sharing a coalesce_key while one is in flight get the same result.
+        """
+        if coalesce_key is not None:
+            with self._cond:
+                shared = self._inflight.get(coalesce_key)
+                if shared is None:
+                    shared = _InFlight()
+                    self._inflight[coalesce_key] = shared
+                    owner = True
+                else:
+                    self.stats['coalesced'] += 1
+                    owner = False
+            if not owner:
+                shared.done.wait()
+                if shared.error is not None:
+                    raise shared.error
+                return shared.result
+        else:
+            shared = None
+
+        try:
+            result = self._call_with_retry(kind, fn, args, kwargs, priority)
+            if shared is not None:
+                shared.result = result
+            return result
+        except Exception as e:
+            if shared is not None:
+                shared.error = e
+            raise
+        finally:
+            if shared is not None:
+                with self._cond:
+                    self._inflight.pop(coalesce_key, None)
+                shared.done.set()
+
+    def _call_with_retry(self, kind, fn, args, kwargs, priority):
+        for attempt in range(MAX_RETRIES + 1):
+            self._acquire(kind, priority)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not _is_rate_limit(e) or attempt == MAX_RETRIES:
+                    raise
+                pause = _retry_after(e) or DEFAULT_PAUSE * (2 ** attempt)
+                print(f"   🚦 Sheets {kind} quota hit - pausing {pause:.0f}s")
+                self._pause(kind, pause)
+
+    def read(self, fn, *args, priority=PRIORITY_BACKGROUND, coalesce_key=None, **kwargs):
+        return self.call(READ, fn, *args, priority=priority, coalesce_key=coalesce_key, **kwargs)
+
+    def write(self, fn, *args, priority=PRIORITY_BACKGROUND, **kwargs):
+        return self.call(WRITE, fn, *args, priority=priority, **kwargs)
+
+    def headroom(self):
+        """Remaining requests in the current window, per kind"""
+        now = time.time()
+        with self._cond:
+            report = {}
+            for kind, limit in self.limits.items():
+                self._expire(kind, now)
+                used = len(self._used[kind])
+                report[kind] = {
+                    'limit': limit,
+                    'used': used,
+                    'remaining': max(0, limit - used),
+                    'queued': len(self._waiting[kind]),
+                    'paused_for': max(0.0, self._paused_until[kind] - now),
+                }
+            return report
+
+# ========== SHARED INSTANCE ==========
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """Process-wide scheduler instance"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SheetsScheduler()
+        return _scheduler
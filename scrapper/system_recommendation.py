@@ -9,14 +9,46 @@ import os
 import pandas as pd
 from jobspy import scrape_jobs
 from datetime import datetime
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from openai import OpenAI
 import time
+import threading
+from queue import Queue, Empty
+from functools import lru_cache
 try:
-    from pypdf import PdfReader
+    from dedup import StreamingDeduper
+    from job_archive import append_jobs
+    from sheets_outbox import get_outbox
+    from job_snapshots import SnapshotStore, filter_changed_jobs
+    from llm import chat_json, achat_json
+    from pre_ranker import pre_rank
+    from prompt_builder import PromptBuilder, count_tokens, usage_summary, PRIORITY_SECTIONS
+    from llm_metrics import set_scan
+    from model_cascade import ModelCascade
+    from llm_client import get_client, make_async_client
+    from local_scorer import LocalScorer, analysis_from_text, is_local_reason
+    from keyword_engine import is_indian_location
+    from job_router import REMOTE_BOARDS, route_job, route_jobs
+    from score_store import get_score_store
+    from resume_reader import get_resume_hash, read_resume_text
+    from resume_analysis import load_cached_analysis, save_analysis
+    from scoring_executor import ScoringExecutor, DEFAULT_CONCURRENCY, is_rate_limit
 except ImportError:
-    PdfReader = None
+    from scrapper.dedup import StreamingDeduper
+    from scrapper.job_archive import append_jobs
+    from scrapper.sheets_outbox import get_outbox
+    from scrapper.job_snapshots import SnapshotStore, filter_changed_jobs
+    from scrapper.llm import chat_json, achat_json
+    from scrapper.pre_ranker import pre_rank
+    from scrapper.prompt_builder import PromptBuilder, count_tokens, usage_summary, PRIORITY_SECTIONS
+    from scrapper.llm_metrics import set_scan
+    from scrapper.model_cascade import ModelCascade
+    from scrapper.llm_client import get_client, make_async_client
+    from scrapper.local_scorer import LocalScorer, analysis_from_text, is_local_reason
+    from scrapper.keyword_engine import is_indian_location
+    from scrapper.job_router import REMOTE_BOARDS, route_job, route_jobs
+    from scrapper.score_store import get_score_store
+    from scrapper.resume_reader import get_resume_hash, read_resume_text
+    from scrapper.resume_analysis import load_cached_analysis, save_analysis
+    from scrapper.scoring_executor import ScoringExecutor, DEFAULT_CONCURRENCY, is_rate_limit
 
 # ========== CONFIGURATION ==========
 
@@ -29,20 +61,21 @@ def load_config():
         return json.load(f)
 
 def load_resume():
-    """Load the Master Resume (PDF or TXT)"""
-    try:
-        from resume_reader import get_master_resume
-    except ImportError:
-        from scrapper.resume_reader import get_master_resume
-    text = get_master_resume()
-    if text.startswith("Resume not"):
-        raise FileNotFoundError(text)
+    """
+    Text of the master resume - read from the same file get_resume_hash()
+    hashes, so the memoized analysis and stored scores match the text sent
+    to the LLM (see resume_reader)
+    """
+    text = read_resume_text()
+    if not text:
+        raise FileNotFoundError("Resume not found in Assets folder. Please add a pdf or txt file.")
     return text
 
 # Configuration will be loaded when needed
 config = None
 MASTER_RESUME = None
 client = None
+local_scorer = None
 
 def initialize():
     """Initialize configuration, resume, and AI client"""
@@ -52,101 +85,33 @@ def initialize():
         config = load_config()
         MASTER_RESUME = load_resume()
         
-        # Initialize OpenAI client for OpenRouter
-        client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=config['openrouter_key']
-        )
+        # Shared OpenRouter client (connection reuse, retries, global rate limit)
+        client = get_client(config)
         
         print(f"[OK] Resume loaded ({len(MASTER_RESUME)} characters)")
         print(f"[OK] Model: {config['model']}")
 
 # ========== AI ANALYSIS ==========
 
-def analyze_resume_for_roles():
-    """
-    Analyze master resume to extract suitable job roles and skills
-    """
-    print("\n🤖 Analyzing master resume...")
-    
-    prompt = f"""Analyze this resume and extract key career details.
-    
-    Resume:
-    {MASTER_RESUME[:3000]}
-    
-    Extract the following:
-    1. **Experience Level**: Determine if candidates is "Fresher", "Intern", "Junior" (1-3 yrs), or "Senior".
-    2. **Top 5 Job Roles**: Specific roles they are best fit for (e.g., "Python Intern", "Junior Backend Engineer").
-       - If they are a student/fresher, append "Intern" or "Fresher" to roles.
-    3. **Key 5 Skills**: The most important technical skills from the resume.
-    4. **Preferred Locations**: Extract locations if mentioned, else default to ["India", "Remote"].
-    
-    Return ONLY a JSON object:
-    {{
-        "experience_level": "Fresher/Intern/Junior/Senior",
-        "roles": ["role1", "role2", ...],
-        "skills": ["skill1", "skill2", ...],
-        "locations": ["location1", "location2", ...]
-    }}
-"""
-    
-def load_resume():
-    """Load resume content from Assets folder (TXT or PDF)"""
-    try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        assets_dir = os.path.join(os.path.dirname(script_dir), 'Assets')
-        
-        # Priority 1: PDF
-        pdf_path = os.path.join(assets_dir, 'master resume.pdf')
-        if os.path.exists(pdf_path):
-            try:
-                import pypdf
-                with open(pdf_path, 'rb') as f:
-                    reader = pypdf.PdfReader(f)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text() + "\n"
-                print(f"📄 Loaded Master Resume (PDF)")
-                return text.strip()
-            except ImportError:
-                print("⚠️ pypdf not installed. Falling back to TXT.")
-            except Exception as e:
-                print(f"⚠️ Error reading PDF: {e}")
-
-        # Priority 2: TXT
-        txt_path = os.path.join(assets_dir, 'master resume.txt')
-        if os.path.exists(txt_path):
-            with open(txt_path, 'r', encoding='utf-8') as f:
-                print(f"📄 Loaded Master Resume (TXT)")
-                return f.read().strip()
-                
-        # Priority 3: Any PDF in Assets
-        for file in os.listdir(assets_dir):
-            if file.endswith('.pdf'):
-                try:
-                    import pypdf
-                    full_path = os.path.join(assets_dir, file)
-                    with open(full_path, 'rb') as f:
-                        reader = pypdf.PdfReader(f)
-                        text = ""
-                        for page in reader.pages:
-                            text += page.extract_text() + "\n"
-                    print(f"📄 Loaded Resume: {file}")
-                    return text.strip()
-                except:
-                    continue
-        
-        print("❌ No resume found in Assets/")
-        return ""
-    except Exception as e:
-        print(f"❌ Error loading resume: {e}")
-        return ""
+# Prompt token budgets (see prompt_builder)
+ANALYSIS_RESUME_TOKENS = 1000
+MATCH_PROMPT_TOKENS = 520     # Resume + description for one job
+MATCH_RESUME_TOKENS = 380
+BATCH_RESUME_TOKENS = 400     # Shared resume excerpt per batch request
+JOB_DESCRIPTION_TOKENS = 120  # Per job inside a batch
 
 def analyze_resume_for_roles():
     """
-    Analyze the master resume to identify role matches
+    Analyze the master resume to identify role matches.
+    The result is memoized per resume file hash + model (see resume_analysis),
+    so unchanged resumes skip both the PDF parse and the LLM call.
     """
-    resume_text = load_resume()
+    cached = load_cached_analysis(config['model'])
+    if cached:
+        print(f"   ✓ Using saved resume analysis ({len(cached.get('roles', []))} roles, resume unchanged)")
+        return cached
+    
+    resume_text = MASTER_RESUME or load_resume()
     if not resume_text:
         return {
              "roles": ["Software Engineer", "Full Stack Developer"],
@@ -154,11 +119,12 @@ def analyze_resume_for_roles():
              "experience_level": "Fresher"
         }
     
+    resume_part = PromptBuilder(ANALYSIS_RESUME_TOKENS, label='analysis').add('resume', resume_text)
     prompt = f"""
     Analyze this candidate's resume extensively and logically. Your goal is to extract their true experience level, top skills, certifications, and ideal job roles.
 
     RESUME:
-    {resume_text[:4000]}
+    {resume_part}
     
     CRITICAL INSTRUCTION:
     - Base the 'experience_level' strictly on their work history.
@@ -174,29 +140,22 @@ def analyze_resume_for_roles():
     """
     
     try:
-        response = client.chat.completions.create(
-            model=config['model'],
+        result = chat_json(
+            client,
+            config['model'],
             messages=[
                 {"role": "system", "content": "You are a career advisor analyzing resumes."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-            max_tokens=600
+            max_tokens=600,
+            feature='resume_analysis'
         )
         
-        ai_response = response.choices[0].message.content.strip()
-        
-        # Extract JSON
-        if "```json" in ai_response:
-            ai_response = ai_response.split("```json")[1].split("```")[0].strip()
-        elif "```" in ai_response:
-            ai_response = ai_response.split("```")[1].split("```")[0].strip()
-        
-        result = json.loads(ai_response)
-        
         print(f"   ✓ Identified {len(result.get('roles', []))} suitable roles")
         print(f"   ✓ Extracted {len(result.get('skills', []))} key skills")
         
+        save_analysis(config['model'], result)
         return result
         
     except Exception as e:
@@ -208,19 +167,38 @@ def analyze_resume_for_roles():
             "experience_level": "Fresher"
         }
 
-def score_job_match(job_title, company, description):
+def get_local_scorer(analysis=None):
     """
-    Score a job against the master resume (0-100)
+    Deterministic scorer for the current resume (see local_scorer).
+    Built from the given analysis, else the saved one, else the resume text alone.
     """
+    global local_scorer
+    if analysis is not None or local_scorer is None:
+        if analysis is None:
+            analysis = load_cached_analysis(config['model']) if config else None
+        resume_text = MASTER_RESUME or ''
+        local_scorer = LocalScorer.from_analysis(analysis or analysis_from_text(resume_text), resume_text)
+    return local_scorer
+
+def local_fallback(job_title, company, description, location=''):
+    """Local score used when the LLM cannot score a job"""
+    return get_local_scorer().score_one(job_title, company, description, location)
+
+def _match_messages(job_title, company, description):
+    """Prompt for scoring a single job (resume sections picked for this job)"""
+    pb = PromptBuilder(MATCH_PROMPT_TOKENS, label='match')
+    resume_part = pb.add('resume', MASTER_RESUME, MATCH_RESUME_TOKENS,
+                         query=f"{job_title} {description}", priority=PRIORITY_SECTIONS)
+    description_part = pb.add('description', description, query=MASTER_RESUME)
     prompt = f"""Score this job against the candidate's resume (0-100) strictly and logically.
 
 Resume:
-{MASTER_RESUME[:1500]}
+{resume_part}
 
 Job:
 - Title: {job_title}
 - Company: {company}
-- Description: {description[:500]}
+- Description: {description_part}
 
 RULES:
 1. Pure Logic: Base the score purely on how well the job description matches their experience level, technical skills, and certifications.
@@ -230,52 +208,274 @@ RULES:
 Return ONLY a JSON:
 {{"score": <number>, "reason": "<1 logical sentence why>"}}
 """
-    
+    return [
+        {"role": "system", "content": "You are a job matching AI. Be strict and selective."},
+        {"role": "user", "content": prompt}
+    ]
+
+def score_job_match(job_title, company, description):
+    """
+    Score a job against the master resume (0-100)
+    """
     try:
-        response = client.chat.completions.create(
-            model=config['model'],
-            messages=[
-                {"role": "system", "content": "You are a job matching AI. Be strict and selective."},
-                {"role": "user", "content": prompt}
-            ],
+        result = chat_json(
+            client,
+            config['model'],
+            messages=_match_messages(job_title, company, description),
             temperature=0.2,
-            max_tokens=1000
+            max_tokens=1000,
+            feature='match'
         )
-        
-        ai_response = response.choices[0].message.content.strip()
-        
-        # Extract JSON
-        if "```json" in ai_response:
-            ai_response = ai_response.split("```json")[1].split("```")[0].strip()
-        elif "```" in ai_response:
-            ai_response = ai_response.split("```")[1].split("```")[0].strip()
-        
-        result = json.loads(ai_response)
         score = int(result.get('score', 50))
         reason = result.get('reason', 'Match analysis completed')
         
         return score, reason
         
     except Exception as e:
-        print(f"   ⚠️ Scoring error: {e}")
-        return 50, "Unable to score"
+        print(f"   ⚠️ Scoring error: {e} (using local score)")
+        return local_fallback(job_title, company, description)
 
-# ========== JOB SCRAPING ==========
+async def ascore_job_match(aclient, job, model=None, feature='match'):
+    """Async score_job_match for the scoring executor (429s propagate for retry)"""
+    try:
+        result = await achat_json(
+            aclient,
+            model or config['model'],
+            messages=_match_messages(job.get('title', ''), job.get('company', ''),
+                                     str(job.get('description', ''))),
+            temperature=0.2,
+            max_tokens=1000,
+            feature=feature
+        )
+        return int(result.get('score', 50)), result.get('reason', 'Match analysis completed')
+    except Exception as e:
+        if is_rate_limit(e):
+            raise
+        print(f"   ⚠️ Scoring error: {e} (using local score)")
+        return local_fallback(job.get('title', ''), job.get('company', ''),
+                              str(job.get('description', '')), job.get('location', ''))
 
-def scrape_jobs_by_category(roles, locations, skills=[], experience_level="Fresher", target_category=None):
+# ========== BATCHED SCORING ==========
+
+BATCH_INPUT_TOKENS = 6000     # Prompt budget per batch request (resume + jobs)
+BATCH_MAX_JOBS = 15           # Hard cap so the JSON reply stays short
+TOKENS_PER_REPLY = 60         # Output tokens reserved per job
+
+@lru_cache(maxsize=1024)
+def _batch_description(description):
+    """Description paragraphs most relevant to the resume, within JOB_DESCRIPTION_TOKENS"""
+    return PromptBuilder(JOB_DESCRIPTION_TOKENS, label='batch').add('description', description,
+                                                                   query=MASTER_RESUME)
+
+def _job_block(job_id, job):
+    return (f"[{job_id}] Title: {job.get('title', '')}\n"
+            f"    Company: {job.get('company', '')}\n"
+            f"    Description: {_batch_description(str(job.get('description', '')))}")
+
+def plan_batches(jobs, resume_excerpt, budget=BATCH_INPUT_TOKENS, max_jobs=BATCH_MAX_JOBS):
+    """Split job indices into batches that fit the prompt token budget"""
+    overhead = count_tokens(resume_excerpt) + 250
+    batches, current, used = [], [], overhead
+    for i, job in enumerate(jobs):
+        cost = count_tokens(_job_block(i, job))
+        if current and (used + cost > budget or len(current) >= max_jobs):
+            batches.append(current)
+            current, used = [], overhead
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def _batch_messages(jobs, resume_excerpt):
+    """Prompt for several (job_id, job) pairs at once"""
+    blocks = "\n\n".join(_job_block(i, job) for i, job in jobs)
+    prompt = f"""Score each job against the candidate's resume (0-100) strictly and logically.
+
+Resume:
+{resume_excerpt}
+
+Jobs:
+{blocks}
+
+RULES:
+1. Pure Logic: Base each score purely on how well the job description matches their experience level, technical skills, and certifications.
+2. If the candidate is a Fresher/Intern and the job asks for 5 years experience, penalize heavily (Score < 30).
+3. If the candidate has explicit certifications/projects validating the job requirements, boost the score (85-100).
+4. Score every job independently.
+
+Return ONLY a JSON array with one object per job id:
+[{{"id": <job id>, "score": <number>, "reason": "<1 logical sentence why>"}}, ...]
+"""
+    return [
+        {"role": "system", "content": "You are a job matching AI. Be strict and selective."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _parse_batch(result):
+    """Batch reply -> {job_id: (score, reason)} (may be partial)"""
+    if isinstance(result, dict):
+        result = result.get('results') or result.get('jobs') or []
+
+    scores = {}
+    for item in result:
+        try:
+            score = max(0, min(100, int(item.get('score'))))
+            scores[int(item.get('id'))] = (score, item.get('reason', 'Match analysis completed'))
+        except (TypeError, ValueError, AttributeError):
+            continue
+    return scores
+
+async def _ascore_batch(aclient, jobs, resume_excerpt, model=None, feature='batch_match'):
+    try:
+        result = await achat_json(
+            aclient,
+            model or config['model'],
+            messages=_batch_messages(jobs, resume_excerpt),
+            temperature=0.2,
+            max_tokens=TOKENS_PER_REPLY * len(jobs) + 200,
+            feature=feature
+        )
+        return _parse_batch(result)
+    except Exception as e:
+        if is_rate_limit(e):
+            raise
+        print(f"   ⚠️ Batch scoring error ({e}); scoring {len(jobs)} jobs one by one")
+        return {}
+
+def get_scoring_executor():
+    """Async executor sized by config['scoring_concurrency'] (default 8)"""
+    return ScoringExecutor(
+        lambda: make_async_client(config),
+        concurrency=config.get('scoring_concurrency', DEFAULT_CONCURRENCY)
+    )
+
+def get_cascade():
+    """Fast/strong model cascade from config['scoring_cascade'] (None = single model)"""
+    return ModelCascade.from_config(config)
+
+def score_jobs_batch(jobs, budget=BATCH_INPUT_TOKENS, max_jobs=BATCH_MAX_JOBS):
     """
-    Scrape jobs from ALL platforms using enhanced scraper
-    Returns: {category: [jobs]}
+    Score many jobs with a few packed requests instead of one request per job.
+    The resume excerpt is sent once per batch and batches run concurrently
+    (see scoring_executor). Jobs missing from a reply (or whole batches that
+    fail to parse) fall back to single-job scoring.
+    With a scoring cascade configured, jobs are scored by the fast model and
+    only those in the ambiguous band are re-scored by the strong model.
+    Returns [(score, reason)] in the same order as jobs.
     """
-    print("\n📊 Scraping jobs from ALL platforms...")
-    
-    all_jobs = {
-        'Remote': [],
-        'Onsite': [],
-        'Hybrid': [],
-        'International': []
-    }
+    return _score_jobs_batch(jobs, budget, max_jobs)[0]
+
+def _score_jobs_batch(jobs, budget=BATCH_INPUT_TOKENS, max_jobs=BATCH_MAX_JOBS):
+    """score_jobs_batch, plus the model that produced each result"""
+    jobs = list(jobs)
+    executor = get_scoring_executor()
+    cascade = get_cascade()
+    if cascade is None:
+        return (_score_with_model(jobs, config['model'], executor, budget, max_jobs),
+                [config['model']] * len(jobs))
+
+    results = _score_with_model(jobs, cascade.fast_model, executor, budget, max_jobs)
+    models = [cascade.fast_model] * len(jobs)
+    picked = cascade.escalations(results)
+    if picked:
+        strong = _score_with_model([jobs[i] for i in picked], cascade.strong_model, executor,
+                                   budget, max_jobs, feature='batch_match_escalated')
+        cascade.merge(results, picked, strong, models)
+    print(f"   [CASCADE] {cascade.summary()}")
+    return results, models
+
+def _score_with_model(jobs, model, executor, budget=BATCH_INPUT_TOKENS, max_jobs=BATCH_MAX_JOBS,
+                      feature='batch_match'):
+    """Batched scoring of jobs with one model; see score_jobs_batch"""
+    # One excerpt per run, picked for the titles being scored
+    titles = ' '.join(str(job.get('title', '')) for job in jobs)
+    resume_excerpt = PromptBuilder(BATCH_RESUME_TOKENS, label='batch').add(
+        'resume', MASTER_RESUME, query=titles, priority=PRIORITY_SECTIONS)
+    results = [None] * len(jobs)
+
+    batches = plan_batches(jobs, resume_excerpt, budget, max_jobs)
+    print(f"   [AI] {len(jobs)} jobs in {len(batches)} batched requests to {model} "
+          f"({executor.concurrency} in flight)")
+
+    async def score_batch(aclient, batch):
+        return await _ascore_batch(aclient, [(i, jobs[i]) for i in batch], resume_excerpt,
+                                   model=model, feature=feature)
+
+    for batch, scores in zip(batches, executor.map(score_batch, batches, on_error=lambda b, e: {})):
+        for i in batch:
+            if i in scores:
+                results[i] = scores[i]
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        singles = executor.map(
+            lambda aclient, i: ascore_job_match(aclient, jobs[i], model=model,
+                                                feature=feature.replace('batch_', '')),
+            missing,
+            on_error=lambda i, e: get_local_scorer().score_jobs([jobs[i]])[0]
+        )
+        for i, result in zip(missing, singles):
+            results[i] = result
+    return results
+
+SCORE_SCOPE = 'recommendation'   # Score store scope for this prompt
+
+def score_jobs_cached(jobs):
+    """
+    score_jobs_batch, but jobs whose stored score was computed from the same
+    resume and the same job text reuse it (see score_store). New LLM scores
+    are saved; local fallbacks are not, so they are retried next run.
+    """
+    jobs = list(jobs)
+    store = get_score_store()
+    resume_hash = get_resume_hash()
+    results = store.lookup(jobs, resume_hash, SCORE_SCOPE)
+    todo = [i for i, result in enumerate(results) if result is None]
+    if len(todo) < len(jobs):
+        print(f"   [CACHE] Reusing {len(jobs) - len(todo)} scores (resume and job unchanged)")
+
+    if todo:
+        scored, models = _score_jobs_batch([jobs[i] for i in todo])
+        for i, result in zip(todo, scored):
+            results[i] = result
+        keep = [k for k, i in enumerate(todo) if not is_local_reason(results[i][1])]
+        store.save([jobs[todo[k]] for k in keep], [scored[k] for k in keep], resume_hash, SCORE_SCOPE,
+                   model=[models[k] for k in keep])
+    return results
+
+# ========== JOB SCRAPING ==========
+
+def categorize_job(job):
+    """Set job['work_mode'] from its location / description / source; returns the category"""
+    location_str = str(job.get('location', '')).lower()
+    desc_str = str(job.get('description', ''))[:200].lower()
+    
+    # Determine category using robust location matching
+    is_india_loc = is_indian_location(location_str)
+    
+    from_remote_board = any(board in str(job.get('source', '')).lower() for board in REMOTE_BOARDS)
+    if 'remote' in location_str or 'remote' in desc_str or from_remote_board:
+        if not is_india_loc:
+            category = 'International'
+        else:
+            category = 'Remote'
+    elif 'hybrid' in location_str or 'hybrid' in desc_str:
+        category = 'Hybrid'
+    else:
+        category = 'Onsite'
     
+    # Add work_mode to job
+    job['work_mode'] = category
+    return category
+
+def iter_scraped_sources(roles, locations, skills=[], experience_level="Fresher", target_category=None):
+    """
+    Scrape ALL platforms one source at a time.
+    Yields (source name, [jobs]) as soon as each source returns, with
+    work_mode already set, so scoring can start before the slow
+    Greenhouse/Lever loops finish.
+    """
     # Import enhanced scraper functions
     from enhanced_scraper import (
         scrape_jobspy, scrape_weworkremotely, scrape_remotive,
@@ -301,92 +501,146 @@ def scrape_jobs_by_category(roles, locations, skills=[], experience_level="Fresh
             
     print(f"\n🎯 Primary Search: '{search_query}' in '{top_location}' (Level: {experience_level})")
     
+    def categorized(jobs):
+        for job in jobs:
+            categorize_job(job)
+        return jobs
+    
     # 1. JobSpy (LinkedIn, Indeed, Glassdoor) - Most recent first
     print("\n📱 Scraping JobSpy sources...")
     # Increase results explicitly
-    jobspy_jobs = scrape_jobspy(search_query, top_location, results_wanted=50)
+    yield 'JobSpy', categorized(scrape_jobspy(search_query, top_location, results_wanted=50))
     
     # 2. We Work Remotely
     print("\n🌍 Scraping We Work Remotely...")
-    wwr_jobs = scrape_weworkremotely("programming")
+    yield 'WeWorkRemotely', categorized(scrape_weworkremotely("programming"))
     
     # 3. Remotive
     print("\n🔗 Scraping Remotive...")
-    remotive_jobs = scrape_remotive("software-dev")
+    yield 'Remotive', categorized(scrape_remotive("software-dev"))
     
     # 4. Greenhouse Companies (Top 10)
     print("\n🏢 Scraping Greenhouse Companies...")
-    greenhouse_jobs = []
     for company_name, company_slug in GREENHOUSE_COMPANIES[:10]:
-        jobs = scrape_greenhouse(company_name, company_slug)
-        greenhouse_jobs.extend(jobs)
+        yield f"Greenhouse/{company_name}", categorized(scrape_greenhouse(company_name, company_slug))
         time.sleep(1)
     
     # 5. Lever Companies (Top 8)
     print("\n🎬 Scraping Lever Companies...")
-    lever_jobs = []
     for company_name, company_slug in LEVER_COMPANIES[:8]:
-        jobs = scrape_lever(company_name, company_slug)
-        lever_jobs.extend(jobs)
+        yield f"Lever/{company_name}", categorized(scrape_lever(company_name, company_slug))
         time.sleep(1)
+
+def print_category_breakdown(jobs):
+    counts = {'Remote': 0, 'Onsite': 0, 'Hybrid': 0, 'International': 0}
+    for job in jobs:
+        counts[job.get('work_mode', 'Onsite')] = counts.get(job.get('work_mode', 'Onsite'), 0) + 1
+    print("\n📊 Category Breakdown:")
+    for category, count in counts.items():
+        print(f"   - {category}: {count} jobs")
+
+def scrape_jobs_by_category(roles, locations, skills=[], experience_level="Fresher", target_category=None):
+    """
+    Scrape jobs from ALL platforms using enhanced scraper (all sources, then return)
+    Returns: [jobs] with work_mode set
+    """
+    print("\n📊 Scraping jobs from ALL platforms...")
     
-    # Combine all jobs
-    combined_jobs = jobspy_jobs + wwr_jobs + remotive_jobs + greenhouse_jobs + lever_jobs
+    combined_jobs = []
+    for _, jobs in iter_scraped_sources(roles, locations, skills, experience_level, target_category):
+        combined_jobs.extend(jobs)
     
     print(f"\n✅ Total jobs scraped: {len(combined_jobs)}")
-    
-    # Categorize jobs
-    for job in combined_jobs:
-        location_str = str(job.get('location', '')).lower()
-        desc_str = str(job.get('description', ''))[:200].lower()
-        
-        # Determine category using robust location matching
-        indian_keywords = ['india', 'mumbai', 'delhi', 'bangalore', 'bengaluru', 'hyderabad', 
-                          'chennai', 'pune', 'kolkata', 'ahmedabad', 'gurgaon', 'noida',
-                          'chandigarh', 'jaipur', 'kochi', 'indore', 'bhopal', 'lucknow']
-        is_india_loc = any(k in location_str for k in indian_keywords)
-        
-        if 'remote' in location_str or 'remote' in desc_str or str(job.get('source')) in ['WeWorkRemotely', 'Remotive']:
-            if not is_india_loc:
-                category = 'International'
-            else:
-                category = 'Remote'
-        elif 'hybrid' in location_str or 'hybrid' in desc_str:
-            category = 'Hybrid'
-        else:
-            category = 'Onsite'
-        
-        # Add work_mode to job
-        job['work_mode'] = category
-        all_jobs[category].append(job)
-    
-    # Print category breakdown
-    print("\n📊 Category Breakdown:")
-    for category, cat_jobs in all_jobs.items():
-        print(f"   - {category}: {len(cat_jobs)} jobs")
-    
+    print_category_breakdown(combined_jobs)
     return combined_jobs
 
+# ========== SCRAPE / SCORE PIPELINE ==========
+
+SCRAPE_QUEUE_SIZE = 4         # Source batches buffered between the scrape and score stages
+# Resume similarity (pre_ranker cosine) a job in the current top `limit` needs to be
+# LLM-scored while later sources are still scraped (~top 2% of a typical scrape).
+# Lower = more overlap, more early scores later displaced. ai_config.json: "early_score_similarity"
+EARLY_SCORE_SIMILARITY = 0.05
+_SCRAPE_DONE = object()
+
+def _scrape_stage(out_queue, roles, locations, skills, experience_level, target_category):
+    """Producer: push each source's jobs into the queue (blocks while it is full)"""
+    try:
+        for source, jobs in iter_scraped_sources(roles, locations, skills, experience_level, target_category):
+            if jobs:
+                print(f"   [PIPE] {source}: {len(jobs)} jobs -> scoring")
+                out_queue.put(jobs)
+    except Exception as e:
+        print(f"   ⚠️ Scrape stage stopped early: {e}")
+    finally:
+        out_queue.put(_SCRAPE_DONE)
+
+def start_scrape_stage(roles, locations, skills=[], experience_level="Fresher", target_category=None):
+    """Run the scrapers on a background thread; returns the bounded queue they feed"""
+    print("\n📊 Scraping jobs from ALL platforms (scoring starts with the first source)...")
+    out_queue = Queue(maxsize=SCRAPE_QUEUE_SIZE)
+    threading.Thread(
+        target=_scrape_stage,
+        args=(out_queue, roles, locations, skills, experience_level, target_category),
+        name='scrape-stage', daemon=True
+    ).start()
+    return out_queue
+
+def iter_scrape_batches(in_queue):
+    """
+    Consumer side: waits for the next source, then also takes every other
+    source already waiting, so a slow scoring round catches up in one step.
+    """
+    while True:
+        batch = in_queue.get()
+        if batch is _SCRAPE_DONE:
+            return
+        while True:
+            try:
+                more = in_queue.get_nowait()
+            except Empty:
+                break
+            if more is _SCRAPE_DONE:
+                yield batch
+                return
+            batch = batch + more
+        yield batch
+
 # ========== RECOMMENDATION ENGINE ==========
 
-def run_system_recommendation(target_category=None, limit=10):
+def run_system_recommendation(target_category=None, limit=10, changes_only=False, fast=False):
     """
     Main recommendation engine
     1. Analyze resume
     2. Scrape jobs (Targeted if category provided)
-    3. Score jobs
+    3. Score jobs - overlapped with step 2: a scrape thread feeds each
+       source's jobs through a bounded queue. After every source, the jobs
+       in the pool's current top `limit` whose resume similarity clears
+       EARLY_SCORE_SIMILARITY are LLM-scored while the next source is
+       scraped; the rest of the final top `limit` is topped up at the end
     4. Select top jobs
     5. Save to Google Sheets
+    
+    changes_only: only score postings that are new, reopened or changed
+    since the previous scan of the same category (see job_snapshots)
+    fast: no LLM calls at all - the saved (or locally derived) resume analysis
+    is used and every scraped job is scored by the local engine
     """
     # Initialize configuration and AI client
     initialize()
+    set_scan(f"{target_category or 'ALL'} {datetime.now():%Y-%m-%d %H:%M}")
     
     print("="*70)
-    print(f"[SYSTEM] RECOMMENDATION ENGINE | Target: {target_category or 'ALL'} | Limit: {limit}")
+    print(f"[SYSTEM] RECOMMENDATION ENGINE | Target: {target_category or 'ALL'} | Limit: {limit}"
+          f"{' | FAST (local scoring)' if fast else ''}")
     print("="*70)
     
     # Step 1: Analyze resume
-    analysis = analyze_resume_for_roles()
+    if fast:
+        analysis = load_cached_analysis(config['model']) or analysis_from_text(MASTER_RESUME)
+    else:
+        analysis = analyze_resume_for_roles()
+    get_local_scorer(analysis)
     roles = analysis.get('roles', [])
     locations = analysis.get('locations', ['Remote', 'India'])
     skills = analysis.get('skills', [])
@@ -425,82 +679,100 @@ def run_system_recommendation(target_category=None, limit=10):
     final_recommendations = []
 
     print(f"\n📂 Starting Global Scrape based on Resume")
-    # Step 2: Scrape jobs matching candidate roles
-    all_combined_jobs = scrape_jobs_by_category(roles, locations, skills, experience_level, target_category)
-    
-    if not all_combined_jobs:
+    # Steps 2-3 overlap: each source's strong matches are scored while the next source is scraped
+    label = target_category or 'ALL'
+    snapshots = SnapshotStore()
+    _, previous_snapshot = snapshots.latest_run(label)
+    deduper = StreamingDeduper()
+    candidates = []   # Jobs eligible for scoring, in arrival order
+    scores = {}       # id(job) -> (score, reason)
+    early_threshold = config.get('early_score_similarity', EARLY_SCORE_SIMILARITY)
+    
+    def score_pending(jobs):
+        todo = [job for job in jobs if id(job) not in scores]
+        if not todo:
+            return
+        if fast:
+            results = get_local_scorer().score_jobs(todo)
+        else:
+            print(f"   [AI] Scoring {len(todo)} matching jobs...")
+            results = score_jobs_cached(todo)
+        for job, result in zip(todo, results):
+            scores[id(job)] = result
+    
+    scrape_queue = start_scrape_stage(roles, locations, skills, experience_level, target_category)
+    for batch in iter_scrape_batches(scrape_queue):
+        # Collapse cross-board duplicates (against every earlier source too) before scoring
+        fresh = deduper.add(batch)
+        if changes_only:
+            fresh = filter_changed_jobs(fresh, previous_snapshot)
+        # Each job's sheet is decided once here (job_router) and reused by save_to_sheets.
+        # Even for a targeted scan ALL jobs are kept and routed to their own sheet,
+        # which avoids duplicates across categories
+        route_jobs(fresh)
+        candidates.extend(fresh)
+        if fast:
+            score_pending(candidates)
+        else:
+            # Only strong matches are scored early: weaker top-`limit` picks are often
+            # displaced by later sources (the pre-rank IDF and cutoff move with the pool)
+            ranked, similarity = pre_rank(candidates, MASTER_RESUME, top_k=limit)
+            score_pending([job for job, sim in zip(ranked, similarity) if sim >= early_threshold])
+    
+    all_combined_jobs = deduper.jobs
+    print(f"\n✅ Total jobs scraped: {len(deduper.checked)}")
+    if deduper.collapsed:
+        print(f"   🧬 Collapsed {deduper.collapsed} cross-board duplicates")
+    print_category_breakdown(all_combined_jobs)
+    
+    if all_combined_jobs:
+        append_jobs(all_combined_jobs)
+        
+        # Record this run's snapshot and compare with the previous scan
+        run_id, diff = snapshots.record_run(all_combined_jobs, label=label)
+        changes = diff.summary()
+        print(f"\n📸 Snapshot #{run_id}: {changes['new']} new, {changes['reopened']} reopened, "
+              f"{changes['changed']} changed, {changes['removed']} closed, {changes['unchanged']} unchanged")
+        if changes_only:
+            print(f"   [INFO] Changes-only mode: {len(candidates)} jobs left to score")
+    
+    if not candidates:
         print(f"   [WARN] No jobs found from scrape!")
     else:
-        # Filter jobs matching the specific selected categories
-        filtered_jobs = []
-        for job in all_combined_jobs:
-            location_str = str(job.get('location', '')).lower()
-            work_mode = job.get('work_mode', 'Onsite')
-            source_str = str(job.get('source', '')).lower()
-            
-            # Check if from direct portals
-            direct_portal_sources = ['Greenhouse', 'Lever', 'Google', 'Microsoft', 'Apple', 'Amazon', 'Meta', 'Netflix']
-            direct_portal_urls = ['greenhouse.io', 'lever.co', 'google.com/careers', 'microsoft.com/careers']
-            
-            is_direct = (
-                job.get('source') in direct_portal_sources or
-                any(url_pattern in job.get('job_url', '').lower() for url_pattern in direct_portal_urls)
-            )
-            
-            # Check if location is in India using keywords
-            indian_keywords = ['india', 'mumbai', 'delhi', 'bangalore', 'bengaluru', 'hyderabad', 
-                              'chennai', 'pune', 'kolkata', 'ahmedabad', 'gurgaon', 'noida',
-                              'chandigarh', 'jaipur', 'kochi', 'indore', 'bhopal', 'lucknow']
-            
-            is_india = any(k in location_str for k in indian_keywords)
-            
-            # Match routing logic from save_to_sheets
-            is_remote_board = job.get('source') in ['WeWorkRemotely', 'Remotive']
-            
-            category_key = ''
-            if is_direct:
-                category_key = 'Direct_Portals'
-            elif is_remote_board:
-                category_key = 'International_Remote'
-            elif is_india:
-                if 'remote' in location_str or work_mode == 'Remote':
-                    category_key = 'Indian_Remote'
-                else:
-                    category_key = 'Indian_Onsite'
-            elif work_mode == 'International' or ('remote' in location_str and not is_india):
-                 category_key = 'International_Remote'
-            else:
-                category_key = 'Career_Portals'
-            # Override category if we explicitly scanned for it and it matches geographically
-            if target_category and target_category in selected_cats:
-                # If they want Indian Onsite, an ATS job in India Onsite can also fit that sheet,
-                # but to avoid duplicates across categories, we should just let ALL valid jobs be processed 
-                # that were scraped in this run and route them to their correct destination.
-                pass
-                
-            filtered_jobs.append(job)
-        
-        print(f"   [AI] Scoring {min(len(filtered_jobs), limit)} matching jobs...")
-        
-        # Step 3: Score
         scored_jobs = []
-        for job in filtered_jobs[:limit]:
-            score, reason = score_job_match(
-                job.get('title', ''),
-                job.get('company', ''),
-                job.get('description', '')
-            )
-            
-            job['Score'] = score
-            job['Summary'] = reason
-            scored_jobs.append(job)
+        if fast:
+            # Step 3: The whole pool was scored locally, keep the best `limit`
+            print(f"   [LOCAL] Scored {len(candidates)} jobs without AI")
+            for job in candidates:
+                job['Score'], job['Summary'] = scores[id(job)]
+                scored_jobs.append(job)
+            scored_jobs.sort(key=lambda x: x['Score'], reverse=True)
+            scored_jobs = scored_jobs[:limit]
+            for job in scored_jobs:
+                print(f"   • {job.get('title', '')}: {job['Score']}/100")
+        else:
+            # Final ranking over the complete pool; score the picks not scored early
+            filtered_jobs, similarity = pre_rank(candidates, MASTER_RESUME, top_k=limit)
+            if len(similarity):
+                print(f"   [RANK] Pre-ranked pool by resume similarity "
+                      f"(top {len(similarity)}: {similarity.max():.2f} - {similarity.min():.2f})")
+            score_pending(filtered_jobs)
+            final_ids = {id(job) for job in filtered_jobs}
+            overtaken = sum(1 for key in scores if key not in final_ids)
+            if overtaken:
+                print(f"   [PIPE] {overtaken} jobs scored early were overtaken by later sources (scores kept in cache)")
             
-            print(f"   • {job.get('title', '')}: {score}/100")
-            time.sleep(0.5)
+            for job in filtered_jobs:
+                job['Score'], job['Summary'] = scores[id(job)]
+                scored_jobs.append(job)
+
+                print(f"   • {job.get('title', '')}: {job['Score']}/100")
         
         scored_jobs.sort(key=lambda x: x['Score'], reverse=True)
         final_recommendations.extend(scored_jobs)
         print(f"   [OK] Processed {len(scored_jobs)} jobs")
+        for line in usage_summary():
+            print(f"   [PROMPT] {line}")
 
     # Step 4: Save to Google Sheets
     if final_recommendations:
@@ -522,134 +794,39 @@ def save_to_sheets(jobs):
     """
     Save recommended jobs to the 5 category sheets based on job characteristics
     Routes to: Direct_Portals, International_Remote, Indian_Remote, Indian_Onsite, Career_Portals
+    
+    Rows are committed to the local outbox and delivered by a background flusher,
+    so a slow or over-quota Sheets API never blocks the scan or loses its results.
+    Duplicate links (already in any sheet) are skipped by the flusher.
     """
     try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        credentials_file = os.path.join(script_dir, 'google_key.json')
-        
-        if not os.path.exists(credentials_file):
-            print("⚠️ google_key.json not found")
-            return
+        outbox = get_outbox()
         
-        scope = ['https://spreadsheets.google.com/feeds',
-                 'https://www.googleapis.com/auth/drive']
-        
-        creds = ServiceAccountCredentials.from_json_keyfile_name(credentials_file, scope)
-        client_gs = gspread.authorize(creds)
-        
-        sheet = client_gs.open('Ai Job Tracker')
-        
-        # Get all 5 worksheets
-        try:
-            ws_direct_portals = sheet.worksheet('Direct_Portals')
-            ws_international_remote = sheet.worksheet('International_Remote')
-            ws_indian_remote = sheet.worksheet('Indian_Remote')
-            ws_indian_onsite = sheet.worksheet('Indian_Onsite')
-            ws_career_portals = sheet.worksheet('Career_Portals')
-        except:
-            print("❌ Error: Required worksheets not found")
-            return
-        
-        # Get existing URLs from all sheets to avoid duplicates
-        all_worksheets = [ws_direct_portals, ws_international_remote, ws_indian_remote, ws_indian_onsite, ws_career_portals]
-        existing_urls = set()
-        
-        for worksheet in all_worksheets:
-            try:
-                existing_data = worksheet.get_all_records()
-                for row in existing_data:
-                    url = str(row.get('Link', '')).strip()
-                    if url and url != '#':
-                        existing_urls.add(url)
-            except:
-                continue
-        
-        # Route jobs to appropriate sheets
-        job_counts = {
-            'Direct_Portals': 0,
-            'International_Remote': 0,
-            'Indian_Remote': 0,
-            'Indian_Onsite': 0,
-            'Career_Portals': 0
-        }
+        # Route jobs to appropriate sheets (decided once per job, see job_router)
+        job_counts = route_jobs(jobs)
         
+        queued_rows = []
         for job in jobs:
-            # Skip if already exists and is a valid URL
-            job_url = str(job.get('job_url', '')).strip()
-            if job_url and job_url != '#' and job_url in existing_urls:
-                continue
-            
-            # Determine target sheet based on job characteristics
-            location_str = str(job.get('location', '')).lower()
-            work_mode = job.get('work_mode', 'Onsite')
-            source_str = str(job.get('source', '')).lower()
-            
-            # Check if from direct portals (ATS or Big Tech)
-            direct_portal_sources = ['Greenhouse', 'Lever', 'Google', 'Microsoft', 'Apple', 'Amazon', 'Meta', 'Netflix']
-            direct_portal_urls = ['greenhouse.io', 'lever.co', 'google.com/careers', 'microsoft.com/careers']
-            
-            is_direct = (
-                job.get('source') in direct_portal_sources or
-                any(url_pattern in job['job_url'].lower() for url_pattern in direct_portal_urls)
-            )
-            
-            # Check if location is in India using keywords
-            indian_keywords = ['india', 'mumbai', 'delhi', 'bangalore', 'bengaluru', 'hyderabad', 
-                              'chennai', 'pune', 'kolkata', 'ahmedabad', 'gurgaon', 'noida',
-                              'chandigarh', 'jaipur', 'kochi', 'indore', 'bhopal', 'lucknow']
-            
-            is_india = any(k in location_str for k in indian_keywords)
-            
-            # Routing logic - Simplified for robustness
-            target_worksheet = None
-            category_key = ''
-            is_remote_board = job.get('source') in ['WeWorkRemotely', 'Remotive']
-            
-            if is_direct:
-                target_worksheet = ws_direct_portals
-                category_key = 'Direct_Portals'
-            elif is_remote_board:
-                target_worksheet = ws_international_remote
-                category_key = 'International_Remote'
-            elif is_india:
-                if 'remote' in location_str or work_mode == 'Remote':
-                    target_worksheet = ws_indian_remote
-                    category_key = 'Indian_Remote'
-                else:
-                    target_worksheet = ws_indian_onsite
-                    category_key = 'Indian_Onsite'
-            elif work_mode == 'International' or ('remote' in location_str and not is_india):
-                 target_worksheet = ws_international_remote
-                 category_key = 'International_Remote'
-            else:
-                target_worksheet = ws_career_portals
-                category_key = 'Career_Portals'
-            
-            # Use specific overrides if category was explicitly passed in scraping?
-            # For now, auto-detect is safer to ensure correct placement.
-            
-            if target_worksheet:
-                 # Prepare row data
-                row = [
-                    job.get('title', ''),
-                    job.get('company', ''),
-                    job.get('location', ''),
-                    job.get('work_mode', ''),
-                    job.get('job_url', ''),
-                    job.get('source', ''),
-                    job.get('salary_range', ''),
-                    job.get('posted_date', ''),
-                    job.get('Score', ''),
-                    job.get('Summary', '')
-                ]
-                
-                target_worksheet.append_row(row)
-                job_counts[category_key] += 1
-                existing_urls.add(job['job_url'])
+            # Prepare row data
+            row = [
+                job.get('title', ''),
+                job.get('company', ''),
+                job.get('location', ''),
+                job.get('work_mode', ''),
+                job.get('job_url', ''),
+                job.get('source', ''),
+                job.get('salary_range', ''),
+                job.get('posted_date', ''),
+                job.get('Score', ''),
+                job.get('Summary', '')
+            ]
+            queued_rows.append((route_job(job), row, job.get('job_url', '')))
+        
+        total_queued = outbox.enqueue_many(queued_rows)
+        outbox.start_background()
         
         # Print summary
-        total_added = sum(job_counts.values())
-        print(f"\n[OK] Added {total_added} jobs to category sheets!")
+        print(f"\n[OK] Queued {total_queued} jobs for the category sheets (outbox)!")
         for cat, count in job_counts.items():
             if count > 0:
                 print(f"   - {cat}: {count}")
@@ -664,10 +841,19 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--category', type=str, default=None, help='Specific category to scrape')
     parser.add_argument('--limit', type=int, default=10, help='Number of jobs')
+    parser.add_argument('--changes-only', action='store_true', help='Only score new/changed postings since the last scan')
+    parser.add_argument('--fast', action='store_true', help='Score locally without AI calls')
     args = parser.parse_args()
 
     try:
-        run_system_recommendation(target_category=args.category, limit=args.limit)
+        run_system_recommendation(target_category=args.category, limit=args.limit,
+                                  changes_only=args.changes_only, fast=args.fast)
+        
+        # Give the outbox a chance to deliver before the process exits;
+        # anything left stays queued and is retried by the next run/dashboard
+        remaining = get_outbox().drain()
+        if remaining:
+            print(f"\n[WARN] {remaining} rows still queued for Google Sheets - they will be retried")
     except Exception as e:
         print(f"\n[ERROR] FATAL ERROR: {e}")
         import traceback
@@ -10,7 +10,7 @@ from jobspy import scrape_jobs
 from datetime import datetime
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-from openai import OpenAI
+from llm_client import get_client
 import time
 
 # Import enhanced scraper functions
@@ -19,6 +19,9 @@ from enhanced_scraper import (
     scrape_greenhouse, scrape_lever,
     GREENHOUSE_COMPANIES, LEVER_COMPANIES
 )
+from job_archive import append_jobs
+from job_record import to_dataframe
+from resume_analysis import load_latest_analysis
 
 # ========== CONFIGURATION ==========
 
@@ -54,10 +57,7 @@ def initialize():
         config = load_config()
         MASTER_RESUME = load_resume()
         
-        client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=config['openrouter_key']
-        )
+        client = get_client(config)
         
         print(f"✓ Resume loaded ({len(MASTER_RESUME)} characters)")
         print(f"✓ Model: {config['model']}")
@@ -87,14 +87,20 @@ class JobScraper:
         Scrape jobs based on mode
         
         Args:
-            role: Job role to search (optional in advanced mode)
-            location: Location to search (optional in advanced mode)
+            role: Job role to search (default: top role from the saved resume analysis)
+            location: Location to search (default: first preferred location, else Remote)
             results_per_source: Number of results per source
         """
         print("="*70)
         print(f"🚀 UNIFIED JOB SCRAPER - {self.mode.upper()} MODE")
         print("="*70)
         
+        if self.mode != 'advanced' and (role is None or location is None):
+            # Reuse the memoized resume analysis (no PDF parse / LLM call)
+            analysis = load_latest_analysis() or {}
+            role = role or (analysis.get('roles') or ["Software Engineer"])[0]
+            location = location or (analysis.get('locations') or ["Remote"])[0]
+        
         if self.mode == 'basic':
             return self._scrape_basic(role, location, results_per_source)
         elif self.mode == 'comprehensive':
@@ -108,9 +114,10 @@ class JobScraper:
         
         jobs = scrape_jobspy(role, location, results_per_source)
         
-        df = pd.DataFrame(jobs)
+        df = to_dataframe(jobs)
         output_file = "jobs_basic.csv"
         df.to_csv(output_file, index=False)
+        append_jobs(df)
         
         print(f"\n✅ Found {len(jobs)} jobs")
         print(f"💾 Saved to {output_file}")
@@ -147,11 +154,12 @@ class JobScraper:
             all_jobs.extend(scrape_lever(company_name, company_slug))
             time.sleep(1)
         
-        df = pd.DataFrame(all_jobs)
+        df = to_dataframe(all_jobs)
         df = df.drop_duplicates(subset=['job_url'], keep='first')
         
         output_file = "jobs_comprehensive.csv"
         df.to_csv(output_file, index=False)
+        append_jobs(df)
         
         print(f"\n✅ Found {len(df)} jobs (after deduplication)")
         print(f"💾 Saved to {output_file}")
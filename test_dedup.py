@@ -0,0 +1,64 @@
+import pandas as pd
+
+from scrapper.dedup import dedupe_jobs, dedupe_dataframe, find_duplicates, StreamingDeduper, normalize_city
+
+DESCRIPTION = ("We are hiring a backend engineer to build payment APIs in Python and Go. "
+               "You will own services end to end, work with product and data teams, "
+               "and help scale our platform to millions of merchants across India.")
+
+def _job(**fields):
+    job = {'title': 'Senior Backend Engineer', 'company': 'Acme Technologies Pvt Ltd',
+           'location': 'Bengaluru, Karnataka', 'description': DESCRIPTION, 'job_url': 'https://linkedin.com/1'}
+    job.update(fields)
+    return job
+
+def test_cross_board_copies_collapse():
+    jobs = [
+        _job(description=''),                                                    # LinkedIn, no description
+        _job(company='Acme Technologies', location='Bangalore', job_url='https://indeed.com/2'),
+        _job(title='Senior Backend Engineer!', company='ACME, Inc.', job_url='https://glassdoor.com/3'),
+    ]
+    kept = dedupe_jobs(jobs)
+    assert len(kept) == 1 and kept[0]['job_url'] == 'https://linkedin.com/1'
+    assert kept[0]['description'] == DESCRIPTION                                # Filled from the duplicate
+
+def test_different_postings_stay():
+    jobs = [
+        _job(),
+        _job(location='Mumbai, Maharashtra', job_url='https://indeed.com/mumbai'),  # Same title, other city
+        _job(title='Data Scientist', job_url='https://indeed.com/ds'),
+        _job(description='Frontend role building React dashboards for our design system team.',
+             job_url='https://indeed.com/other-desc'),
+    ]
+    assert find_duplicates(jobs) == {}
+    assert normalize_city('Bangalore') == normalize_city('Bengaluru, Karnataka')
+
+def test_streaming_matches_batch():
+    jobs = [_job(job_url=f"https://board{i % 3}.com/{i}", title=['Backend Engineer', 'Data Analyst',
+                 'Product Manager', 'QA Engineer'][i % 4], company=f"Company {i % 5}") for i in range(40)]
+    deduper = StreamingDeduper()
+    streamed = []
+    for start in range(0, len(jobs), 7):
+        streamed.extend(deduper.add([dict(job) for job in jobs[start:start + 7]]))
+    batch = dedupe_jobs([dict(job) for job in jobs])
+    assert [job['job_url'] for job in streamed] == [job['job_url'] for job in batch]
+    assert deduper.collapsed == len(jobs) - len(batch) and len(deduper.checked) == len(jobs)
+
+def test_dataframe_keeps_categoricals():
+    df = pd.DataFrame([_job(), _job(job_url='https://indeed.com/2'), _job(title='Data Scientist')])
+    df['source'] = pd.Categorical(['LinkedIn', 'Indeed', 'LinkedIn'])
+    out = dedupe_dataframe(df)
+    assert len(out) == 2 and isinstance(out['source'].dtype, pd.CategoricalDtype)
+
+def main():
+    print("=== Testing near-duplicate detection ===")
+    for test in (test_cross_board_copies_collapse, test_different_postings_stay,
+                 test_streaming_matches_batch, test_dataframe_keeps_categoricals):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
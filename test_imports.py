@@ -0,0 +1,66 @@
+import ast
+import glob
+import importlib.util
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCRAPPER = os.path.join(ROOT, 'scrapper')
+
+# Modules imported at the top of system_recommendation that may not be installed
+THIRD_PARTY = ['jobspy', 'pandas', 'numpy']
+
+def _imported_names(statements):
+    names = set()
+    for statement in statements:
+        if isinstance(statement, ast.ImportFrom) and statement.module:
+            module = statement.module
+            if module.startswith('scrapper.'):
+                module = module[len('scrapper.'):]
+            names |= {(module, alias.name) for alias in statement.names}
+    return names
+
+def test_import_fallbacks_match():
+    """Every 'from x import ...' / 'from scrapper.x import ...' pair imports the same names"""
+    mismatches = []
+    for path in sorted(glob.glob(os.path.join(SCRAPPER, '*.py'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Try):
+                continue
+            for handler in node.handlers:
+                if not (isinstance(handler.type, ast.Name) and handler.type.id == 'ImportError'):
+                    continue
+                first, fallback = _imported_names(node.body), _imported_names(handler.body)
+                if first and fallback and first != fallback:
+                    mismatches.append(f"{os.path.basename(path)}:{node.lineno} {sorted(first ^ fallback)}")
+    assert not mismatches, "Import branches differ:\n" + "\n".join(mismatches)
+
+def _import_in_subprocess(module, cwd):
+    code = (f"import {module} as m; "
+            f"assert callable(m.filter_changed_jobs) and callable(m.run_system_recommendation)")
+    return subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True)
+
+def test_system_recommendation_imports_both_ways():
+    """Bare import (from scrapper/) and package import (from the repo root)"""
+    missing = [name for name in THIRD_PARTY if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"   (skipped real imports - not installed: {', '.join(missing)})")
+        return
+    for module, cwd in (('system_recommendation', SCRAPPER), ('scrapper.system_recommendation', ROOT)):
+        result = _import_in_subprocess(module, cwd)
+        assert result.returncode == 0, f"import {module} failed:\n{result.stderr}"
+
+def main():
+    print("=== Testing import fallbacks ===")
+    for test in (test_import_fallbacks_match, test_system_recommendation_imports_both_ways):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from scrapper.job_record import to_dataframe, fill_blank, as_categorical
+
+def test_fill_blank_with_categorical_gaps():
+    """Scraped frames concatenated with plain ones leave NaN in categorical columns"""
+    scraped = to_dataframe([{'title': 'Engineer', 'company': 'Acme', 'job_url': 'u1', 'source': 'Indeed'}])
+    other = pd.DataFrame({'title': ['Analyst'], 'job_url': ['u2']})
+    df = pd.concat([scraped, other], ignore_index=True)
+    assert isinstance(df['company'].dtype, pd.CategoricalDtype) and df['company'].isna().any()
+
+    filled = as_categorical(fill_blank(df))
+    assert filled.isna().sum().sum() == 0
+    assert list(filled['company']) == ['Acme', ''] and list(filled['source']) == ['Indeed', '']
+    assert isinstance(filled['company'].dtype, pd.CategoricalDtype)
+
+def main():
+    print("=== Testing job records ===")
+    for test in (test_fill_blank_with_categorical_gaps,):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from scrapper.job_router import ROUTES, ROUTE_FIELD, route, route_job, route_jobs, route_dataframe
+
+SOURCES = ['Greenhouse', 'LinkedIn', 'WeWorkRemotely', 'remotive', 'Indeed', '', None]
+URLS = ['https://boards.greenhouse.io/acme/1', 'https://jobs.lever.co/acme/2', 'https://amazon.jobs/en/3',
+        'https://weworkremotely.com/4', 'https://linkedin.com/jobs/5', '', None]
+LOCATIONS = ['Bengaluru, Karnataka', 'Remote - India', 'Remote', 'New York, NY', 'Pune (Hybrid)',
+             'Indiana, US', 'Gurugram', '', None, float('nan')]
+WORK_MODES = ['Remote', 'International', 'Onsite', 'Hybrid', 'remote', '', None]
+
+def _jobs():
+    return [{'source': s, 'job_url': u, 'location': l, 'work_mode': w}
+            for s, u, l, w in itertools.product(SOURCES, URLS, LOCATIONS, WORK_MODES)]
+
+def test_route_matches_route_dataframe():
+    jobs = _jobs()
+    df = pd.DataFrame(jobs, index=np.arange(len(jobs)) * 3)        # Non-default index is kept
+    vectorized = route_dataframe(df)
+    assert vectorized.index.equals(df.index)
+    assert list(vectorized.cat.categories) == ROUTES
+
+    expected = [route(j['source'], j['job_url'], j['location'], j['work_mode']) for j in jobs]
+    mismatches = [(job, want, got) for job, want, got in zip(jobs, expected, vectorized) if want != got]
+    assert not mismatches, f"{len(mismatches)} differ, e.g. {mismatches[:3]}"
+    assert set(expected) == set(ROUTES)                              # Every sheet is exercised
+
+def test_route_job_is_memoized():
+    job = {'source': 'LinkedIn', 'job_url': 'https://linkedin.com/jobs/1', 'location': 'Pune', 'work_mode': 'Onsite'}
+    assert route_job(job) == 'Indian_Onsite' and job[ROUTE_FIELD] == 'Indian_Onsite'
+
+    job['work_mode'] = 'Remote'
+    assert route_job(job) == 'Indian_Onsite'                         # Remembered
+    assert route_job(job, refresh=True) == 'Indian_Remote'
+
+    counts = route_jobs([job, {'location': 'Berlin', 'work_mode': 'International'}])
+    assert counts['Indian_Remote'] == 1 and counts['International_Remote'] == 1
+    assert sum(counts.values()) == 2
+
+def test_empty_dataframe():
+    assert route_dataframe(pd.DataFrame()).empty
+    assert len(route_dataframe(pd.DataFrame({'location': ['Remote']}))) == 1
+
+def main():
+    print("=== Testing job router ===")
+    for test in (test_route_matches_route_dataframe, test_route_job_is_memoized, test_empty_dataframe):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
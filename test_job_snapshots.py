@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import tempfile
+
+from scrapper.job_snapshots import (SnapshotStore, diff_snapshots, filter_changed_jobs,
+                                    url_key, content_hash, _pack, _unpack)
+
+def _store():
+    return SnapshotStore(os.path.join(tempfile.mkdtemp(prefix='snapshots_test_'), 'snapshots.db'))
+
+def _job(url, title='Backend Engineer', **fields):
+    return dict({'job_url': url, 'title': title, 'company': 'Acme', 'location': 'Pune'}, **fields)
+
+def test_pack_round_trip():
+    snapshot = {url_key(f"https://jobs/{i}"): content_hash(_job(f"https://jobs/{i}")) for i in range(100)}
+    snapshot[-2 ** 63] = 2 ** 63 - 1                                   # Signed 64-bit extremes
+    blob = _pack(snapshot)
+    assert len(blob) == 16 * len(snapshot)
+    assert _unpack(blob) == snapshot and _unpack(_pack({})) == {}
+
+def test_diff_snapshots():
+    old = {1: 10, 2: 20, 3: 30}
+    new = {1: 10, 2: 21, 4: 40, 5: 50}
+    diff = diff_snapshots(old, new, previously_seen={5})
+    assert (diff.unchanged, diff.changed, diff.removed, diff.new, diff.reopened) == ({1}, {2}, {3}, {4}, {5})
+    assert diff.actionable == {2, 4, 5}
+
+def test_record_run_lifecycle():
+    store = _store()
+    run1, diff = store.record_run([_job('a'), _job('b'), _job('c'), _job('#'), _job('')], label='Indian_Onsite')
+    assert diff.summary() == {'new': 3, 'reopened': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+
+    # b changed, c closed, d is new
+    run2, diff = store.record_run([_job('a'), _job('b', title='Senior Backend Engineer'), _job('d')],
+                                  label='Indian_Onsite')
+    assert run2 > run1
+    assert diff.summary() == {'new': 1, 'reopened': 0, 'changed': 1, 'removed': 1, 'unchanged': 1}
+
+    # c is back after a run without it
+    _, diff = store.record_run([_job('a'), _job('c')], label='Indian_Onsite')
+    assert diff.reopened == {url_key('c')} and diff.new == set()
+
+    # Labels are independent: c has never been seen by this label, so it's new
+    _, diff = store.record_run([_job('c')], label='International_Remote')
+    assert diff.new == {url_key('c')} and diff.reopened == set()
+
+def test_filter_changed_jobs_matches_record_run():
+    store = _store()
+    store.record_run([_job('a'), _job('b')], label='scan')
+    _, previous = store.latest_run('scan')
+    jobs = [_job('a'), _job('b', location='Remote'), _job('c'), _job('#')]
+    kept = filter_changed_jobs(jobs, previous)
+    _, diff = store.record_run(jobs, label='scan')
+    assert {url_key(job['job_url']) for job in kept} == diff.actionable
+    assert [job['job_url'] for job in kept] == ['b', 'c']
+
+def test_seen_history_is_rebuilt_for_old_databases():
+    store = _store()
+    store.record_run([_job('a')], label='scan')
+    store.record_run([_job('b')], label='scan')
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("DROP TABLE seen")                                # Database from before per-label history
+    _, diff = SnapshotStore(store.db_path).record_run([_job('a')], label='scan')
+    assert diff.reopened == {url_key('a')}
+
+def main():
+    print("=== Testing job snapshots ===")
+    for test in (test_pack_round_trip, test_diff_snapshots, test_record_run_lifecycle,
+                 test_filter_changed_jobs_matches_record_run, test_seen_history_is_rebuilt_for_old_databases):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
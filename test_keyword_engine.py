@@ -0,0 +1,61 @@
+import re
+
+import pandas as pd
+
+from scrapper.keyword_engine import KeywordMatcher, keyword_pattern, is_indian_location
+
+TECH = KeywordMatcher(['python', 'c++', 'ai', 'machine learning', 'intern', 'node'], plurals=True)
+SENIORITY = KeywordMatcher({'Intern': ['intern', 'internship'], 'Senior': ['senior', 'sr.'],
+                            'Lead': ['lead']})
+
+def test_whole_term_boundaries():
+    assert not TECH.search("Send us an email")                  # 'ai' inside a word
+    assert not TECH.search("Internal tools team")               # 'intern' prefix
+    assert TECH.hits("AI/ML engineer, C++ and Python") == {'ai', 'c++', 'python'}
+    assert TECH.search("Node.js developer") and TECH.search("(python)")
+    assert TECH.search("Summer interns wanted")                 # plurals=True
+
+    assert SENIORITY.first("Senior Software Engineer Intern") == 'Intern'   # Group order decides
+    assert SENIORITY.first("Sr. Data Engineer") == 'Senior'
+    assert SENIORITY.first("Leadership program") is None
+    assert SENIORITY.labels("Senior Lead") == {'Senior', 'Lead'}
+
+def test_indian_locations():
+    assert is_indian_location("Bengaluru, Karnataka") and is_indian_location("Remote - India")
+    assert not is_indian_location("Indianapolis, IN") and not is_indian_location("Indiana, US")
+    assert not is_indian_location(None)
+
+def test_patterns_agree_with_matcher():
+    texts = ["Send us an email", "Internal tools team", "AI/ML engineer", "C++ developer", "c++",
+             "Summer interns wanted", "Node.js", "machine learning", "machine-learning", "python3",
+             "Pythonista", "ai", "", "Lead AI engineer (senior)"]
+    lowered = [text.lower() for text in texts]
+    expected = [TECH.search(text) for text in texts]
+
+    for consume_edges in (False, True):
+        pattern = keyword_pattern(['python', 'c++', 'ai', 'machine learning', 'intern', 'node'],
+                                  plurals=True, consume_edges=consume_edges)
+        assert [bool(re.search(pattern, text)) for text in lowered] == expected, consume_edges
+    column = pd.Series(lowered)
+    assert column.str.contains(TECH.pattern, regex=True).tolist() == expected
+    for label, pattern in SENIORITY.patterns.items():
+        assert column.str.contains(pattern, regex=True).tolist() == \
+            [label in SENIORITY.labels(text) for text in texts], label
+
+def test_capture_returns_the_keyword():
+    pattern = keyword_pattern(['developer', 'engineer'], plurals=True, capture=True)
+    assert re.search(pattern, "senior engineers wanted").group(1) == 'engineer'
+    assert re.search(keyword_pattern([]), "anything") is None
+
+def main():
+    print("=== Testing keyword engine ===")
+    for test in (test_whole_term_boundaries, test_indian_locations,
+                 test_patterns_agree_with_matcher, test_capture_returns_the_keyword):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+from types import SimpleNamespace
+
+from scrapper import llm_client, llm_metrics
+from scrapper.llm import chat, achat
+from scrapper.llm_client import PooledClient, AsyncPooledClient, RateGate
+
+class ServerError(Exception):
+    status_code = 503
+
+def _reply(text):
+    message = SimpleNamespace(content=text)
+    usage = SimpleNamespace(prompt_tokens=10, completion_tokens=2, cost=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+class FlakyCompletions:
+    """Fails with a 503 `failures` times, then answers"""
+
+    def __init__(self, failures):
+        self.failures = failures
+
+    def create(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise ServerError('503 Service Unavailable')
+        return _reply('ok')
+
+class AsyncFlakyCompletions(FlakyCompletions):
+    async def create(self, **kwargs):
+        return FlakyCompletions.create(self, **kwargs)
+
+def _rows():
+    with sqlite3.connect(llm_metrics.get_metrics().db_path) as conn:
+        return conn.execute("SELECT attempt, status FROM calls ORDER BY id").fetchall()
+
+def _setup():
+    llm_metrics._default_store = llm_metrics.MetricsStore(
+        os.path.join(tempfile.mkdtemp(prefix='metrics_test_'), 'metrics.db'))
+    llm_client.BASE_DELAY = 0.001
+
+def test_sync_retries_are_recorded():
+    _setup()
+    raw = SimpleNamespace(chat=SimpleNamespace(completions=FlakyCompletions(failures=2)))
+    client = PooledClient(raw, RateGate())
+    assert chat(client, 'm', [{'role': 'user', 'content': 'hi'}], use_cache=False, feature='t') == 'ok'
+    assert _rows() == [(0, 'error'), (1, 'error'), (2, 'ok')]
+    assert llm_metrics.feature_summary()[0]['retries'] == 2
+
+def test_async_retries_continue_from_current_attempt():
+    _setup()
+    raw = SimpleNamespace(chat=SimpleNamespace(completions=AsyncFlakyCompletions(failures=1)))
+    client = AsyncPooledClient(raw, RateGate())
+
+    async def run():
+        llm_metrics.current_attempt.set(1)        # scoring_executor already retried a 429 once
+        return await achat(client, 'm', [{'role': 'user', 'content': 'hi'}], use_cache=False, feature='t')
+
+    assert asyncio.run(run()) == 'ok'
+    assert _rows() == [(1, 'error'), (2, 'ok')]
+
+def test_single_call_is_attempt_zero():
+    _setup()
+    raw = SimpleNamespace(chat=SimpleNamespace(completions=FlakyCompletions(failures=0)))
+    chat(PooledClient(raw, RateGate()), 'm', [{'role': 'user', 'content': 'hi'}], use_cache=False)
+    assert _rows() == [(0, 'ok')] and llm_metrics.current_attempt.get() == 0
+
+def main():
+    print("=== Testing LLM retry metrics ===")
+    for test in (test_sync_retries_are_recorded, test_async_retries_continue_from_current_attempt,
+                 test_single_call_is_attempt_zero):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+
+from scrapper import resume_reader
+
+def _assets(files):
+    folder = tempfile.mkdtemp(prefix='assets_test_')
+    for name, content in files.items():
+        with open(os.path.join(folder, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+    return folder
+
+def test_text_and_hash_come_from_the_same_file():
+    original = resume_reader.ASSETS_DIR
+    resume_reader.ASSETS_DIR = _assets({
+        'Google_AI_Engineer_Interview_CheatSheet.pdf': 'generated, never the resume',
+        'master resume.txt': 'Python developer, 1 year of Django',
+    })
+    try:
+        path = resume_reader.get_master_resume_path()
+        assert os.path.basename(path) == 'master resume.txt'
+        assert resume_reader.read_resume_text() == 'Python developer, 1 year of Django'
+        before = resume_reader.get_resume_hash()
+
+        # Editing the file that was read changes the hash (and so invalidates memoized analysis)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(', now also FastAPI')
+        os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+        assert resume_reader.get_resume_hash() != before
+        assert resume_reader.read_resume_text().endswith('FastAPI')
+        assert resume_reader.get_master_resume() == resume_reader.read_resume_text()
+    finally:
+        resume_reader.ASSETS_DIR = original
+
+def test_missing_resume():
+    original = resume_reader.ASSETS_DIR
+    resume_reader.ASSETS_DIR = _assets({})
+    try:
+        assert resume_reader.read_resume_text() is None and resume_reader.get_resume_hash() is None
+    finally:
+        resume_reader.ASSETS_DIR = original
+
+def main():
+    print("=== Testing resume reader ===")
+    for test in (test_text_and_hash_come_from_the_same_file, test_missing_resume):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import sqlite3
+import tempfile
+
+from scrapper.score_store import ScoreStore, FRESH, STALE_RESUME, STALE_JOB, MISSING
+from scrapper.model_cascade import ModelCascade
+
+def _store():
+    return ScoreStore(os.path.join(tempfile.mkdtemp(prefix='scores_test_'), 'scores.db'))
+
+def _job(url, description='Python backend role'):
+    return {'job_url': url, 'title': 'Backend Engineer', 'company': 'Acme', 'description': description}
+
+def test_statuses():
+    store = _store()
+    store.save([_job('a'), _job('b'), _job('failed')], [(80, 'good'), (60, 'ok'), (None, None)],
+               'resume-1', 'recommendation', model='m')
+
+    jobs = [_job('a'), _job('b', description='Now a Go role'), _job('failed'), _job('new')]
+    statuses = [status for status, _ in store.statuses(jobs, 'resume-1', 'recommendation')]
+    assert statuses == [FRESH, STALE_JOB, MISSING, MISSING]          # Failed scores are not saved
+
+    assert store.statuses([_job('a')], 'resume-2', 'recommendation')[0][0] == STALE_RESUME
+    assert store.lookup([_job('a'), _job('new')], 'resume-1', 'recommendation') == [(80, 'good'), None]
+    assert store.lookup([_job('a')], 'resume-1', 'sheet') == [None]   # Scopes are separate
+
+def test_saves_the_model_per_job():
+    store = _store()
+    cascade = ModelCascade('fast', 'strong', band=(55, 85))
+    results = [(30, 'clear reject'), (70, 'grey zone'), (75, 'grey zone')]
+    models = [cascade.fast_model] * len(results)
+    picked = cascade.escalations(results)
+    # Second escalation failed: that job keeps its fast score and model
+    cascade.merge(results, picked, [(82, 'strong says yes'), (None, None)], models)
+    assert models == ['fast', 'strong', 'fast']
+
+    jobs = [_job('x'), _job('y'), _job('z')]
+    store.save(jobs, results, 'resume-1', 'recommendation', model=models)
+    with sqlite3.connect(store.db_path) as conn:
+        saved = dict(conn.execute("SELECT score, model FROM scores").fetchall())
+    assert saved == {30: 'fast', 82: 'strong', 75: 'fast'}
+
+def main():
+    print("=== Testing score store ===")
+    for test in (test_statuses, test_saves_the_model_per_job):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+from scrapper.search_index import JobSearchIndex
+
+def _index():
+    return JobSearchIndex(os.path.join(tempfile.mkdtemp(prefix='search_test_'), 'search.db'))
+
+def test_scoped_search_keeps_on_screen_rows():
+    """Archived jobs that rank higher must not push the on-screen rows past the limit"""
+    index = _index()
+    index.index_jobs([{'job_url': f"archive/{i}", 'title': 'Python Developer',
+                       'description': 'python python python'} for i in range(50)])
+    on_screen = [f"sheet/{i}" for i in range(5)]
+    index.index_jobs([{'job_url': url, 'title': 'Engineer', 'description': 'we use python'} for url in on_screen])
+
+    unscoped = index.search('python', limit=5)
+    assert not any(hit['job_url'] in on_screen for hit in unscoped)
+
+    scoped = index.search('python', limit=5, job_urls=on_screen)
+    assert sorted(hit['job_url'] for hit in scoped) == on_screen
+
+def test_scoped_search_filters():
+    index = _index()
+    index.index_jobs([
+        {'job_url': 'a', 'title': 'Backend Engineer', 'location': 'Remote', 'work_mode': 'Remote'},
+        {'job_url': 'b', 'title': 'Backend Engineer', 'location': 'Pune, India', 'work_mode': 'Onsite'},
+        {'job_url': 'c', 'title': 'Backend Engineer', 'location': 'Remote', 'work_mode': 'Remote'},
+    ])
+    hits = index.search('backend', remote_only=True, job_urls=['a', 'b'])
+    assert [hit['job_url'] for hit in hits] == ['a']
+    assert index.search('backend', job_urls=[]) == []
+
+def main():
+    print("=== Testing search index ===")
+    for test in (test_scoped_search_keeps_on_screen_rows, test_scoped_search_filters):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+
+from scrapper.search_index import JobSearchIndex
+from scrapper.semantic_index import SemanticIndex
+
+def _indexes():
+    folder = tempfile.mkdtemp(prefix='semantic_test_')
+    source = JobSearchIndex(os.path.join(folder, 'search.db'))
+    return source, SemanticIndex(os.path.join(folder, 'vectors'), source=source)
+
+def test_refresh_is_incremental():
+    source, index = _indexes()
+    source.index_jobs([{'job_url': f"job/{i}", 'title': f"Data Analyst {i}", 'description': 'sql excel'}
+                       for i in range(10)])
+    assert index.refresh() == 10
+    assert index.refresh() == 0          # Nothing new
+
+    # One changed + one new job: the changed row is overwritten, the new one appended
+    # (rows indexed in the same second are re-embedded too, so only check >= 2)
+    source.index_jobs([{'job_url': 'job/3', 'title': 'Machine Learning Engineer', 'description': 'pytorch'},
+                       {'job_url': 'job/new', 'title': 'Frontend Developer', 'description': 'react'}])
+    assert index.refresh() >= 2
+    assert index.count() == 11
+    assert index.refresh() == 0
+
+    # A fresh instance reads the saved vectors instead of rebuilding
+    reopened = SemanticIndex(index.index_dir, source=source)
+    assert reopened.count() == 11 and reopened.refresh() == 0
+    assert reopened.search('machine learning pytorch', limit=1)[0]['job_url'] == 'job/3'
+
+def test_filters_apply_before_ranking():
+    source, index = _indexes()
+    # Many strong matches elsewhere, one weaker match in the filtered city
+    source.index_jobs([{'job_url': f"us/{i}", 'title': 'Python Developer', 'location': 'New York, NY',
+                        'work_mode': 'Onsite', 'description': 'python django'} for i in range(1500)])
+    source.index_jobs([{'job_url': 'blr/1', 'title': 'Backend Engineer', 'location': 'Bengaluru, Karnataka',
+                        'work_mode': 'Onsite', 'description': 'python services'}])
+    hits = index.search('python developer', limit=5, location='Bangalore')
+    assert [hit['job_url'] for hit in hits] == ['blr/1']
+
+def test_remote_filter_covers_international():
+    source, index = _indexes()
+    source.index_jobs([
+        {'job_url': 'intl', 'title': 'Python Developer', 'location': 'Berlin', 'work_mode': 'International'},
+        {'job_url': 'onsite', 'title': 'Python Developer', 'location': 'Pune', 'work_mode': 'Onsite'},
+    ])
+    hits = index.search('python developer', work_modes=['Remote'])
+    assert [hit['job_url'] for hit in hits] == ['intl']
+
+def main():
+    print("=== Testing semantic index ===")
+    for test in (test_refresh_is_incremental, test_filters_apply_before_ranking,
+                 test_remote_filter_covers_international):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+
+from scrapper.sheets_outbox import SheetsOutbox, MAX_ATTEMPTS
+
+class FakeWorksheet:
+    def __init__(self, links=(), readable=True):
+        self.rows = [['Role', 'Link']] + [['Existing', link] for link in links]
+        self.readable = readable
+
+    def row_values(self, number):
+        if not self.readable:
+            raise RuntimeError('read failed')
+        return self.rows[number - 1]
+
+    def col_values(self, number):
+        return [row[number - 1] for row in self.rows]
+
+    def append_rows(self, rows):
+        self.rows.extend(rows)
+
+class FakeSpreadsheet:
+    def __init__(self, **worksheets):
+        self.worksheets = worksheets
+
+    def worksheet(self, name):
+        return self.worksheets[name]
+
+def _outbox(spreadsheet):
+    db_path = os.path.join(tempfile.mkdtemp(prefix='outbox_test_'), 'outbox.db')
+    return SheetsOutbox(db_path, open_spreadsheet=lambda: spreadsheet, dedupe_worksheets=['Jobs'])
+
+def test_existing_and_repeated_keys_are_not_appended():
+    sheet = FakeWorksheet(links=['url/1'])
+    outbox = _outbox(FakeSpreadsheet(Jobs=sheet))
+    assert outbox.enqueue('Jobs', ['Role 1', 'url/1'], key='url/1')        # Already in the sheet
+    assert outbox.enqueue('Jobs', ['Role 2', 'url/2'], key='url/2')
+    assert not outbox.enqueue('Jobs', ['Role 2', 'url/2'], key='url/2')    # Already pending
+
+    assert outbox.flush() == 2
+    assert [row[1] for row in sheet.rows[1:]] == ['url/1', 'url/2']
+
+    # Re-queued after delivery (e.g. a crash before "mark sent"): still one row in the sheet
+    assert outbox.enqueue('Jobs', ['Role 2', 'url/2'], key='url/2')
+    assert outbox.flush() == 1
+    assert [row[1] for row in sheet.rows[1:]] == ['url/1', 'url/2']
+    assert outbox.pending_count() == 0
+
+def test_unreadable_sheet_is_skipped_then_dead_lettered():
+    sheet = FakeWorksheet(readable=False)
+    outbox = _outbox(FakeSpreadsheet(Jobs=sheet))
+    outbox.enqueue('Jobs', ['Role 1', 'url/1'], key='url/1')
+
+    for attempt in range(MAX_ATTEMPTS):
+        with outbox._connect() as conn:
+            conn.execute("UPDATE outbox SET next_attempt_at = 0")       # Skip the backoff
+        assert outbox.flush() == 0
+    assert len(sheet.rows) == 1                                          # Never appended blind
+    assert outbox.pending_count() == 0 and outbox.dead_count() == 1
+
+    sheet.readable = True
+    assert outbox.retry_dead() == 1
+    assert outbox.flush() == 1 and outbox.dead_count() == 0
+    assert sheet.rows[-1] == ['Role 1', 'url/1']
+
+def test_drain_returns_when_sheets_unavailable():
+    def unavailable():
+        raise FileNotFoundError('google_key.json not found')
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix='outbox_test_'), 'outbox.db')
+    outbox = SheetsOutbox(db_path, open_spreadsheet=unavailable)
+    outbox.enqueue('Jobs', ['Role 1', 'url/1'], key='url/1')
+    assert outbox.drain(timeout=60) == 1                                  # Returns at once, row kept
+
+def test_missing_credentials_do_not_use_up_attempts():
+    def unavailable():
+        raise FileNotFoundError('google_key.json not found')
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix='outbox_test_'), 'outbox.db')
+    outbox = SheetsOutbox(db_path, open_spreadsheet=unavailable)
+    outbox.enqueue('Jobs', ['Role 1', 'url/1'], key='url/1')
+
+    for attempt in range(MAX_ATTEMPTS + 2):
+        with outbox._connect() as conn:
+            conn.execute("UPDATE outbox SET next_attempt_at = 0")       # Skip the backoff
+        assert outbox.flush() == 0
+    assert outbox.pending_count() == 1 and outbox.dead_count() == 0
+    with outbox._connect() as conn:
+        assert conn.execute("SELECT attempts FROM outbox").fetchone()[0] == 0
+
+def main():
+    print("=== Testing sheets outbox ===")
+    for test in (test_existing_and_repeated_keys_are_not_appended,
+                 test_unreadable_sheet_is_skipped_then_dead_lettered,
+                 test_drain_returns_when_sheets_unavailable,
+                 test_missing_credentials_do_not_use_up_attempts):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+
+if __name__ == "__main__":
+    main()